@@ -0,0 +1,409 @@
+# -*- coding: utf-8 -*-
+"""Offline availability computed from local Nagios archive logs.
+
+Reads nagios.log and the rotated archives/nagios-MM-DD-YYYY-HH.log files,
+records every HARD state change as (object, time, state) in flat arrays
+and sums the time each object spent in each state. The result has the
+same time_* buckets as archivejson.cgi availability queries, so the
+percentage math in mozzo.reports works unchanged.
+
+The interval arithmetic runs over all objects at once: one sort groups
+the events per object, and Nagios downtime is subtracted through a
+cumulative "time not running" function instead of per-object loops.
+NumPy is used when installed, with a pure-Python fallback.
+"""
+import bisect
+import datetime
+import glob
+import os
+import re
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from mozzo.reports import HOST_TIME_FIELDS, SERVICE_TIME_FIELDS
+from mozzo.status import StatusSourceError, parse_params
+
+HOST_STATES = {b"UP": 0, b"DOWN": 1, b"UNREACHABLE": 2}
+SERVICE_STATES = {b"OK": 0, b"WARNING": 1, b"UNKNOWN": 2, b"CRITICAL": 3}
+
+_HOST_KINDS = {b"HOST ALERT", b"CURRENT HOST STATE", b"INITIAL HOST STATE"}
+_SERVICE_KINDS = {b"SERVICE ALERT", b"CURRENT SERVICE STATE", b"INITIAL SERVICE STATE"}
+
+ARCHIVE_NAME = re.compile(r"^nagios-(\d\d)-(\d\d)-(\d{4})-(\d\d)\.log$")
+
+
+def log_files(log_file, archive_dir, start, end):
+    """List the log files needed for a [start, end) window, oldest first.
+
+    An archive named after its rotation time holds the entries logged
+    before that time, beginning with the CURRENT states written at the
+    previous rotation. The first archive rotated at or after start
+    therefore also gives every object's state at the window start.
+
+    Returns:
+        List of file paths in chronological order
+    """
+    archives = []
+    for path in glob.glob(os.path.join(archive_dir, "nagios-*.log")):
+        match = ARCHIVE_NAME.match(os.path.basename(path))
+        if not match:
+            continue
+        month, day, year, hour = (int(part) for part in match.groups())
+        archives.append((datetime.datetime(year, month, day, hour).timestamp(), path))
+
+    files = []
+    for rotated, path in sorted(archives):
+        if rotated < start:
+            continue
+        files.append(path)
+        if rotated >= end:
+            return files
+    if os.path.exists(log_file):
+        files.append(log_file)
+    return files
+
+
+class Timelines:
+    """HARD state changes for one object type, stored as flat arrays."""
+
+    def __init__(self):
+        self.index = {}
+        self.names = []
+        self.objects = array("q")
+        self.times = array("q")
+        self.states = array("b")
+
+    def add(self, name, timestamp, state):
+        position = self.index.get(name)
+        if position is None:
+            position = self.index[name] = len(self.names)
+            self.names.append(name)
+        self.objects.append(position)
+        self.times.append(timestamp)
+        self.states.append(state)
+
+
+class ProgramRuns:
+    """Nagios start/stop history, used for downtime and state retention."""
+
+    def __init__(self):
+        self.starts = []
+        self.stopped = []
+        self._running = None
+        self._stop = None
+
+    def start(self, timestamp, last_seen):
+        if self._running and last_seen is not None:
+            # Restart without a clean shutdown; stopped since the last entry
+            self._stop = last_seen
+        if self._stop is not None:
+            self.stopped.append((self._stop, timestamp))
+            self._stop = None
+        self.starts.append(timestamp)
+        self._running = True
+
+    def stop(self, timestamp):
+        if self._running is not False:
+            self._stop = timestamp
+            self._running = False
+
+    def finish(self, end):
+        """Close a trailing stop; Nagios is then down until end."""
+        if self._stop is not None and self._stop < end:
+            self.stopped.append((self._stop, end))
+            self._stop = None
+
+
+def read_events(paths, end, hosts=True, services=True, want_host=None, want_service=None):
+    """Parse HARD state changes and program starts/stops from log files.
+
+    Args:
+        paths: Log files in chronological order
+        end: Ignore entries after this timestamp
+        hosts: Collect host states
+        services: Collect service states
+        want_host: Optional predicate on host name
+        want_service: Optional predicate on (host name, service description)
+
+    Returns:
+        Tuple of (host Timelines, service Timelines, ProgramRuns)
+
+    Raises:
+        StatusSourceError: If a log file cannot be read
+    """
+    host_events = Timelines()
+    service_events = Timelines()
+    runs = ProgramRuns()
+    last_seen = None
+
+    for path in paths:
+        try:
+            f = open(path, "rb")
+        except OSError as e:
+            raise StatusSourceError(f"{path}: {e}")
+        with f:
+            for line in f:
+                close = line.find(b"] ")
+                if not line.startswith(b"[") or close < 0:
+                    continue
+                try:
+                    timestamp = int(line[1:close])
+                except ValueError:
+                    continue
+                if timestamp > end:
+                    continue
+                body = line[close + 2:].rstrip(b"\r\n")
+                kind, _, rest = body.partition(b": ")
+
+                if kind in _SERVICE_KINDS:
+                    if services:
+                        fields = rest.split(b";", 4)
+                        if len(fields) >= 4 and fields[3] == b"HARD" and fields[2] in SERVICE_STATES:
+                            name = (fields[0].decode("utf-8", "replace"), fields[1].decode("utf-8", "replace"))
+                            if want_service is None or want_service(*name):
+                                service_events.add(name, timestamp, SERVICE_STATES[fields[2]])
+                elif kind in _HOST_KINDS:
+                    if hosts:
+                        fields = rest.split(b";", 3)
+                        if len(fields) >= 3 and fields[2] == b"HARD" and fields[1] in HOST_STATES:
+                            name = fields[0].decode("utf-8", "replace")
+                            if want_host is None or want_host(name):
+                                host_events.add(name, timestamp, HOST_STATES[fields[1]])
+                elif body.startswith(b"Nagios ") and b" starting..." in body:
+                    runs.start(timestamp, last_seen)
+                elif body.startswith((b"Caught SIGTERM", b"Successfully shutdown")):
+                    runs.stop(timestamp)
+                last_seen = timestamp
+
+    runs.finish(end)
+    return host_events, service_events, runs
+
+
+def _stopped_breakpoints(stopped):
+    """Breakpoints of F(t), the total time Nagios was down before t."""
+    xs = []
+    ys = []
+    total = 0
+    for begin, finish in sorted(stopped):
+        xs.extend((begin, finish))
+        ys.extend((total, total + (finish - begin)))
+        total += finish - begin
+    return xs, ys
+
+
+def _totals_numpy(events, bucket_count, start, end, runs, options):
+    objects = np.frombuffer(events.objects, dtype=np.int64)
+    times = np.frombuffer(events.times, dtype=np.int64)
+    states = np.frombuffer(events.states, dtype=np.int8).astype(np.int64)
+    order = np.lexsort((times, objects))
+    objects, times, states = objects[order], times[order], states[order]
+    nodata = bucket_count - 2
+    notrunning = bucket_count - 1
+
+    # Each event starts a segment lasting until the object's next event
+    last = np.ones(len(objects), dtype=bool)
+    last[:-1] = objects[1:] != objects[:-1]
+    first = np.ones(len(objects), dtype=bool)
+    first[1:] = last[:-1]
+    seg_end = np.empty_like(times)
+    seg_end[:-1] = times[1:]
+    seg_end[last] = end
+
+    # Plus a head segment from the window start to the first known state
+    head_state = states[first] if options["assume_initial_state"] else np.full(first.sum(), nodata)
+    seg_obj = np.concatenate((objects, objects[first]))
+    seg_start = np.concatenate((times, np.full(first.sum(), start)))
+    seg_end = np.concatenate((seg_end, times[first]))
+    seg_state = np.concatenate((states, head_state))
+
+    if not options["assume_state_retention"] and runs.starts:
+        # Without retention a Nagios restart forgets the state until the next event
+        restarts = np.append(np.asarray(sorted(runs.starts), dtype=np.int64), end)
+        cut = np.minimum(seg_end, restarts[np.searchsorted(restarts[:-1], seg_start, side="right")])
+        seg_obj = np.concatenate((seg_obj, seg_obj))
+        seg_state = np.concatenate((seg_state, np.full(len(cut), nodata)))
+        seg_start, seg_end = np.concatenate((seg_start, cut)), np.concatenate((cut, seg_end))
+
+    seg_start = np.clip(seg_start, start, end)
+    seg_end = np.maximum(np.clip(seg_end, start, end), seg_start)
+
+    xs, ys = _stopped_breakpoints(runs.stopped)
+    if xs:
+        down = np.interp(seg_end, xs, ys) - np.interp(seg_start, xs, ys)
+    else:
+        down = np.zeros(len(seg_start))
+    up = (seg_end - seg_start) - down
+
+    size = len(events.names) * bucket_count
+    totals = np.bincount(seg_obj * bucket_count + seg_state, weights=up, minlength=size)
+    down_state = seg_state if options["assume_states_during_downtime"] else np.full(len(seg_state), notrunning)
+    totals += np.bincount(seg_obj * bucket_count + down_state, weights=down, minlength=size)
+    return totals.reshape(len(events.names), bucket_count).round().astype(np.int64).tolist()
+
+
+def _totals_python(events, bucket_count, start, end, runs, options):
+    nodata = bucket_count - 2
+    notrunning = bucket_count - 1
+    xs, ys = _stopped_breakpoints(runs.stopped)
+    restarts = sorted(runs.starts)
+
+    def stopped_before(t):
+        i = bisect.bisect_right(xs, t)
+        if i == 0:
+            return 0
+        if i == len(xs) or xs[i] == xs[i - 1]:
+            return ys[i - 1]
+        return ys[i - 1] + (ys[i] - ys[i - 1]) * (t - xs[i - 1]) / (xs[i] - xs[i - 1])
+
+    segments = []
+    order = sorted(range(len(events.times)), key=lambda i: (events.objects[i], events.times[i]))
+    for position, i in enumerate(order):
+        obj = events.objects[i]
+        following = order[position + 1] if position + 1 < len(order) else None
+        if position == 0 or events.objects[order[position - 1]] != obj:
+            head = events.states[i] if options["assume_initial_state"] else nodata
+            segments.append((obj, start, events.times[i], head))
+        if following is not None and events.objects[following] == obj:
+            segments.append((obj, events.times[i], events.times[following], events.states[i]))
+        else:
+            segments.append((obj, events.times[i], end, events.states[i]))
+
+    if not options["assume_state_retention"] and restarts:
+        split = []
+        for obj, seg_start, seg_end, state in segments:
+            j = bisect.bisect_right(restarts, seg_start)
+            cut = min(seg_end, restarts[j]) if j < len(restarts) else seg_end
+            split.append((obj, seg_start, cut, state))
+            split.append((obj, cut, seg_end, nodata))
+        segments = split
+
+    totals = [[0.0] * bucket_count for _ in events.names]
+    for obj, seg_start, seg_end, state in segments:
+        seg_start = min(max(seg_start, start), end)
+        seg_end = max(min(max(seg_end, start), end), seg_start)
+        down = stopped_before(seg_end) - stopped_before(seg_start)
+        totals[obj][state] += (seg_end - seg_start) - down
+        totals[obj][state if options["assume_states_during_downtime"] else notrunning] += down
+    return [[int(round(value)) for value in row] for row in totals]
+
+
+def state_totals(events, fields, start, end, runs, options, use_numpy=None):
+    """Sum the seconds each object spent in each availability bucket.
+
+    Args:
+        events: Timelines for one object type
+        fields: HOST_TIME_FIELDS or SERVICE_TIME_FIELDS; the last two are
+            the indeterminate nodata/notrunning buckets
+        start: Window start timestamp
+        end: Window end timestamp
+        runs: ProgramRuns from the same logs
+        options: Dictionary with "assume_initial_state",
+            "assume_state_retention" and "assume_states_during_downtime"
+        use_numpy: Force (True) or avoid (False) NumPy; default is to use
+            it when installed
+
+    Returns:
+        Dictionary of object name -> {time_* field: seconds}
+    """
+    if not events.names:
+        return {}
+    if use_numpy is None:
+        use_numpy = np is not None
+    compute = _totals_numpy if use_numpy else _totals_python
+    rows = compute(events, len(fields), start, end, runs, options)
+    return {name: dict(zip(fields, row)) for name, row in zip(events.names, rows)}
+
+
+class ArchiveLogAvailability:
+    """Answer archivejson.cgi availability queries from local log files.
+
+    Args:
+        log_file: Path to the current nagios.log
+        archive_dir: Directory holding rotated nagios-*.log files
+        objects_cache: Optional objects.cache path for group queries
+    """
+
+    def __init__(self, log_file, archive_dir, objects_cache=None):
+        self.log_file = log_file
+        self.archive_dir = archive_dir
+        self.objects_cache = objects_cache
+
+    def _groups(self):
+        from mozzo.statusdat import parse_objects_cache
+
+        if not self.objects_cache:
+            raise StatusSourceError("group reports need objects_cache")
+        try:
+            return parse_objects_cache(self.objects_cache)
+        except OSError as e:
+            raise StatusSourceError(f"{self.objects_cache}: {e}")
+
+    def availability(self, params):
+        """Answer an archivejson.cgi query=availability request.
+
+        Args:
+            params: Same dict or query string passed to archivejson.cgi
+
+        Returns:
+            Dictionary shaped like the archivejson.cgi response "data"
+
+        Raises:
+            StatusSourceError: If the logs or objects.cache cannot be read
+        """
+        params = parse_params(params)
+        object_type = params.get("availabilityobjecttype", "hosts")
+        start = int(params["starttime"])
+        end = int(params["endtime"])
+        options = {
+            "assume_initial_state": params.get("assumeinitialstate") == "true",
+            "assume_state_retention": params.get("assumestateretention") == "true",
+            "assume_states_during_downtime": params.get("assumestatesduringnagiosdowntime") == "true",
+        }
+        host = params.get("hostname")
+        service = params.get("servicedescription")
+
+        want_host = None
+        want_service = None
+        if object_type == "hostgroups":
+            members = self._groups()["hostgroups"].get(params.get("hostgroup"), set())
+            want_host = members.__contains__
+        elif object_type == "servicegroups":
+            members = self._groups()["servicegroups"].get(params.get("servicegroup"), set())
+            want_service = lambda h, s: (h, s) in members  # noqa: E731
+        elif host:
+            want_host = host.__eq__
+            want_service = lambda h, s: h == host and (not service or s == service)  # noqa: E731
+
+        is_host = object_type in ("hosts", "hostgroups")
+        host_events, service_events, runs = read_events(
+            log_files(self.log_file, self.archive_dir, start, end),
+            end,
+            hosts=is_host,
+            services=not is_host,
+            want_host=want_host,
+            want_service=want_service,
+        )
+
+        if is_host:
+            totals = state_totals(host_events, HOST_TIME_FIELDS, start, end, runs, options)
+            rows = [dict(name=name, **fields) for name, fields in sorted(totals.items())]
+        else:
+            totals = state_totals(service_events, SERVICE_TIME_FIELDS, start, end, runs, options)
+            rows = [
+                dict(host_name=name[0], description=name[1], **fields)
+                for name, fields in sorted(totals.items())
+            ]
+
+        if object_type == "hostgroups":
+            return {"hostgroup": {"name": params.get("hostgroup"), "hosts": rows}}
+        if object_type == "servicegroups":
+            return {"servicegroup": {"name": params.get("servicegroup"), "services": rows}}
+        if is_host and host:
+            return {"host": rows[0] if rows else {}}
+        if not is_host and host and service:
+            return {"service": rows[0] if rows else {}}
+        return {"hostlist" if is_host else "servicelist": rows}
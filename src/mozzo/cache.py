@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""Persistent on-disk cache for slow-changing statusjson.cgi responses.
+
+Entries are small JSON files named after their query type and a hash of
+the request. Writes go to a temporary file that is atomically renamed
+into place, so parallel mozzo processes never read a partial entry. Each
+entry's mtime records its last use and drives LRU eviction; the time it
+was stored is kept inside the file and drives TTL expiry.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+# Default time-to-live (seconds) per statusjson query type
+DEFAULT_TTLS = {
+    "hostlist": 300,
+    "servicelist": 300,
+    "programstatus": 30,
+}
+
+
+class ResponseCache:
+    """Size-bounded LRU cache of JSON responses stored on disk.
+
+    Args:
+        directory: Directory holding cache entries
+        ttls: Mapping of query type -> TTL in seconds
+        max_entries: Maximum number of entries kept
+        max_bytes: Maximum total size of all entries
+    """
+
+    def __init__(self, directory, ttls=None, max_entries=256, max_bytes=64 * 1024 * 1024):
+        self.directory = directory
+        self.ttls = dict(DEFAULT_TTLS)
+        self.ttls.update(ttls or {})
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+    def key(self, namespace, url, params, user=None):
+        """Build a cache key for a request.
+
+        Args:
+            namespace: Query type (e.g. "hostlist"), used as file prefix
+            url: Request URL
+            params: Request params as dict or query string
+            user: Auth username the request is made as; Nagios filters
+                objects per user, so responses are never shared across users
+
+        Returns:
+            Key string safe to use as a file name
+        """
+        if isinstance(params, dict):
+            params = sorted((str(k), str(v)) for k, v in params.items())
+        blob = json.dumps([url, user, params], sort_keys=True).encode("utf-8")
+        return f"{namespace}-{hashlib.sha256(blob).hexdigest()[:32]}"
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key, ttl):
+        """Return a cached value younger than ttl seconds, or None."""
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if time.time() - entry.get("stored", 0) > ttl:
+            return None
+
+        try:
+            # Mark as recently used for LRU eviction
+            os.utime(path)
+        except OSError:
+            pass
+        return entry.get("value")
+
+    def set(self, key, value):
+        """Store a JSON-serializable value, then evict if over limits."""
+        try:
+            os.makedirs(self.directory, mode=0o700, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"stored": time.time(), "value": value}, f)
+            os.replace(tmp_path, self._path(key))
+        except (OSError, TypeError, ValueError):
+            return
+        self._evict()
+
+    def invalidate(self, namespace):
+        """Drop every entry for a query type."""
+        for name, _, _ in self._entries():
+            if name.startswith(f"{namespace}-"):
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    pass
+
+    def _entries(self):
+        entries = []
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return entries
+        for name in names:
+            if not name.endswith(".json"):
+                continue
+            try:
+                st = os.stat(os.path.join(self.directory, name))
+            except OSError:
+                # Removed by a concurrent mozzo process
+                continue
+            entries.append((name, st.st_mtime, st.st_size))
+        return entries
+
+    def _evict(self):
+        entries = sorted(self._entries(), key=lambda entry: entry[1])
+        total = sum(size for _, _, size in entries)
+        while entries and (len(entries) > self.max_entries or total > self.max_bytes):
+            name, _, size = entries.pop(0)
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                pass
+            total -= size
@@ -1,18 +1,9 @@
 # -*- coding: utf-8 -*-
 import argparse
-import csv
-import datetime
-import json
 import os
 import sys
 
-import requests
-import urllib3
-import yaml
-
-# Force UTF-8 output to prevent emoji Mojibake (e.g. â instead of ❌)
-if hasattr(sys.stdout, "reconfigure"):
-    sys.stdout.reconfigure(encoding="utf-8")
+from mozzo import ipc
 
 
 def _get_version():
@@ -29,1036 +20,19 @@ def _get_version():
 
 __version__ = _get_version()
 
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-
-
-class TimeoutHTTPAdapter(requests.adapters.HTTPAdapter):
-    """HTTPAdapter that sets a default timeout for all requests."""
-
-    def __init__(self, timeout=60, *args, **kwargs):
-        self.timeout = timeout
-        super().__init__(*args, **kwargs)
-
-    def send(self, request, **kwargs):
-        # Use the instance timeout if no timeout is explicitly provided
-        if kwargs.get("timeout") is None:
-            kwargs["timeout"] = self.timeout
-        return super().send(request, **kwargs)
-
-
-class MozzoNagiosClient:
-    # Status emoji mappings (single source of truth)
-    STATUS_EMOJIS = {
-        'PENDING': '⏳',
-        'OK': '✅',
-        'WARNING': '⚠️ ',
-        'CRITICAL': '❌',
-        'UNKNOWN': '❓',
-        'UP': '✅',
-        'DOWN': '❌',
-        'UNREACHABLE': '❓',
-    }
-
-    # Status and filter maps used throughout the class
-    SERVICE_STATUS_MAP = {
-        1: f"{STATUS_EMOJIS['PENDING']} PENDING",
-        2: f"{STATUS_EMOJIS['OK']} OK",
-        4: f"{STATUS_EMOJIS['WARNING']} WARNING",
-        8: f"{STATUS_EMOJIS['UNKNOWN']} UNKNOWN",
-        16: f"{STATUS_EMOJIS['CRITICAL']} CRITICAL",
-    }
-
-    HOST_STATUS_MAP = {
-        0: f"{STATUS_EMOJIS['PENDING']} PENDING",
-        2: f"{STATUS_EMOJIS['UP']} UP",
-        4: f"{STATUS_EMOJIS['DOWN']} DOWN",
-        8: f"{STATUS_EMOJIS['UNREACHABLE']} UNREACHABLE"
-    }
-
-    FILTER_MAP = {
-        "PENDING": 1,
-        "OK": 2,
-        "WARNING": 4,
-        "UNKNOWN": 8,
-        "CRITICAL": 16,
-    }
-
-    def __init__(self, config_path=None, message=None, days=None):
-        config_file = self._find_config(config_path)
-        if not config_file:
-            print(
-                "❌ Could not find config.yml.\n"
-                "Please ensure config.yml exists in the current directory."
-            )
-            sys.exit(1)
-        try:
-            with open(config_file, "r", encoding="utf-8") as f:
-                self.config = yaml.safe_load(f)
-        except Exception as e:
-            print(f"❌ Error loading {config_file}: {e}")
-            sys.exit(1)
-
-        self.server = self.config.get("nagios_server", "").rstrip("/")
-        self.cgi_path = self.config.get("nagios_cgi_path", "/nagios/cgi-bin").strip("/")
-        self.auth = (
-            self.config.get("nagios_username"),
-            self.config.get("nagios_password"),
-        )
-        self.downtime_mins = self.config.get("default_downtime", 120)
-        self.report_days = self.config.get("default_reporting_days", 365)
-        self.verify_ssl = self.config.get("verify_ssl", True)
-        self.date_format = self.config.get("date_format", "%m-%d-%Y %H:%M:%S")
-        self.cmd_url = f"{self.server}/{self.cgi_path}/cmd.cgi"
-        self.json_url = f"{self.server}/{self.cgi_path}/statusjson.cgi"
-        self.archive_url = f"{self.server}/{self.cgi_path}/archivejson.cgi"
-        self.showlog_url = f"{self.server}/{self.cgi_path}/showlog.cgi"
-
-        # Set the custom message or fallback to default
-        self.message = message if message else "Action issued by Mozzo CLI"
-        self.days = days
-
-        # Configure session with timeout adapter for all HTTP/HTTPS requests
-        self.session = requests.Session()
-        adapter = TimeoutHTTPAdapter(timeout=60)
-        self.session.mount("http://", adapter)
-        self.session.mount("https://", adapter)
-
-    def _find_config(self, provided_path):
-        if provided_path and os.path.exists(provided_path):
-            return provided_path
-
-        search_paths = [
-            os.path.expanduser("~/.config/mozzo/config.yml"),
-            "/etc/mozzo/config.yml",
-            "config.yml",
-        ]
-
-        for path in search_paths:
-            if os.path.exists(path):
-                return path
-        return None
-
-    def _normalize_timestamp(self, timestamp):
-        """Convert millisecond timestamps to seconds if needed.
-
-        Nagios CGI sometimes returns timestamps in milliseconds (>9999999999).
-        This helper normalizes them to standard Unix seconds.
-        """
-        if timestamp > 9999999999:
-            return timestamp / 1000.0
-        return timestamp
-
-    def _format_duration(self, last_change_ts):
-        """Format a timestamp delta into human-readable duration.
-
-        Args:
-            last_change_ts: Unix timestamp of the last state change
-
-        Returns:
-            Formatted string like "5d 3h 42m 15s" or "N/A" if invalid
-        """
-        if last_change_ts <= 0:
-            return "N/A"
-
-        last_change_ts = self._normalize_timestamp(last_change_ts)
-        now = datetime.datetime.now().timestamp()
-        delta = datetime.timedelta(seconds=int(now - last_change_ts))
-        hours, rem = divmod(delta.seconds, 3600)
-        minutes, seconds = divmod(rem, 60)
-        return f"{delta.days}d {hours}h {minutes}m {seconds}s"
-
-    def _post_cmd(self, payload):
-        payload["btnSubmit"] = "Commit"
-        payload["com_author"] = self.auth[0]
-        payload["com_data"] = self.message
-
-        try:
-            response = self.session.post(
-                self.cmd_url, data=payload, auth=self.auth, verify=self.verify_ssl
-            )
-            response.raise_for_status()
-            if "successfully submitted" in response.text:
-                print("✅ Command successfully submitted to Nagios.")
-            else:
-                print(
-                    "⚠️ Command sent, but success message not found. "
-                    "Check permissions."
-                )
-        except requests.exceptions.RequestException as e:
-            print(f"❌ HTTP Error submitting command: {e}")
-
-    def _get_json(self, params):
-        try:
-            response = self.session.get(
-                self.json_url, params=params, auth=self.auth, verify=self.verify_ssl
-            )
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            print(f"❌ HTTP Error fetching data: {e}")
-            sys.exit(1)
-
-    def _get_downtime_windows(self):
-        now = datetime.datetime.now()
-        if self.days is not None:
-            end = now + datetime.timedelta(days=self.days)
-        else:
-            end = now + datetime.timedelta(minutes=self.downtime_mins)
-        return now.strftime(self.date_format), end.strftime(self.date_format)
-
-    def _get_status_text(self, status_code, is_host=False):
-        """Get human-readable status text for a status code.
-
-        Args:
-            status_code: Numeric status code from Nagios
-            is_host: If True, use HOST_STATUS_MAP, else SERVICE_STATUS_MAP
-
-        Returns:
-            Formatted status string with emoji, or fallback format
-        """
-        if is_host:
-            return self.HOST_STATUS_MAP.get(status_code, f"CODE_{status_code}")
-        return self.SERVICE_STATUS_MAP.get(status_code, f"[{status_code}]")
-
-    def _format_downtime_duration(self):
-        """Format downtime duration string based on config.
-
-        Returns:
-            String like "5 days" or "120m" based on self.days setting
-        """
-        return f"{self.days} days" if self.days is not None else f"{self.downtime_mins}m"
-
-    def _print_toggle_action(self, enable, target_description):
-        """Print enable/disable notification message.
-
-        Args:
-            enable: True for enabling, False for disabling
-            target_description: Description of what's being toggled
-        """
-        action = "Enabling" if enable else "Disabling"
-        print(f"{action} notifications for {target_description}...")
-
-    def _matches_host(self, candidate_host, target_host):
-        """Check if candidate hostname matches target (FQDN or shortname).
-
-        Args:
-            candidate_host: Hostname to check
-            target_host: Target hostname to match against
-
-        Returns:
-            True if hosts match (exact or shortname match)
-        """
-        candidate_short = candidate_host.split(".")[0].lower()
-        candidate_lower = candidate_host.lower()
-        target_short = target_host.split(".")[0].lower()
-        target_lower = target_host.lower()
-
-        return candidate_lower == target_lower or candidate_short == target_short
-
-    def _build_ack_payload(self, host, service=None):
-        """Build acknowledgement command payload.
-
-        Args:
-            host: Target host
-            service: Optional service name (None for host ack)
-
-        Returns:
-            Dictionary payload for cmd.cgi
-        """
-        payload = {
-            "cmd_typ": 34 if service else 33,
-            "cmd_mod": 2,
-            "host": host,
-            "sticky_ack": "on",
-            "send_notification": "off",
-            "persistent": "off",
-        }
-        if service:
-            payload["service"] = service
-        return payload
-
-    def _build_downtime_payload(self, host, service=None, all_services=False):
-        """Build downtime command payload.
-
-        Args:
-            host: Target host
-            service: Optional service name
-            all_services: If True, schedules downtime for host + all services
-
-        Returns:
-            Dictionary payload for cmd.cgi
-        """
-        start, end = self._get_downtime_windows()
-
-        if all_services:
-            cmd_typ = 86
-            service_val = "all"
-        elif service:
-            cmd_typ = 56
-            service_val = service
-        else:
-            cmd_typ = 55
-            service_val = None
-
-        payload = {
-            "cmd_typ": cmd_typ,
-            "cmd_mod": 2,
-            "host": host,
-            "fixed": 1,
-            "start_time": start,
-            "end_time": end,
-        }
-
-        if service_val:
-            payload["service"] = service_val
-
-        return payload
-
-    def _build_service_result(self, host, service_name, details):
-        """Build standardized service result dictionary.
-
-        Args:
-            host: Host name
-            service_name: Service description
-            details: Service details from API
-
-        Returns:
-            Dictionary with service result data
-        """
-        status_code = details.get("status")
-        status_text = self._get_status_text(status_code, is_host=False)
-
-        return {
-            "host": host,
-            "service": service_name,
-            "status_code": status_code,
-            "status": status_text,
-            "plugin_output": details.get("plugin_output", ""),
-            "long_plugin_output": details.get("long_plugin_output", ""),
-        }
-
-    def _fetch_availability_data(self, host, service=None, days=365):
-        """Fetch availability data from archive API.
-
-        Args:
-            host: Target host
-            service: Optional service name (None for host availability)
-            days: Number of days to query
-
-        Returns:
-            Dictionary with availability percentages, or None on error
-        """
-        now_dt = datetime.datetime.now()
-        start_dt = now_dt - datetime.timedelta(days=days)
-
-        arch_params = {
-            "query": "availability",
-            "availabilityobjecttype": "services" if service else "hosts",
-            "hostname": host,
-            "starttime": int(start_dt.timestamp()),
-            "endtime": int(now_dt.timestamp()),
-            "assumeinitialstate": "true",
-            "assumestateretention": "true",
-            "assumestatesduringnagiosdowntime": "true",
-        }
-
-        if service:
-            arch_params["servicedescription"] = service
-
-        try:
-            arch_resp = self.session.get(
-                self.archive_url,
-                params=arch_params,
-                auth=self.auth,
-                verify=self.verify_ssl
-            )
-
-            if arch_resp.status_code != 200:
-                return None
-
-            arch_data = arch_resp.json()
-            avail_key = "service" if service else "host"
-            avail = arch_data.get("data", {}).get(avail_key, {})
-
-            if not avail:
-                return None
-
-            if service:
-                if avail.get("description") != service:
-                    return {"_debug_raw_dump": arch_data}
-
-                t_ok = avail.get("time_ok", 0)
-                t_warn = avail.get("time_warning", 0)
-                t_unk = avail.get("time_unknown", 0)
-                t_crit = avail.get("time_critical", 0)
-                t_nodata = avail.get("time_indeterminate_nodata", 0)
-                t_notrunning = avail.get("time_indeterminate_notrunning", 0)
-                total_time = t_ok + t_warn + t_unk + t_crit + t_nodata + t_notrunning
-
-                if total_time > 0:
-                    return {
-                        "percent_ok": (t_ok / total_time) * 100,
-                        "percent_warning": (t_warn / total_time) * 100,
-                        "percent_unknown": (t_unk / total_time) * 100,
-                        "percent_critical": (t_crit / total_time) * 100,
-                    }
-            else:
-                if not (avail.get("name") == host or avail.get("host_name") == host):
-                    return None
-
-                t_up = avail.get("time_up", 0)
-                t_down = avail.get("time_down", 0)
-                t_unreach = avail.get("time_unreachable", 0)
-                t_nodata = avail.get("time_indeterminate_nodata", 0)
-                t_notrunning = avail.get("time_indeterminate_notrunning", 0)
-                total_time = t_up + t_down + t_unreach + t_nodata + t_notrunning
-
-                if total_time > 0:
-                    return {
-                        "percent_up": (t_up / total_time) * 100,
-                        "percent_down": (t_down / total_time) * 100,
-                        "percent_unreachable": (t_unreach / total_time) * 100,
-                    }
-
-            return None
-
-        except requests.exceptions.RequestException:
-            return None
-
-    def _print_uptime_report(self, report_data, output_format, is_host=False):
-        """Print uptime/availability report in requested format.
-
-        Args:
-            report_data: Dictionary with report information
-            output_format: One of "json", "csv", "text"
-            is_host: True for host reports, False for service reports
-        """
-        if output_format == "json":
-            print(json.dumps(report_data, indent=2))
-        elif output_format == "csv":
-            report_data.pop("_debug_raw_dump", None)
-            writer = csv.DictWriter(sys.stdout, fieldnames=report_data.keys())
-            writer.writeheader()
-            writer.writerow(report_data)
-        else:
-            days = report_data.get("availability_days", 365)
-
-            if is_host:
-                print(f"\n--- Host Status & Uptime: '{report_data['host']}' ---")
-                print(f"Status        : {report_data['status']}")
-                print(f"State Duration: {report_data['duration']}")
-                print(f"Output        : {report_data['output']}")
-                print(f"\n--- {days}-Day Availability Report ---")
-
-                if report_data.get("percent_up") is not None:
-                    print(f"{'State':<12} | {'% Total Time':<15}")
-                    print("-" * 32)
-                    print(f"{'UP':<12} | {report_data['percent_up']:.3f}%")
-                    print(f"{'DOWN':<12} | {report_data['percent_down']:.3f}%")
-                    print(
-                        f"{'UNREACHABLE':<12} | "
-                        f"{report_data['percent_unreachable']:.3f}%"
-                    )
-            else:
-                host = report_data.get("host")
-                service = report_data.get("service")
-                print(f"\n--- Status & Uptime: '{service}' on '{host}' ---")
-                print(f"Status        : {report_data['status']}")
-                print(f"State Duration: {report_data['duration']}")
-                print(f"Output        : {report_data['output']}")
-                print(f"\n--- {days}-Day Availability Report ---")
-
-                if report_data.get("percent_ok") is not None:
-                    print(f"{'State':<10} | {'% Total Time':<15}")
-                    print("-" * 30)
-                    print(f"{'OK':<10} | {report_data['percent_ok']:.3f}%")
-                    print(f"{'WARNING':<10} | {report_data['percent_warning']:.3f}%")
-                    print(f"{'UNKNOWN':<10} | {report_data['percent_unknown']:.3f}%")
-                    print(f"{'CRITICAL':<10} | {report_data['percent_critical']:.3f}%")
-
-    def ack_service(self, host, service):
-        print(f"Acknowledging service '{service}' on host '{host}'...")
-        payload = self._build_ack_payload(host, service=service)
-        self._post_cmd(payload)
-
-    def ack_host(self, host):
-        print(f"Acknowledging host '{host}'...")
-        payload = self._build_ack_payload(host)
-        self._post_cmd(payload)
-
-    def ack_all_services(self, host):
-        print(f"Fetching all services for '{host}' to acknowledge...")
-        services = (
-            self._get_json({"query": "servicelist", "hostname": host})
-            .get("data", {})
-            .get("servicelist", {})
-            .get(host, {})
-        )
-        if not services:
-            print(f"No services found for host '{host}'.")
-            return
-        self.ack_host(host)
-        for svc in services.keys():
-            self.ack_service(host, svc)
-
-    def set_downtime_service(self, host, service):
-        duration_str = self._format_downtime_duration()
-        print(
-            f"Setting {duration_str} downtime for service "
-            f"'{service}' on '{host}'..."
-        )
-        payload = self._build_downtime_payload(host, service=service)
-        self._post_cmd(payload)
-
-    def set_downtime_host(self, host):
-        duration_str = self._format_downtime_duration()
-        print(f"Setting {duration_str} downtime for host '{host}'...")
-        payload = self._build_downtime_payload(host)
-        self._post_cmd(payload)
-
-    def set_downtime_all(self, host):
-        duration_str = self._format_downtime_duration()
-        print(
-            f"Setting {duration_str} downtime for host '{host}' "
-            "AND all its services..."
-        )
-        payload = self._build_downtime_payload(host, all_services=True)
-        self._post_cmd(payload)
-
-    def toggle_alerts(self, enable=True, host=None, service=None, all_services=False):
-        if host:
-            if all_services:
-                cmd_typ = 28 if enable else 29
-                self._print_toggle_action(enable, f"all services on '{host}'")
-                self._post_cmd({"cmd_typ": cmd_typ, "cmd_mod": 2, "host": host})
-            elif service:
-                cmd_typ = 22 if enable else 23
-                self._print_toggle_action(enable, f"'{service}' on '{host}'")
-                self._post_cmd(
-                    {
-                        "cmd_typ": cmd_typ,
-                        "cmd_mod": 2,
-                        "host": host,
-                        "service": service,
-                    }
-                )
-            else:
-                cmd_typ = 24 if enable else 25
-                self._print_toggle_action(enable, f"host '{host}'")
-                self._post_cmd({"cmd_typ": cmd_typ, "cmd_mod": 2, "host": host})
-        else:
-            self._print_toggle_action(enable, "global notifications")
-            self._post_cmd({"cmd_typ": 12 if enable else 11, "cmd_mod": 2})
-
-    def show_unhandled(self):
-        print("\n--- Unhandled Service Alerts ---")
-
-        # 1. Server-Side Filtering: Ask Nagios ONLY for non-OK services.
-        query_str = (
-            "query=servicelist&details=true&" "servicestatus=warning+critical+unknown"
-        )
-        services = self._get_json(query_str).get("data", {}).get("servicelist", {})
-
-        if not services:
-            print("🎉 No unhandled service alerts found!")
-            return
-
-        issue_states = {4: "WARNING", 8: "UNKNOWN", 16: "CRITICAL"}
-
-        # 2. Pre-filter: identify hosts that actually need host-level checks
-        hosts_needing_check = set()
-        for host, svc_dict in services.items():
-            for svc_name, details in svc_dict.items():
-                status_code = details.get("status")
-
-                if status_code not in issue_states.keys():
-                    continue
-
-                svc_ack = details.get(
-                    "problem_has_been_acknowledged"
-                ) or details.get("has_been_acknowledged", False)
-
-                if (
-                    not details.get("notifications_enabled", True)
-                    or svc_ack
-                    or details.get("scheduled_downtime_depth", 0) > 0
-                ):
-                    continue
-
-                hosts_needing_check.add(host)
-                break
-
-        # 3. Lazy Loading: Fetch host details ONLY for hosts with unhandled services
-        hosts = {}
-        for host in hosts_needing_check:
-            host_data = (
-                self._get_json({"query": "host", "hostname": host})
-                .get("data", {})
-                .get("host", {})
-            )
-            hosts[host] = host_data
-
-        found = False
-
-        for host, svc_dict in services.items():
-            # Skip hosts where all services are already handled at service level
-            if host not in hosts_needing_check:
-                continue
-
-            host_details = hosts.get(host, {})
-            host_ack = host_details.get(
-                "problem_has_been_acknowledged"
-            ) or host_details.get("has_been_acknowledged", False)
-
-            if (
-                not host_details.get("notifications_enabled", True)
-                or host_ack
-                or host_details.get("scheduled_downtime_depth", 0) > 0
-            ):
-                continue
-
-            for svc_name, details in svc_dict.items():
-                status_code = details.get("status")
-
-                if status_code in issue_states:
-                    svc_ack = details.get(
-                        "problem_has_been_acknowledged"
-                    ) or details.get("has_been_acknowledged", False)
-
-                    if (
-                        not details.get("notifications_enabled", True)
-                        or svc_ack
-                        or details.get("scheduled_downtime_depth", 0) > 0
-                    ):
-                        continue
-
-                    found = True
-                    status_text = issue_states[status_code]
-                    print(
-                        f"[{status_text}] {host} -> {svc_name}\n"
-                        f"    Output: {details.get('plugin_output')}"
-                    )
-
-        if not found:
-            print("🎉 No unhandled service alerts found!")
-
-    def show_service_issues(self, host=None):
-        issue_states = {4: "⚠️  WARNING", 8: "❓ UNKNOWN", 16: "❌ CRITICAL"}
-        print("\n--- List Service Issues ---")
-
-        params = {"query": "servicelist", "details": "false"}
-
-        if host:
-            params["hostname"] = host
-
-        services = self._get_json(params).get("data", {}).get("servicelist", {})
-
-        found = False
-        for current_host, svc_dict in services.items():
-            host_has_issues = False
-            for svc_name, svc_status in svc_dict.items():
-                if svc_status in issue_states:
-                    host_has_issues = True
-                    found = True
-
-            if host_has_issues:
-                print(f"{current_host}:")
-                for svc_name, svc_status in svc_dict.items():
-                    if svc_status in issue_states:
-                        print(
-                            f"    {issue_states[svc_status]} "
-                            f"for service: {svc_name}"
-                        )
-
-        if not found:
-            print("🎉 No service issues found!")
-
-    def _print_service_results(
-        self, results, output_format, show_output, header_text, secondary_key
-    ):
-        """Helper method to format and print service results consistently."""
-        if output_format == "json":
-            print(json.dumps(results, indent=2))
-        elif output_format == "csv":
-            writer = csv.DictWriter(
-                sys.stdout,
-                fieldnames=["host", "service", "status_code", "status"],
-            )
-            writer.writeheader()
-            writer.writerows(
-                [
-                    {k: r[k] for k in ["host", "service", "status_code", "status"]}
-                    for r in results
-                ]
-            )
-        else:
-            print(f"\n--- {header_text} ---")
-            for r in results:
-                extended_out = (
-                    f"\n{'-' * 70}\n{r.get('plugin_output', '')}\n"
-                    f"{r.get('long_plugin_output', '')}\n"
-                    if show_output
-                    else ""
-                )
-                print(
-                    f"{'-' * 70}\n{r['status']:<12} | "
-                    f"{r[secondary_key]}{extended_out}".strip()
-                )
-            print("-" * 70)
-
-    def show_host_services(
-        self,
-        host,
-        service=None,
-        show_output=False,
-        output_filter=None,
-        output_format="text",
-    ):
-        """Displays services for a specific host, optionally filtered."""
-        params = {
-            "query": "servicelist",
-            "hostname": host,
-            "details": "true",
-        }
-        response = self._get_json(params)
-        services = response.get("data", {}).get("servicelist", {}).get(host, {})
-
-        if not services:
-            print(f"⚠️  No services found for host '{host}'.", file=sys.stderr)
-            return
-
-        target_status = self.FILTER_MAP.get(output_filter.upper()) if output_filter else None
-
-        results = []
-        for svc_name, details in services.items():
-            if service and svc_name != service:
-                continue
-
-            status_code = details.get("status")
-
-            if target_status and status_code != target_status:
-                continue
-
-            result = self._build_service_result(host, svc_name, details)
-            results.append(result)
-
-        if not results:
-            msg = f" for specified filter '{output_filter}'" if output_filter else ""
-            print(
-                f"⚠️  Service '{service}' not found on host '{host}'{msg}.",
-                file=sys.stderr,
-            )
-            return
-
-        header = (
-            f"Monitored Service: '{service}' on '{host}'"
-            if service
-            else f"Monitored Services for Host: '{host}'"
-        )
-        self._print_service_results(
-            results,
-            output_format,
-            show_output,
-            header,
-            secondary_key="service",
-        )
-
-    def show_single_service(
-        self,
-        service=None,
-        show_output=False,
-        output_filter=None,
-        output_format="text",
-    ):
-        """Displays a specific service, across all hosts."""
-        if not service:
-            print(
-                "⚠️  No service specified. We should never be here.",
-                file=sys.stderr,
-            )
-            return
-
-        params = {
-            "query": "servicelist",
-            "details": "true",
-            "servicedescription": service,
-        }
-
-        response = self._get_json(params)
-        services = response.get("data", {}).get("servicelist", {})
-
-        if not services:
-            print(
-                f"⚠️  No hosts found running service '{service}'.",
-                file=sys.stderr,
-            )
-            return
-
-        target_status = self.FILTER_MAP.get(output_filter.upper()) if output_filter else None
-
-        results = []
-        for system_name, details in services.items():
-            if service in details:
-                svc_details = details[service]
-                status_code = svc_details.get("status")
-
-                if target_status and status_code != target_status:
-                    continue
-
-                result = self._build_service_result(system_name, service, svc_details)
-                results.append(result)
-
-        if not results:
-            msg = (
-                f" using the specified filter '{output_filter}'"
-                if output_filter
-                else ""
-            )
-            print(
-                f"⚠️  No results found for service '{service}'{msg}.",
-                file=sys.stderr,
-            )
-            return
-
-        header = f"Monitored Service: '{service}'"
-        self._print_service_results(
-            results, output_format, show_output, header, secondary_key="host"
-        )
-
-    def show_service_uptime(self, host, service, days=365, output_format="text"):
-        """Displays uptime duration and dynamic availability report."""
-        params = {
-            "query": "service",
-            "hostname": host,
-            "servicedescription": service,
-        }
-        response = self._get_json(params)
-        svc_data = response.get("data", {}).get("service", {})
-
-        if not svc_data:
-            print(
-                f"⚠️  Service '{service}' on host '{host}' not found.",
-                file=sys.stderr,
-            )
-            return
-
-        status_code = svc_data.get("status")
-        status_text = self._get_status_text(status_code, is_host=False)
-        plugin_output = svc_data.get("plugin_output", "N/A")
-
-        last_change = svc_data.get("last_state_change", 0)
-        duration_str = self._format_duration(last_change)
-
-        report_data = {
-            "host": host,
-            "service": service,
-            "status": status_text,
-            "duration": duration_str,
-            "output": plugin_output,
-            "availability_days": days,
-            "percent_ok": None,
-            "percent_warning": None,
-            "percent_unknown": None,
-            "percent_critical": None,
-        }
-
-        # Fetch Dynamic Availability Report
-        avail_data = self._fetch_availability_data(host, service=service, days=days)
-        if avail_data:
-            report_data.update(avail_data)
-
-        self._print_uptime_report(report_data, output_format, is_host=False)
-
-    def show_host_uptime(self, host, days=365, output_format="text"):
-        """Displays uptime duration and availability report for a HOST."""
-        params = {"query": "host", "hostname": host}
-        response = self._get_json(params)
-        host_data = response.get("data", {}).get("host", {})
-
-        if not host_data:
-            print(f"⚠️  Host '{host}' not found.", file=sys.stderr)
-            return
-
-        status_code = host_data.get("status")
-        status_text = self._get_status_text(status_code, is_host=True)
-        plugin_output = host_data.get("plugin_output", "N/A")
-
-        last_change = host_data.get("last_state_change", 0)
-        duration_str = self._format_duration(last_change)
-
-        report_data = {
-            "host": host,
-            "status": status_text,
-            "duration": duration_str,
-            "output": plugin_output,
-            "availability_days": days,
-            "percent_up": None,
-            "percent_down": None,
-            "percent_unreachable": None,
-        }
-
-        avail_data = self._fetch_availability_data(host, service=None, days=days)
-        if avail_data:
-            report_data.update(avail_data)
-
-        self._print_uptime_report(report_data, output_format, is_host=True)
 
-    def show_status(self):
-        print("\n--- Nagios Core Status ---")
-        prog = (
-            self._get_json({"query": "programstatus"})
-            .get("data", {})
-            .get("programstatus", {})
-        )
-        status_map = {
-            "Notifications Enabled": prog.get("enable_notifications"),
-            "Active Service Checks": prog.get("execute_service_checks"),
-            "Active Host Checks": prog.get("execute_host_checks"),
-            "Event Handlers": prog.get("enable_event_handlers"),
-        }
-        for key, val in status_map.items():
-            print(f"{key:<25}: {'✅ ENABLED' if val else '❌ DISABLED'}")
-        print()
-
-    def show_ack_history(self, host, service=None, days=7):
-        """Displays full acknowledgement history by querying active comments."""
-        # Use query=commentlist with details=true for reliable Status API data
-        params = {"query": "commentlist", "details": "true"}
-        start_ts = (datetime.datetime.now() - datetime.timedelta(days=days)).timestamp()
-
-        print(f"\n--- Acknowledgement History ({days} days) ---")
-        if service:
-            print(f"Target: {host} -> {service}")
-        else:
-            print(f"Target: Host {host}")
-        print("-" * 70)
-
-        try:
-            # Query active status for persistent comments
-            resp = self._get_json(params)
-            data = resp.get("data", {})
-            comments_blob = data.get("commentlist") or data.get("comments") or {}
-
-            # Correctly handle Nagios 4.4 dictionary iteration
-            if isinstance(comments_blob, dict):
-                comment_items = comments_blob.values()
-            else:
-                comment_items = comments_blob
-
-            found_any = False
-            for details in comment_items:
-                # Ensure we have a valid data dictionary
-                if not isinstance(details, dict):
-                    continue
-
-                # Type 4 is Acknowledgement
-                if int(details.get("entry_type", 0)) != 4:
-                    continue
-
-                # Fix Millisecond timestamps (detect values > 10,000,000,000)
-                entry_time = self._normalize_timestamp(float(details.get("entry_time", 0)))
-
-                if entry_time < start_ts:
-                    continue
-
-                log_host = details.get("host_name", "")
-                if not self._matches_host(log_host, host):
-                    continue
-
-                is_match = False
-                if service:
-                    # Service acks must match description exactly
-                    log_svc = details.get("service_description", "").lower()
-                    if log_svc == service.lower():
-                        is_match = True
-                else:
-                    # Host acks have empty service descriptions
-                    if not details.get("service_description"):
-                        is_match = True
-
-                if is_match:
-                    found_any = True
-                    ts = datetime.datetime.fromtimestamp(entry_time).strftime(
-                        self.date_format
-                    )
-                    author = details.get("author", "Unknown")
-                    msg = details.get("comment_data", "N/A")
-
-                    print(f"[{ts}] Author: {author}")
-                    print(f"    Message: {msg}")
-                    print("-" * 30)
-
-            if not found_any:
-                print("No persistent acknowledgements found for this time range.")
-
-        except Exception as e:
-            print(f"❌ Error fetching history from status API: {e}")
-
-    def show_logs(self, days=1.0, full=False):
-        """Display Nagios log entries for the specified time range.
+def __getattr__(name):
+    # Backwards compatibility for "from mozzo.cli import MozzoNagiosClient"
+    # without importing requests/yaml when only parsing arguments
+    # (module __getattr__, PEP 562, needs Python 3.7+)
+    if name in ("MozzoNagiosClient", "TimeoutHTTPAdapter"):
+        from mozzo import client, transport
 
-        Args:
-            days: Number of days to look back (default: 1.0 for 24 hours)
-            full: If True, show all entries including CURRENT STATE (default: False)
-        """
-        import re
+        return getattr(client, name, None) or getattr(transport, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-        start_ts = int((datetime.datetime.now() - datetime.timedelta(days=days)).timestamp())
 
-        params = {
-            'ts_start': start_ts,
-            'ts_end': int(datetime.datetime.now().timestamp())
-        }
-
-        try:
-            response = self.session.get(
-                self.showlog_url,
-                params=params,
-                auth=self.auth,
-                verify=self.verify_ssl
-            )
-            response.raise_for_status()
-
-            log_pattern = r'\[(\d{2}-\d{2}-\d{4}\s+\d{2}:\d{2}:\d{2})\]\s*([^\[<\n]+)'
-            matches = re.findall(log_pattern, response.text)
-
-            if not matches:
-                print(f"No log entries found for the last {days} day(s).")
-                return
-
-            print(f"\n--- Nagios Log Entries (Last {days} day(s)) ---\n")
-
-            filtered_count = 0
-            displayed_count = 0
-
-            for timestamp, message in matches:
-                message = message.strip()
-                if not message:
-                    continue
-
-                if not full:
-                    if 'CURRENT HOST STATE' in message or 'CURRENT SERVICE STATE' in message:
-                        filtered_count += 1
-                        continue
-
-                status_icon = ''
-                if 'SERVICE ALERT' in message or 'HOST ALERT' in message:
-                    for status_key, icon in self.STATUS_EMOJIS.items():
-                        if status_key in message.upper():
-                            status_icon = f"{icon} "
-                            break
-
-                print(f"{status_icon}[{timestamp}] {message}")
-                displayed_count += 1
-
-            if displayed_count == 0:
-                print("No alert entries found for the specified time range.")
-
-        except requests.exceptions.RequestException as e:
-            print(f"❌ Error fetching logs: {e}")
-
-
-def main():
+def build_parser():
     parser = argparse.ArgumentParser(
         prog="mozzo", description="Mozzo - Nagios Core command line assistant"
     )
@@ -1080,7 +54,36 @@ def main():
         action="store_true",
         help="Set downtime",
     )
+    parser.add_argument(
+        "--verify",
+        action="store_true",
+        help="After --ack/--downtime, poll Nagios until the change shows up (exit 1 if not)",
+    )
+    parser.add_argument(
+        "--bulk",
+        type=str,
+        metavar="FILE",
+        help="Read --ack/--downtime targets from FILE ('-' for stdin)",
+    )
+    parser.add_argument(
+        "--recheck",
+        action="store_true",
+        help="Force a recheck of --host (--service, --all-services) or of all --service-issues",
+    )
+    parser.add_argument(
+        "--recheck-window",
+        type=float,
+        default=None,
+        metavar="SECONDS",
+        help="Spread --recheck check times over this many seconds",
+    )
     parser.add_argument("--host", type=str, help="Target host")
+    parser.add_argument(
+        "--hostgroup", type=str, help="Target hostgroup (status, reports and write actions)"
+    )
+    parser.add_argument(
+        "--servicegroup", type=str, help="Target servicegroup (status, reports and write actions)"
+    )
     parser.add_argument("--service", type=str, help="Target service")
     parser.add_argument(
         "--all-services", action="store_true", help="Apply to all services on host"
@@ -1094,11 +97,22 @@ def main():
     parser.add_argument(
         "--status", action="store_true", help="Show status (global, host, or service)"
     )
+    parser.add_argument(
+        "--summary",
+        action="store_true",
+        help="Show host and service state totals (optionally per --hostgroup or --servicegroup)",
+    )
     parser.add_argument(
         "--uptime",
         action="store_true",
         help="Show uptime/availability report for a service",
     )
+    parser.add_argument(
+        "--report",
+        action="store_true",
+        help="Fleet availability report for all hosts, or services on --host, "
+        "--hostgroup, --servicegroup or --all-services",
+    )
     parser.add_argument(
         "--days",
         type=float,
@@ -1108,9 +122,26 @@ def main():
     parser.add_argument(
         "--format",
         type=str,
-        choices=["text", "json", "csv"],
+        choices=["text", "json", "ndjson", "csv"],
         default="text",
-        help="Output format (text, json, csv)",
+        help="Output format (text, json, ndjson, csv); json, ndjson and csv stream one row at a time",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=None,
+        help="Maximum parallel requests for multi-request operations",
+    )
+    cache_group = parser.add_mutually_exclusive_group()
+    cache_group.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Bypass the on-disk response cache",
+    )
+    cache_group.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Ignore cached responses and store fresh ones",
     )
     parser.add_argument(
         "--disable-alerts", action="store_true", help="Disable notifications"
@@ -1127,9 +158,10 @@ def main():
     parser.add_argument(
         "--output-filter",
         type=str.upper,
-        choices=["PENDING", "OK", "WARNING", "UNKNOWN", "CRITICAL"],
+        choices=["PENDING", "OK", "WARNING", "UNKNOWN", "CRITICAL", "UP", "DOWN", "UNREACHABLE"],
         default=None,
-        help="Limit results by status (e.g., OK, CRITICAL)",
+        help="Limit results by status (e.g., OK, CRITICAL); host states (UP, DOWN, "
+        "UNREACHABLE) only with --alerts/--state-changes",
     )
     parser.add_argument(
         "--ack-history",
@@ -1141,18 +173,128 @@ def main():
         action="store_true",
         help="Show Nagios log entries",
     )
+    parser.add_argument(
+        "--alerts",
+        action="store_true",
+        help="Show alert history, filtered by --host, --service, --hostgroup, "
+        "--servicegroup and --output-filter",
+    )
+    parser.add_argument(
+        "--state-changes",
+        action="store_true",
+        help="Show state change history for --host (and --service)",
+    )
+    log_mode = parser.add_mutually_exclusive_group()
+    log_mode.add_argument(
+        "--follow",
+        action="store_true",
+        help="With --log, keep polling and print new entries as they are logged",
+    )
+    log_mode.add_argument(
+        "--since-last",
+        action="store_true",
+        help="With --log, print only entries logged since the previous run",
+    )
     parser.add_argument(
         "--full",
         action="store_true",
         help="Show raw log including state dumps (for debugging)",
     )
 
-    args = parser.parse_args()
-    client = MozzoNagiosClient(
-        config_path=args.config, message=args.message, days=args.days
+    parser.add_argument(
+        "--debug-query",
+        action="store_true",
+        help="Print the filters pushed down to the status source (stderr)",
+    )
+    parser.add_argument(
+        "--no-daemon",
+        action="store_true",
+        help="Run in-process even if mozzod is running",
+    )
+    return parser
+
+
+def run(argv=None, client_factory=None):
+    """Parse arguments and run the requested action in this process.
+
+    Args:
+        argv: Argument list (defaults to sys.argv[1:])
+        client_factory: Optional callable used instead of MozzoNagiosClient
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.concurrency is not None and args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+    if args.recheck and not (args.host or args.service_issues):
+        parser.error("--recheck requires --host or --service-issues")
+    if args.recheck_window is not None and args.recheck_window < 0:
+        parser.error("--recheck-window must not be negative")
+    if args.state_changes and not args.host:
+        parser.error("--state-changes requires --host")
+    if (args.alerts or args.state_changes) and args.output_filter == "PENDING":
+        parser.error("--output-filter PENDING does not apply to history")
+    if args.output_filter in ("UP", "DOWN", "UNREACHABLE") and not (args.alerts or args.state_changes):
+        parser.error(f"--output-filter {args.output_filter} only applies to --alerts/--state-changes")
+
+    # Heavy imports (requests, urllib3, yaml) only once an action runs
+    from mozzo.client import MozzoNagiosClient
+
+    client = (client_factory or MozzoNagiosClient)(
+        config_path=args.config,
+        message=args.message,
+        days=args.days,
+        concurrency=args.concurrency,
+        cache_mode="off" if args.no_cache else "refresh" if args.refresh else "use",
+        debug_query=args.debug_query,
+        verify=args.verify,
     )
 
-    if args.unhandled:
+    if args.bulk and (args.ack or args.downtime):
+        from mozzo.targets import read_targets
+
+        try:
+            if args.bulk == "-":
+                targets = read_targets(sys.stdin)
+            else:
+                with open(args.bulk, "r", encoding="utf-8") as f:
+                    targets = read_targets(f)
+        except (OSError, ValueError) as e:
+            print(f"❌ Error reading bulk targets: {e}")
+            sys.exit(1)
+
+        if not targets:
+            print("No targets found in bulk input.")
+            return
+
+        failed = client.bulk_submit(
+            targets,
+            action="ack" if args.ack else "downtime",
+            all_services=args.all_services,
+        )
+        if failed:
+            sys.exit(1)
+    elif args.report:
+        report_days = args.days if args.days is not None else client.report_days
+        client.show_fleet_availability(
+            report_days,
+            host=args.host,
+            hostgroup=args.hostgroup,
+            servicegroup=args.servicegroup,
+            services=args.all_services,
+            output_format=args.format,
+        )
+    elif args.recheck:
+        if args.service_issues:
+            failed = client.recheck_service_issues(args.host, window=args.recheck_window)
+        else:
+            failed = client.recheck(
+                args.host, args.service, args.all_services, window=args.recheck_window
+            )
+        if failed:
+            sys.exit(1)
+    elif args.summary:
+        client.show_summary(args.hostgroup, args.servicegroup, args.format)
+    elif args.unhandled:
         client.show_unhandled()
     elif args.service_issues:
         client.show_service_issues(args.host)
@@ -1172,10 +314,17 @@ def main():
                 args.show_output,
                 args.output_filter,
                 args.format,
+                hostgroup=args.hostgroup,
+                servicegroup=args.servicegroup,
             )
         elif args.service:
             client.show_single_service(
-                args.service, args.show_output, args.output_filter, args.format
+                args.service,
+                args.show_output,
+                args.output_filter,
+                args.format,
+                hostgroup=args.hostgroup,
+                servicegroup=args.servicegroup,
             )
         else:
             client.show_status()
@@ -1185,6 +334,8 @@ def main():
             host=args.host,
             service=args.service,
             all_services=args.all_services,
+            hostgroup=args.hostgroup,
+            servicegroup=args.servicegroup,
         )
     elif args.enable_alerts:
         client.toggle_alerts(
@@ -1192,30 +343,77 @@ def main():
             host=args.host,
             service=args.service,
             all_services=args.all_services,
+            hostgroup=args.hostgroup,
+            servicegroup=args.servicegroup,
         )
     elif args.ack and args.host:
         if args.all_services:
-            client.ack_all_services(args.host)
+            failed = client.ack_all_services(args.host)
         elif args.service:
-            client.ack_service(args.host, args.service)
+            failed = client.ack_service(args.host, args.service)
         else:
-            client.ack_host(args.host)
+            failed = client.ack_host(args.host)
+        if args.verify and failed:
+            sys.exit(1)
+    elif args.ack and (args.hostgroup or args.servicegroup):
+        if client.ack_group(args.hostgroup, args.servicegroup, args.all_services):
+            sys.exit(1)
     elif args.downtime and args.host:
         if args.all_services:
-            client.set_downtime_all(args.host)
+            failed = client.set_downtime_all(args.host)
         elif args.service:
-            client.set_downtime_service(args.host, args.service)
+            failed = client.set_downtime_service(args.host, args.service)
         else:
-            client.set_downtime_host(args.host)
+            failed = client.set_downtime_host(args.host)
+        if args.verify and failed:
+            sys.exit(1)
+    elif args.downtime and (args.hostgroup or args.servicegroup):
+        if client.set_downtime_group(args.hostgroup, args.servicegroup, args.all_services):
+            sys.exit(1)
     elif args.ack_history and args.host:
         history_days = args.days if args.days is not None else client.report_days
         client.show_ack_history(args.host, args.service, history_days)
+    elif args.alerts or args.state_changes:
+        history_days = args.days if args.days is not None else 1.0
+        client.show_history(
+            "statechangelist" if args.state_changes else "alertlist",
+            history_days,
+            args.format,
+            host=args.host,
+            service=args.service,
+            hostgroup=args.hostgroup,
+            servicegroup=args.servicegroup,
+            state=args.output_filter,
+        )
     elif args.log:
         log_days = args.days if args.days is not None else 1.0
-        client.show_logs(log_days, full=args.full)
+        if args.follow:
+            client.follow_logs(log_days, full=args.full)
+        elif args.since_last:
+            client.show_logs_since_last(log_days, full=args.full)
+        else:
+            client.show_logs(log_days, full=args.full)
     else:
         parser.print_help()
 
 
+def main():
+    # Force UTF-8 output to prevent emoji Mojibake (e.g. â instead of ❌)
+    if hasattr(sys.stdout, "reconfigure"):
+        sys.stdout.reconfigure(encoding="utf-8")
+
+    argv = sys.argv[1:]
+    # Parse locally first so --help, --version and usage errors never
+    # depend on the daemon
+    args = build_parser().parse_args(argv)
+
+    if not args.no_daemon and ipc.can_forward(args):
+        exit_code = ipc.forward(argv)
+        if exit_code is not None:
+            sys.exit(exit_code)
+
+    run(argv)
+
+
 if __name__ == "__main__":
     main()
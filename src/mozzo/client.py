@@ -0,0 +1,448 @@
+# -*- coding: utf-8 -*-
+"""MozzoNagiosClient: configuration, transport and shared helpers.
+
+The user-facing actions live in mixins grouped by area (commands,
+status views, availability reports, history and logs).
+"""
+import datetime
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+import yaml
+
+from mozzo.cache import ResponseCache
+from mozzo.commands import CommandsMixin
+from mozzo.history import HistoryMixin
+from mozzo.jsonstream import iter_servicelist
+from mozzo.logs import LogsMixin
+from mozzo.ratelimit import AdaptiveLimiter
+from mozzo.reports import ReportsMixin
+from mozzo.status import StatusSourceError, UnsupportedQuery, parse_params
+from mozzo.transport import CircuitBreaker, Deadline, RetrySession, TimeoutHTTPAdapter
+from mozzo.views import StatusViewsMixin
+
+# Bytes read per chunk when streaming large statusjson.cgi responses
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+class MozzoNagiosClient(CommandsMixin, StatusViewsMixin, ReportsMixin, HistoryMixin, LogsMixin):
+    # Status emoji mappings (single source of truth)
+    STATUS_EMOJIS = {
+        'PENDING': '⏳',
+        'OK': '✅',
+        'WARNING': '⚠️ ',
+        'CRITICAL': '❌',
+        'UNKNOWN': '❓',
+        'UP': '✅',
+        'DOWN': '❌',
+        'UNREACHABLE': '❓',
+    }
+
+    # Status and filter maps used throughout the class
+    SERVICE_STATUS_MAP = {
+        1: f"{STATUS_EMOJIS['PENDING']} PENDING",
+        2: f"{STATUS_EMOJIS['OK']} OK",
+        4: f"{STATUS_EMOJIS['WARNING']} WARNING",
+        8: f"{STATUS_EMOJIS['UNKNOWN']} UNKNOWN",
+        16: f"{STATUS_EMOJIS['CRITICAL']} CRITICAL",
+    }
+
+    HOST_STATUS_MAP = {
+        0: f"{STATUS_EMOJIS['PENDING']} PENDING",
+        1: f"{STATUS_EMOJIS['PENDING']} PENDING",
+        2: f"{STATUS_EMOJIS['UP']} UP",
+        4: f"{STATUS_EMOJIS['DOWN']} DOWN",
+        8: f"{STATUS_EMOJIS['UNREACHABLE']} UNREACHABLE"
+    }
+
+    FILTER_MAP = {
+        "PENDING": 1,
+        "OK": 2,
+        "WARNING": 4,
+        "UNKNOWN": 8,
+        "CRITICAL": 16,
+    }
+
+    def __init__(
+        self,
+        config_path=None,
+        message=None,
+        days=None,
+        concurrency=None,
+        cache_mode="use",
+        debug_query=False,
+        verify=False,
+    ):
+        config_file = self._find_config(config_path)
+        if not config_file:
+            print(
+                "❌ Could not find config.yml.\n"
+                "Please ensure config.yml exists in the current directory."
+            )
+            sys.exit(1)
+        self.config_file = os.path.abspath(config_file)
+        try:
+            with open(config_file, "r", encoding="utf-8") as f:
+                self.config = yaml.safe_load(f)
+        except Exception as e:
+            print(f"❌ Error loading {config_file}: {e}")
+            sys.exit(1)
+
+        self.server = self.config.get("nagios_server", "").rstrip("/")
+        self.cgi_path = self.config.get("nagios_cgi_path", "/nagios/cgi-bin").strip("/")
+        self.auth = (
+            self.config.get("nagios_username"),
+            self.config.get("nagios_password"),
+        )
+        self.downtime_mins = self.config.get("default_downtime", 120)
+        self.report_days = self.config.get("default_reporting_days", 365)
+        self.verify_ssl = self.config.get("verify_ssl", True)
+        self.date_format = self.config.get("date_format", "%m-%d-%Y %H:%M:%S")
+        self.cmd_url = f"{self.server}/{self.cgi_path}/cmd.cgi"
+        self.json_url = f"{self.server}/{self.cgi_path}/statusjson.cgi"
+        self.archive_url = f"{self.server}/{self.cgi_path}/archivejson.cgi"
+        self.showlog_url = f"{self.server}/{self.cgi_path}/showlog.cgi"
+
+        # "cgi" submits through cmd.cgi, "file" writes to the command FIFO
+        self.command_backend = self.config.get("command_backend", "cgi")
+        self.command_file = self.config.get(
+            "command_file", "/usr/local/nagios/var/rw/nagios.cmd"
+        )
+
+        # Local cache directory for parsed snapshots and cached responses
+        self.cache_dir = os.path.expanduser(self.config.get("cache_dir", "~/.cache/mozzo"))
+
+        # Persistent state between runs, such as the --since-last log cursor
+        self.state_dir = os.path.expanduser(self.config.get("state_dir", "~/.local/state/mozzo"))
+
+        # "use" reads and writes the response cache, "refresh" only writes,
+        # "off" bypasses it entirely
+        self.cache_mode = cache_mode
+        self.cache = ResponseCache(
+            os.path.join(self.cache_dir, "responses"),
+            ttls=self.config.get("cache_ttl"),
+            max_entries=self.config.get("cache_max_entries", 256),
+        )
+        # Complete past availability slices never change; they get their own
+        # directory so short-lived responses can't evict them
+        self.availability_cache = ResponseCache(
+            os.path.join(self.cache_dir, "availability"),
+            max_entries=self.config.get("availability_cache_max_entries", 4096),
+        )
+
+        # Optional non-CGI source for status reads ("statusjson" uses the CGI)
+        self.status_backend = self.config.get("status_backend", "statusjson")
+        # Source that answered the last status query (the CGI after a fallback)
+        self.answered_by = None
+        self.status_source = self._load_status_source()
+
+        # "archivelog" computes availability offline from local Nagios logs
+        self.availability_backend = self.config.get("availability_backend", "archivejson")
+        self.availability_source = self._load_availability_source()
+
+        # "local" reads nagios.log and its archives instead of showlog.cgi
+        self.log_backend = self.config.get("log_backend", "showlog")
+        self.log_source = self._load_log_source()
+
+        # Set the custom message or fallback to default
+        self.message = message if message else "Action issued by Mozzo CLI"
+        self.days = days
+
+        # Report which filters are pushed down to the status source
+        self.debug_query = debug_query
+
+        # Poll until acks/downtime show up in Nagios, for up to verify_timeout seconds
+        self.verify = verify
+        self.verify_timeout = self.config.get("verify_timeout", 60)
+
+        # Upper bound on parallel CGI requests for multi-request operations
+        self.concurrency = max(1, int(concurrency or self.config.get("concurrency", 8)))
+
+        # Adaptive limit on cmd.cgi commands in flight (up to concurrency),
+        # with a hard cap on submissions per second (unset: no cap)
+        self.cmd_limiter = AdaptiveLimiter(self.concurrency, self.config.get("cmd_max_rps"))
+
+        # Seconds over which bulk forced rechecks are spread
+        self.recheck_window = self.config.get("recheck_window", 300)
+
+        # Configure session with (connect, read) timeouts, GET retries and
+        # an overall deadline for this run, plus a timeout adapter with a
+        # circuit breaker sized to match the concurrency limit
+        timeout = (self.config.get("connect_timeout", 10), self.config.get("read_timeout", 60))
+        self.session = RetrySession(
+            timeout=timeout,
+            retries=self.config.get("http_retries", 2),
+            backoff=self.config.get("retry_backoff", 0.5),
+            backoff_max=self.config.get("retry_backoff_max", 10),
+            deadline=Deadline(self.config.get("deadline")),
+        )
+        breaker = CircuitBreaker(
+            self.config.get("breaker_threshold", 5), self.config.get("breaker_reset", 30)
+        )
+        adapter = TimeoutHTTPAdapter(timeout=timeout, pool_maxsize=self.concurrency, breaker=breaker)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def _load_status_source(self):
+        """Create the configured status backend, or None for statusjson.cgi."""
+        if self.status_backend == "livestatus":
+            from mozzo.livestatus import LivestatusBackend
+
+            return LivestatusBackend(
+                self.config.get("livestatus_socket", "/usr/local/nagios/var/rw/live")
+            )
+        if self.status_backend == "statusdat":
+            from mozzo.statusdat import StatusDatBackend
+
+            return StatusDatBackend(
+                self.config.get("status_file", "/usr/local/nagios/var/status.dat"),
+                objects_cache=self.config.get(
+                    "objects_cache", "/usr/local/nagios/var/objects.cache"
+                ),
+                cache_dir=self.cache_dir,
+            )
+        return None
+
+    def _load_availability_source(self):
+        """Create the configured availability backend, or None for archivejson.cgi."""
+        if self.availability_backend == "archivelog":
+            from mozzo.archivelog import ArchiveLogAvailability
+
+            return ArchiveLogAvailability(
+                self.config.get("log_file", "/usr/local/nagios/var/nagios.log"),
+                self.config.get("log_archive_path", "/usr/local/nagios/var/archives"),
+                objects_cache=self.config.get(
+                    "objects_cache", "/usr/local/nagios/var/objects.cache"
+                ),
+            )
+        return None
+
+    def _load_log_source(self):
+        """Create the configured log backend, or None for showlog.cgi."""
+        if self.log_backend == "local":
+            from mozzo.nagioslog import LocalLogSource
+
+            return LocalLogSource(
+                self.config.get("log_file", "/usr/local/nagios/var/nagios.log"),
+                self.config.get("log_archive_path", "/usr/local/nagios/var/archives"),
+                cache_dir=self.cache_dir,
+            )
+        return None
+
+    def _find_config(self, provided_path):
+        if provided_path and os.path.exists(provided_path):
+            return provided_path
+
+        search_paths = [
+            os.path.expanduser("~/.config/mozzo/config.yml"),
+            "/etc/mozzo/config.yml",
+            "config.yml",
+        ]
+
+        for path in search_paths:
+            if os.path.exists(path):
+                return path
+        return None
+
+    def _normalize_timestamp(self, timestamp):
+        """Convert millisecond timestamps to seconds if needed.
+
+        Nagios CGI sometimes returns timestamps in milliseconds (>9999999999).
+        This helper normalizes them to standard Unix seconds.
+        """
+        if timestamp > 9999999999:
+            return timestamp / 1000.0
+        return timestamp
+
+    def _format_duration(self, last_change_ts):
+        """Format a timestamp delta into human-readable duration.
+
+        Args:
+            last_change_ts: Unix timestamp of the last state change
+
+        Returns:
+            Formatted string like "5d 3h 42m 15s" or "N/A" if invalid
+        """
+        if last_change_ts <= 0:
+            return "N/A"
+
+        last_change_ts = self._normalize_timestamp(last_change_ts)
+        now = datetime.datetime.now().timestamp()
+        delta = datetime.timedelta(seconds=int(now - last_change_ts))
+        hours, rem = divmod(delta.seconds, 3600)
+        minutes, seconds = divmod(rem, 60)
+        return f"{delta.days}d {hours}h {minutes}m {seconds}s"
+
+    def _fan_out(self, func, items):
+        """Run func over items using a bounded pool of worker threads.
+
+        Args:
+            func: Callable taking a single item
+            items: Iterable of items to process
+
+        Returns:
+            List of results in the same order as items
+        """
+        items = list(items)
+        if self.concurrency <= 1 or len(items) <= 1:
+            return [func(item) for item in items]
+
+        workers = min(self.concurrency, len(items))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(func, items))
+
+    def _get_json(self, params, cache=False):
+        """Fetch a statusjson.cgi query.
+
+        Args:
+            params: Query params as dict or query string
+            cache: If True, allow serving the response from the on-disk
+                cache for query types listed in the cache TTLs
+
+        Returns:
+            Parsed JSON response
+        """
+        if self.status_source is not None:
+            try:
+                data = self.status_source.get_json(params)
+                self.answered_by = self.status_backend
+                return data
+            except UnsupportedQuery:
+                # Fall through to statusjson.cgi for anything the backend can't answer
+                pass
+            except StatusSourceError as e:
+                print(f"❌ Error fetching data: {e}")
+                sys.exit(1)
+
+        self.answered_by = "statusjson"
+        cache_key = None
+        if cache and self.cache_mode != "off":
+            query = parse_params(params).get("query")
+            if query in self.cache.ttls:
+                cache_key = self.cache.key(query, self.json_url, params, user=self.auth[0])
+                if self.cache_mode == "use":
+                    cached = self.cache.get(cache_key, self.cache.ttls[query])
+                    if cached is not None:
+                        return cached
+
+        try:
+            response = self.session.get(
+                self.json_url, params=params, auth=self.auth, verify=self.verify_ssl
+            )
+            response.raise_for_status()
+            data = response.json()
+        except requests.exceptions.RequestException as e:
+            print(f"❌ HTTP Error fetching data: {e}")
+            sys.exit(1)
+
+        if cache_key:
+            self.cache.set(cache_key, data)
+        return data
+
+    def _iter_services(self, params):
+        """Yield service records from a servicelist query as it streams in.
+
+        The statusjson.cgi response is parsed incrementally, so memory
+        stays flat however many services the query matches.
+
+        Args:
+            params: servicelist query params as dict or query string
+
+        Yields:
+            (host, service, details) tuples
+        """
+        if self.status_source is not None:
+            services = self._get_json(params).get("data", {}).get("servicelist", {})
+            for host, svc_dict in services.items():
+                for service, details in svc_dict.items():
+                    yield host, service, details
+            return
+
+        self.answered_by = "statusjson"
+        try:
+            with self.session.get(
+                self.json_url,
+                params=params,
+                auth=self.auth,
+                verify=self.verify_ssl,
+                stream=True,
+            ) as response:
+                response.raise_for_status()
+                yield from iter_servicelist(response.iter_content(chunk_size=STREAM_CHUNK_SIZE))
+        except requests.exceptions.RequestException as e:
+            print(f"❌ HTTP Error fetching data: {e}")
+            sys.exit(1)
+        except ValueError as e:
+            print(f"❌ Error parsing data: {e}")
+            sys.exit(1)
+
+    def _resolve_host(self, host):
+        """Resolve a shortname or differently-cased host to its Nagios name.
+
+        Args:
+            host: Host name as given by the user
+
+        Returns:
+            The single matching Nagios host name, or host unchanged
+        """
+        hostlist = (
+            self._get_json({"query": "hostlist"}, cache=True)
+            .get("data", {})
+            .get("hostlist", {})
+        )
+        if host in hostlist:
+            return host
+        matches = [name for name in hostlist if self._matches_host(name, host)]
+        return matches[0] if len(matches) == 1 else host
+
+    def _get_status_text(self, status_code, is_host=False):
+        """Get human-readable status text for a status code.
+
+        Args:
+            status_code: Numeric status code from Nagios
+            is_host: If True, use HOST_STATUS_MAP, else SERVICE_STATUS_MAP
+
+        Returns:
+            Formatted status string with emoji, or fallback format
+        """
+        if is_host:
+            return self.HOST_STATUS_MAP.get(status_code, f"CODE_{status_code}")
+        return self.SERVICE_STATUS_MAP.get(status_code, f"[{status_code}]")
+
+    def _matches_host(self, candidate_host, target_host):
+        """Check if candidate hostname matches target (FQDN or shortname).
+
+        Args:
+            candidate_host: Hostname to check
+            target_host: Target hostname to match against
+
+        Returns:
+            True if hosts match (exact or shortname match)
+        """
+        candidate_short = candidate_host.split(".")[0].lower()
+        candidate_lower = candidate_host.lower()
+        target_short = target_host.split(".")[0].lower()
+        target_lower = target_host.lower()
+
+        return candidate_lower == target_lower or candidate_short == target_short
+
+    def _is_handled(self, details):
+        """Check if a host or service problem is already being handled.
+
+        Args:
+            details: Host or service details from API
+
+        Returns:
+            True if notifications are disabled, the problem is acknowledged
+            or the object is in scheduled downtime
+        """
+        acknowledged = details.get("problem_has_been_acknowledged") or details.get(
+            "has_been_acknowledged", False
+        )
+        return (
+            not details.get("notifications_enabled", True)
+            or bool(acknowledged)
+            or details.get("scheduled_downtime_depth", 0) > 0
+        )
@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+"""Nagios external command file backend.
+
+Translates the cmd.cgi payloads built by MozzoNagiosClient into external
+command lines and writes them straight to the Nagios command FIFO
+(nagios.cmd), bypassing the web server and CGI layer entirely.
+"""
+import datetime
+import fcntl
+import os
+import select
+import time
+
+_DOWNTIME_ARGS = "{start};{end};{fixed};0;{duration};{author};{comment}"
+_ACK_ARGS = "{sticky};{notify};{persistent};{author};{comment}"
+
+# cmd.cgi cmd_typ -> external command templates
+EXTERNAL_COMMANDS = {
+    7: ["SCHEDULE_{forced}SVC_CHECK;{host};{service};{start}"],
+    11: ["DISABLE_NOTIFICATIONS"],
+    12: ["ENABLE_NOTIFICATIONS"],
+    22: ["ENABLE_SVC_NOTIFICATIONS;{host};{service}"],
+    23: ["DISABLE_SVC_NOTIFICATIONS;{host};{service}"],
+    24: ["ENABLE_HOST_NOTIFICATIONS;{host}"],
+    25: ["DISABLE_HOST_NOTIFICATIONS;{host}"],
+    28: ["ENABLE_HOST_SVC_NOTIFICATIONS;{host}"],
+    29: ["DISABLE_HOST_SVC_NOTIFICATIONS;{host}"],
+    33: ["ACKNOWLEDGE_HOST_PROBLEM;{host};" + _ACK_ARGS],
+    34: ["ACKNOWLEDGE_SVC_PROBLEM;{host};{service};" + _ACK_ARGS],
+    55: ["SCHEDULE_HOST_DOWNTIME;{host};" + _DOWNTIME_ARGS],
+    56: ["SCHEDULE_SVC_DOWNTIME;{host};{service};" + _DOWNTIME_ARGS],
+    63: ["ENABLE_HOSTGROUP_SVC_NOTIFICATIONS;{hostgroup}"],
+    64: ["DISABLE_HOSTGROUP_SVC_NOTIFICATIONS;{hostgroup}"],
+    65: ["ENABLE_HOSTGROUP_HOST_NOTIFICATIONS;{hostgroup}"],
+    66: ["DISABLE_HOSTGROUP_HOST_NOTIFICATIONS;{hostgroup}"],
+    84: ["SCHEDULE_HOSTGROUP_HOST_DOWNTIME;{hostgroup};" + _DOWNTIME_ARGS],
+    85: ["SCHEDULE_HOSTGROUP_SVC_DOWNTIME;{hostgroup};" + _DOWNTIME_ARGS],
+    # cmd.cgi schedules the host itself along with all of its services
+    86: [
+        "SCHEDULE_HOST_DOWNTIME;{host};" + _DOWNTIME_ARGS,
+        "SCHEDULE_HOST_SVC_DOWNTIME;{host};" + _DOWNTIME_ARGS,
+    ],
+    96: ["SCHEDULE_{forced}HOST_CHECK;{host};{start}"],
+    109: ["ENABLE_SERVICEGROUP_SVC_NOTIFICATIONS;{servicegroup}"],
+    110: ["DISABLE_SERVICEGROUP_SVC_NOTIFICATIONS;{servicegroup}"],
+    111: ["ENABLE_SERVICEGROUP_HOST_NOTIFICATIONS;{servicegroup}"],
+    112: ["DISABLE_SERVICEGROUP_HOST_NOTIFICATIONS;{servicegroup}"],
+    121: ["SCHEDULE_SERVICEGROUP_HOST_DOWNTIME;{servicegroup};" + _DOWNTIME_ARGS],
+    122: ["SCHEDULE_SERVICEGROUP_SVC_DOWNTIME;{servicegroup};" + _DOWNTIME_ARGS],
+}
+
+# Extra lines cmd.cgi adds when "ahas" (downtime for hosts too) is on
+AHAS_COMMANDS = {
+    85: "SCHEDULE_HOSTGROUP_HOST_DOWNTIME;{hostgroup};" + _DOWNTIME_ARGS,
+    122: "SCHEDULE_SERVICEGROUP_HOST_DOWNTIME;{servicegroup};" + _DOWNTIME_ARGS,
+}
+
+
+class UnsupportedCommand(ValueError):
+    """Raised when a payload has no external command equivalent."""
+
+
+def _clean(value):
+    # A newline would terminate the command and start a new one
+    return " ".join(str(value).splitlines())
+
+
+def _to_epoch(value, date_format):
+    if isinstance(value, (int, float)):
+        return int(value)
+    return int(datetime.datetime.strptime(value, date_format).timestamp())
+
+
+def format_command(payload, author, comment, date_format):
+    """Translate a cmd.cgi payload into external command lines.
+
+    Args:
+        payload: Dictionary payload as built for cmd.cgi
+        author: Author name for acknowledgements and downtime
+        comment: Comment text for acknowledgements and downtime
+        date_format: strftime format used for start_time/end_time
+
+    Returns:
+        List of external command strings without timestamp prefix
+
+    Raises:
+        UnsupportedCommand: If the cmd_typ has no mapping
+    """
+    templates = EXTERNAL_COMMANDS.get(payload.get("cmd_typ"))
+    if not templates:
+        raise UnsupportedCommand(
+            f"cmd_typ {payload.get('cmd_typ')} is not supported by the command file backend"
+        )
+
+    if payload.get("ahas") == "on" and payload.get("cmd_typ") in AHAS_COMMANDS:
+        templates = [AHAS_COMMANDS[payload["cmd_typ"]]] + templates
+
+    fields = {
+        "host": payload.get("host", ""),
+        "service": payload.get("service", ""),
+        "hostgroup": payload.get("hostgroup", ""),
+        "servicegroup": payload.get("servicegroup", ""),
+        "sticky": 2 if payload.get("sticky_ack") == "on" else 1,
+        "notify": 1 if payload.get("send_notification") == "on" else 0,
+        "persistent": 1 if payload.get("persistent") == "on" else 0,
+        "fixed": payload.get("fixed", 1),
+        "forced": "FORCED_" if payload.get("force_check") == "on" else "",
+        "author": author,
+        "comment": comment,
+    }
+    if "start_time" in payload:
+        fields["start"] = _to_epoch(payload["start_time"], date_format)
+    if "end_time" in payload:
+        end = _to_epoch(payload["end_time"], date_format)
+        fields.update(end=end, duration=max(0, end - fields["start"]))
+
+    fields = {key: _clean(value) for key, value in fields.items()}
+    return [template.format(**fields) for template in templates]
+
+
+def write_commands(path, lines, timestamp=None):
+    """Write external command lines to the Nagios command file.
+
+    Lines are batched into as few writes as possible, each no larger than
+    PIPE_BUF so concurrent writers can never interleave partial commands.
+
+    Args:
+        path: Path to the command FIFO (e.g. /usr/local/nagios/var/rw/nagios.cmd)
+        lines: External command strings without timestamp prefix
+        timestamp: Optional Unix timestamp for the command prefix
+
+    Raises:
+        OSError: If the command file cannot be opened or written; opening
+            fails immediately with ENXIO when Nagios is not reading the FIFO
+    """
+    ts = int(timestamp if timestamp is not None else time.time())
+    encoded = [f"[{ts}] {line}\n".encode("utf-8") for line in lines]
+    if not encoded:
+        return
+
+    batches = []
+    batch = b""
+    for entry in encoded:
+        if batch and len(batch) + len(entry) > select.PIPE_BUF:
+            batches.append(batch)
+            batch = b""
+        batch += entry
+    batches.append(batch)
+
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_NONBLOCK)
+    try:
+        # Non-blocking open only to fail fast without a reader; write blocking
+        flags = fcntl.fcntl(fd, fcntl.F_GETFL)
+        fcntl.fcntl(fd, fcntl.F_SETFL, flags & ~os.O_NONBLOCK)
+        for data in batches:
+            while data:
+                written = os.write(fd, data)
+                data = data[written:]
+    finally:
+        os.close(fd)
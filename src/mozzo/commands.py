@@ -0,0 +1,844 @@
+# -*- coding: utf-8 -*-
+"""Write actions: acknowledgements, downtime, rechecks and notification toggles."""
+import codecs
+import datetime
+import re
+import time
+
+import requests
+
+
+class CommandsMixin:
+    # cmd.cgi result markers and how much of the page we read to find them
+    CMD_SUCCESS_MARKER = "successfully submitted"
+    CMD_ERROR_PATTERN = re.compile(
+        r"<div\s+class=['\"]?errorMessage['\"]?\s*>(.*?)</div>",
+        re.IGNORECASE | re.DOTALL,
+    )
+    CMD_RESPONSE_BUDGET = 32 * 1024
+    # Leftover page we still read so the connection can be reused
+    CMD_DRAIN_LIMIT = 64 * 1024
+
+    def _build_cmd_result(self, status, error=None):
+        """Build standardized command result dictionary.
+
+        Args:
+            status: One of "submitted", "rejected", "unconfirmed",
+                "http_error", "write_error"
+            error: Optional error text reported by Nagios or the transport
+
+        Returns:
+            Dictionary with "ok", "status", "error" and printable "message"
+        """
+        if status == "submitted":
+            message = "✅ Command successfully submitted to Nagios."
+        elif status == "rejected":
+            message = f"❌ Nagios rejected command: {error}"
+        elif status == "http_error":
+            message = f"❌ HTTP Error submitting command: {error}"
+        elif status == "write_error":
+            message = f"❌ Error writing to command file: {error}"
+        else:
+            message = (
+                "⚠️ Command sent, but success message not found. "
+                "Check permissions."
+            )
+        return {
+            "ok": status == "submitted",
+            "status": status,
+            "error": error,
+            "message": message,
+        }
+
+    def _parse_cmd_response(self, response):
+        """Read a streamed cmd.cgi response only until its result is known.
+
+        Stops at the success or error marker, or once CMD_RESPONSE_BUDGET
+        bytes have been read; _release_cmd_response() deals with the
+        rest of the page.
+
+        Args:
+            response: Streamed requests response from cmd.cgi
+
+        Returns:
+            Command result dictionary from _build_cmd_result()
+        """
+        decoder = codecs.getincrementaldecoder(response.encoding or "utf-8")(
+            errors="replace"
+        )
+        page = ""
+        bytes_read = 0
+
+        for chunk in response.iter_content(chunk_size=4096):
+            bytes_read += len(chunk)
+            page += decoder.decode(chunk)
+
+            if self.CMD_SUCCESS_MARKER in page:
+                return self._build_cmd_result("submitted")
+
+            match = self.CMD_ERROR_PATTERN.search(page)
+            if match:
+                error = re.sub(r"<[^>]+>", "", match.group(1))
+                return self._build_cmd_result("rejected", " ".join(error.split()))
+
+            if bytes_read >= self.CMD_RESPONSE_BUDGET:
+                break
+
+        return self._build_cmd_result("unconfirmed")
+
+    def _release_cmd_response(self, response):
+        """Return a cmd.cgi connection to the pool.
+
+        A keep-alive connection can only be reused once its response
+        has been read to the end, so the (short) rest of the page is
+        drained first. Pages longer than CMD_DRAIN_LIMIT are not worth
+        downloading; their connection is closed instead.
+        """
+        drained = 0
+        try:
+            for chunk in response.iter_content(chunk_size=4096):
+                drained += len(chunk)
+                if drained > self.CMD_DRAIN_LIMIT:
+                    response.close()
+                    return
+        except requests.exceptions.StreamConsumedError:
+            # Already read to the end while parsing
+            pass
+        except requests.exceptions.RequestException:
+            response.close()
+            return
+        response.raw.release_conn()
+
+    def _send_cmd(self, payload):
+        """Submit a command to cmd.cgi without printing.
+
+        Args:
+            payload: Dictionary payload for cmd.cgi
+
+        Returns:
+            Command result dictionary from _build_cmd_result()
+        """
+        if self.command_backend == "file":
+            return self._write_cmd_file([payload])[0]
+
+        payload["btnSubmit"] = "Commit"
+        payload["com_author"] = self.auth[0]
+        payload["com_data"] = self.message
+
+        response = None
+        overloaded = False
+        start = self.cmd_limiter.acquire()
+        try:
+            response = self.session.post(
+                self.cmd_url,
+                data=payload,
+                auth=self.auth,
+                verify=self.verify_ssl,
+                stream=True,
+            )
+            response.raise_for_status()
+            return self._parse_cmd_response(response)
+        except requests.exceptions.HTTPError as e:
+            overloaded = e.response is not None and e.response.status_code >= 500
+            return self._build_cmd_result("http_error", str(e))
+        except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+            overloaded = True
+            return self._build_cmd_result("http_error", str(e))
+        except requests.exceptions.RequestException as e:
+            return self._build_cmd_result("http_error", str(e))
+        finally:
+            self.cmd_limiter.release(start, overloaded)
+            if response is not None:
+                self._release_cmd_response(response)
+
+    def _send_cmds(self, payloads):
+        """Submit several independent commands concurrently.
+
+        Args:
+            payloads: List of cmd.cgi payloads
+
+        Returns:
+            List of result dictionaries in the same order as payloads
+        """
+        if self.command_backend == "file":
+            return self._write_cmd_file(payloads)
+        self.cmd_limiter.reset_stats()
+        return self._fan_out(self._send_cmd, payloads)
+
+    def _print_throughput(self):
+        """Print the cmd.cgi throughput achieved by the last batch."""
+        if self.command_backend == "file":
+            return
+        stats = self.cmd_limiter.stats()
+        if stats["commands"] < 2 or not stats["rate"]:
+            return
+        overloads = f", {stats['overloads']} slow or failed" if stats["overloads"] else ""
+        print(
+            f"Throughput: {stats['commands']} commands in {stats['elapsed']:.1f}s "
+            f"({stats['rate']:.1f}/s), concurrency {stats['concurrency']}/"
+            f"{self.cmd_limiter.max_concurrency}{overloads}"
+        )
+
+    def _write_cmd_file(self, payloads):
+        """Write commands to the Nagios external command file in one batch.
+
+        Args:
+            payloads: List of cmd.cgi payloads to translate and write
+
+        Returns:
+            List of result dictionaries in the same order as payloads
+        """
+        # Only needed when running on the Nagios host itself
+        from mozzo import cmdfile
+
+        results = [None] * len(payloads)
+        lines = []
+        written = []
+        for index, payload in enumerate(payloads):
+            try:
+                lines.extend(
+                    cmdfile.format_command(
+                        payload, self.auth[0], self.message, self.date_format
+                    )
+                )
+                written.append(index)
+            except ValueError as e:
+                results[index] = self._build_cmd_result("rejected", str(e))
+
+        try:
+            cmdfile.write_commands(self.command_file, lines)
+            outcome = self._build_cmd_result("submitted")
+        except OSError as e:
+            outcome = self._build_cmd_result("write_error", f"{self.command_file}: {e}")
+
+        for index in written:
+            results[index] = dict(outcome)
+        return results
+
+    def _post_cmd(self, payload):
+        result = self._send_cmd(payload)
+        print(result["message"])
+        return result
+
+    def _get_downtime_windows(self):
+        now = datetime.datetime.now()
+        if self.days is not None:
+            end = now + datetime.timedelta(days=self.days)
+        else:
+            end = now + datetime.timedelta(minutes=self.downtime_mins)
+        return now.strftime(self.date_format), end.strftime(self.date_format)
+
+    def _format_downtime_duration(self):
+        """Format downtime duration string based on config.
+
+        Returns:
+            String like "5 days" or "120m" based on self.days setting
+        """
+        return f"{self.days} days" if self.days is not None else f"{self.downtime_mins}m"
+
+    def _print_toggle_action(self, enable, target_description):
+        """Print enable/disable notification message.
+
+        Args:
+            enable: True for enabling, False for disabling
+            target_description: Description of what's being toggled
+        """
+        action = "Enabling" if enable else "Disabling"
+        print(f"{action} notifications for {target_description}...")
+
+    def _build_ack_payload(self, host, service=None):
+        """Build acknowledgement command payload.
+
+        Args:
+            host: Target host
+            service: Optional service name (None for host ack)
+
+        Returns:
+            Dictionary payload for cmd.cgi
+        """
+        payload = {
+            "cmd_typ": 34 if service else 33,
+            "cmd_mod": 2,
+            "host": host,
+            "sticky_ack": "on",
+            "send_notification": "off",
+            "persistent": "off",
+        }
+        if service:
+            payload["service"] = service
+        return payload
+
+    def _build_downtime_payload(self, host, service=None, all_services=False):
+        """Build downtime command payload.
+
+        Args:
+            host: Target host
+            service: Optional service name
+            all_services: If True, schedules downtime for host + all services
+
+        Returns:
+            Dictionary payload for cmd.cgi
+        """
+        start, end = self._get_downtime_windows()
+
+        if all_services:
+            cmd_typ = 86
+            service_val = "all"
+        elif service:
+            cmd_typ = 56
+            service_val = service
+        else:
+            cmd_typ = 55
+            service_val = None
+
+        payload = {
+            "cmd_typ": cmd_typ,
+            "cmd_mod": 2,
+            "host": host,
+            "fixed": 1,
+            "start_time": start,
+            "end_time": end,
+        }
+
+        if service_val:
+            payload["service"] = service_val
+
+        return payload
+
+    def _build_group_downtime_payload(self, hostgroup=None, servicegroup=None, all_services=False):
+        """Build a native hostgroup/servicegroup downtime payload.
+
+        One command covers every member: hosts in a hostgroup (services
+        too with all_services), services in a servicegroup (their hosts
+        too with all_services).
+
+        Args:
+            hostgroup: Target hostgroup
+            servicegroup: Target servicegroup (used when no hostgroup)
+            all_services: Include services of hostgroup hosts, or hosts
+                of servicegroup services
+
+        Returns:
+            Dictionary payload for cmd.cgi
+        """
+        start, end = self._get_downtime_windows()
+        if hostgroup:
+            payload = {"cmd_typ": 85 if all_services else 84, "hostgroup": hostgroup}
+        else:
+            payload = {"cmd_typ": 122, "servicegroup": servicegroup}
+        payload.update(cmd_mod=2, fixed=1, start_time=start, end_time=end)
+        if all_services:
+            # "Schedule downtime for hosts too"
+            payload["ahas"] = "on"
+        return payload
+
+    def _build_recheck_payload(self, host, service=None, check_time=None):
+        """Build a forced host or service check payload.
+
+        Args:
+            host: Target host
+            service: Optional service name (None for a host check)
+            check_time: Unix timestamp to run the check at (default: now)
+
+        Returns:
+            Dictionary payload for cmd.cgi
+        """
+        when = datetime.datetime.fromtimestamp(check_time if check_time is not None else time.time())
+        payload = {
+            "cmd_typ": 7 if service else 96,
+            "cmd_mod": 2,
+            "host": host,
+            "start_time": when.strftime(self.date_format),
+            "force_check": "on",
+        }
+        if service:
+            payload["service"] = service
+        return payload
+
+    def _print_ack_action(self, host, service=None):
+        """Print acknowledgement progress message for a host or service."""
+        if service:
+            print(f"Acknowledging service '{service}' on host '{host}'...")
+        else:
+            print(f"Acknowledging host '{host}'...")
+
+    def ack_service(self, host, service):
+        self._print_ack_action(host, service)
+        payload = self._build_ack_payload(host, service=service)
+        result = self._post_cmd(payload)
+        return self._verify_batch([(host, service)], [result], "ack")
+
+    def ack_host(self, host):
+        self._print_ack_action(host)
+        payload = self._build_ack_payload(host)
+        result = self._post_cmd(payload)
+        return self._verify_batch([(host, None)], [result], "ack")
+
+    def _get_service_names(self, host):
+        """Return the (cacheable) service list for a host, keyed by name."""
+        return (
+            self._get_json({"query": "servicelist", "hostname": host}, cache=True)
+            .get("data", {})
+            .get("servicelist", {})
+            .get(host, {})
+        )
+
+    def ack_all_services(self, host):
+        print(f"Fetching all services for '{host}' to acknowledge...")
+        services = self._get_service_names(host)
+        if not services:
+            # Allow shortnames: retry with the resolved Nagios host name
+            resolved = self._resolve_host(host)
+            if resolved != host:
+                host = resolved
+                services = self._get_service_names(host)
+        if not services:
+            print(f"No services found for host '{host}'.")
+            return 0
+        targets = [None] + list(services.keys())
+        payloads = [self._build_ack_payload(host, service=svc) for svc in targets]
+        results = self._send_cmds(payloads)
+
+        # Report in submission order regardless of completion order
+        for svc, result in zip(targets, results):
+            self._print_ack_action(host, svc)
+            print(result["message"])
+        self._print_throughput()
+        return self._verify_batch([(host, svc) for svc in targets], results, "ack")
+
+    def set_downtime_service(self, host, service):
+        duration_str = self._format_downtime_duration()
+        print(
+            f"Setting {duration_str} downtime for service "
+            f"'{service}' on '{host}'..."
+        )
+        payload = self._build_downtime_payload(host, service=service)
+        result = self._post_cmd(payload)
+        return self._verify_batch([(host, service)], [result], "downtime")
+
+    def set_downtime_host(self, host):
+        duration_str = self._format_downtime_duration()
+        print(f"Setting {duration_str} downtime for host '{host}'...")
+        payload = self._build_downtime_payload(host)
+        result = self._post_cmd(payload)
+        return self._verify_batch([(host, None)], [result], "downtime")
+
+    def set_downtime_all(self, host):
+        duration_str = self._format_downtime_duration()
+        print(
+            f"Setting {duration_str} downtime for host '{host}' "
+            "AND all its services..."
+        )
+        payload = self._build_downtime_payload(host, all_services=True)
+        result = self._post_cmd(payload)
+        return self._verify_batch([(host, None)], [result], "downtime")
+
+    def _verify_batch(self, targets, results, action):
+        """Verify the submitted commands of a batch when --verify is on.
+
+        Returns:
+            Number of submitted targets Nagios did not confirm
+        """
+        if not self.verify:
+            return 0
+        submitted = [target for target, result in zip(targets, results) if result["ok"]]
+        if not submitted:
+            return 0
+        return self.verify_applied(submitted, action)
+
+    def _is_applicable(self, details, action):
+        # Nagios only acknowledges problems: an OK/UP or PENDING target never shows an ack
+        return action != "ack" or details.get("status") not in (1, 2)
+
+    def _is_applied(self, details, action):
+        if action == "ack":
+            return bool(details.get("problem_has_been_acknowledged"))
+        return (details.get("scheduled_downtime_depth") or 0) > 0
+
+    def _verify_plan(self, targets, action, scope, all_services=False):
+        """Plan the narrowest status queries covering a verify batch.
+
+        Groups use their scope; otherwise queries are narrowed to the
+        single host or service description of the batch, to problem
+        states for acks (only problems can be acknowledged), or else
+        to one small query per host.
+
+        Returns:
+            List of statusjson params, polled together each round
+        """
+        if targets is None:
+            plan = []
+            if "hostgroup" in scope or all_services:
+                # hostlist cannot be scoped by servicegroup; see _group_targets()
+                hostgroup = {"hostgroup": scope["hostgroup"]} if "hostgroup" in scope else {}
+                plan.append(dict(hostgroup, query="hostlist", details="true"))
+            if "servicegroup" in scope or all_services:
+                plan.append(dict(scope, query="servicelist", details="true"))
+            return plan
+
+        plan = []
+        problems_only = action == "ack"
+        hosts = sorted({host for host, service in targets if service is None})
+        if len(hosts) == 1 or (hosts and not problems_only):
+            plan.extend({"query": "host", "hostname": host} for host in hosts)
+        elif hosts:
+            plan.append({"query": "hostlist", "details": "true", "hoststatus": "down unreachable"})
+
+        services = [(host, service) for host, service in targets if service is not None]
+        service_hosts = sorted({host for host, _ in services})
+        descriptions = {service for _, service in services}
+        base = {"query": "servicelist", "details": "true"}
+        if len(service_hosts) == 1:
+            plan.append(dict(base, hostname=service_hosts[0]))
+        elif len(descriptions) == 1:
+            plan.append(dict(base, servicedescription=descriptions.pop()))
+        elif services and problems_only:
+            plan.append(dict(base, servicestatus="warning critical unknown"))
+        else:
+            plan.extend(dict(base, hostname=host) for host in service_hosts)
+        return plan
+
+    def _group_targets(self, seen, scope, all_services=False):
+        """Pick the targets of a group command out of a verify snapshot.
+
+        Returns:
+            List of (host, service) tuples
+        """
+        if "hostgroup" in scope:
+            return list(seen)
+        services = [target for target in seen if target[1] is not None]
+        if not all_services:
+            return services
+        # Hosts of the servicegroup's services, out of the unscoped hostlist
+        return services + sorted({(host, None) for host, _ in services})
+
+    def _verify_query(self, params):
+        """Run one planned verify query.
+
+        Returns:
+            Dictionary of (host, service) -> status details
+        """
+        if params["query"] == "servicelist":
+            return {(host, service): details for host, service, details in self._iter_services(params)}
+        data = self._get_json(params).get("data", {})
+        if params["query"] == "hostlist":
+            return {(host, None): details for host, details in data.get("hostlist", {}).items()}
+        return {(params["hostname"], None): data["host"]} if data.get("host") else {}
+
+    def _verify_snapshot(self, plan):
+        """Fetch current state for a whole batch, running the plan's queries together.
+
+        Returns:
+            Dictionary of (host, service) -> status details
+        """
+        seen = {}
+        for found in self._fan_out(self._verify_query, plan):
+            seen.update(found)
+        return seen
+
+    def verify_applied(self, targets, action, scope=None, all_services=False):
+        """Poll Nagios until every target shows the acknowledgement or downtime.
+
+        "successfully submitted" only means cmd.cgi queued the command,
+        so the batch is checked with the narrowest hostlist/servicelist
+        queries that cover it (see _verify_plan()), backing off between
+        polls, until every target is confirmed or verify_timeout seconds
+        pass. Acks on targets that are OK/UP or PENDING are reported as
+        not applicable instead of failed.
+
+        Args:
+            targets: List of (host, service) tuples, or None for every
+                host in scope["hostgroup"] / service in scope["servicegroup"]
+            action: "ack" or "downtime"
+            scope: Optional {"hostgroup": ...} or {"servicegroup": ...}
+            all_services: With a group scope, the command covered both the
+                group's hosts and their services
+
+        Returns:
+            Number of targets not confirmed
+        """
+        scope = scope or {}
+        plan = self._verify_plan(targets, action, scope, all_services)
+        # Targets missing from a problem-state query have no problem to acknowledge
+        state_narrowed = {
+            "host" if params["query"] == "hostlist" else "service"
+            for params in plan
+            if "hoststatus" in params or "servicestatus" in params
+        }
+
+        started = time.monotonic()
+        delay = 1
+        while True:
+            seen = self._verify_snapshot(plan)
+            wanted = self._group_targets(seen, scope, all_services) if targets is None else targets
+            confirmed = {t for t in wanted if t in seen and self._is_applied(seen[t], action)}
+            skipped = {
+                t for t in wanted
+                if t not in confirmed and (
+                    not self._is_applicable(seen[t], action) if t in seen
+                    else ("host" if t[1] is None else "service") in state_narrowed
+                )
+            }
+            remaining = self.verify_timeout - (time.monotonic() - started)
+            if len(confirmed) + len(skipped) == len(set(wanted)) or remaining <= 0:
+                break
+            time.sleep(min(delay, remaining))
+            delay = min(delay * 2, 10)
+
+        missing = [t for t in wanted if t not in confirmed and t not in skipped]
+        elapsed = time.monotonic() - started
+        not_applicable = f", {len(skipped)} not applicable" if skipped else ""
+        print(
+            f"\n--- Verification: {len(confirmed)} confirmed, {len(missing)} not confirmed"
+            f"{not_applicable} after {elapsed:.0f}s ---"
+        )
+        state = "acknowledged" if action == "ack" else "in downtime"
+        for host, service in wanted:
+            target = f"{host} -> {service}" if service else host
+            if (host, service) in confirmed:
+                print(f"✅ {target}: {state}")
+            elif (host, service) in skipped:
+                print(f"➖ {target}: not applicable (no problem to acknowledge)")
+            elif (host, service) in seen:
+                print(f"❌ {target}: not {state}")
+            else:
+                print(f"❓ {target}: not found")
+        return len(missing)
+
+    def _group_label(self, hostgroup=None, servicegroup=None):
+        return f"hostgroup '{hostgroup}'" if hostgroup else f"servicegroup '{servicegroup}'"
+
+    def _group_problem_targets(self, hostgroup=None, servicegroup=None, all_services=False):
+        """Resolve a group to the hosts and services that have problems.
+
+        Uses one hostlist query for hostgroup hosts and one streamed
+        servicelist query for services, both filtered by Nagios.
+
+        Returns:
+            List of (host, service) tuples, service is None for hosts
+        """
+        targets = []
+        if hostgroup:
+            hosts = (
+                self._get_json(
+                    {"query": "hostlist", "hostgroup": hostgroup, "hoststatus": "down unreachable"}
+                )
+                .get("data", {})
+                .get("hostlist", {})
+            )
+            targets.extend((host, None) for host in hosts)
+
+        if servicegroup or all_services:
+            params = {
+                "query": "servicelist",
+                "details": "false",
+                "servicestatus": "warning critical unknown",
+            }
+            if hostgroup:
+                params["hostgroup"] = hostgroup
+            else:
+                params["servicegroup"] = servicegroup
+            targets.extend((host, service) for host, service, _ in self._iter_services(params))
+        return targets
+
+    def ack_group(self, hostgroup=None, servicegroup=None, all_services=False):
+        """Acknowledge every problem in a hostgroup or servicegroup.
+
+        Nagios has no group acknowledgement command, so members with
+        problems are resolved first and acknowledged concurrently.
+
+        Args:
+            hostgroup: Acknowledge DOWN/UNREACHABLE hosts in this hostgroup
+            servicegroup: Acknowledge service problems in this servicegroup
+            all_services: With hostgroup, also acknowledge service problems
+                on its hosts
+
+        Returns:
+            Number of commands that failed
+        """
+        label = self._group_label(hostgroup, servicegroup)
+        print(f"Fetching problems in {label} to acknowledge...")
+        targets = self._group_problem_targets(hostgroup, servicegroup, all_services)
+        if not targets:
+            print(f"No problems found in {label}.")
+            return 0
+        return self.bulk_submit(targets, action="ack")
+
+    def set_downtime_group(self, hostgroup=None, servicegroup=None, all_services=False):
+        """Schedule downtime for a whole group with one native command.
+
+        Returns:
+            Number of commands that failed (0 or 1)
+        """
+        if hostgroup:
+            what = "hosts" + (" AND services" if all_services else "")
+        else:
+            what = "services" + (" AND hosts" if all_services else "")
+        print(
+            f"Setting {self._format_downtime_duration()} downtime for {what} "
+            f"in {self._group_label(hostgroup, servicegroup)}..."
+        )
+        result = self._send_cmd(self._build_group_downtime_payload(hostgroup, servicegroup, all_services))
+        print(result["message"])
+        if not result["ok"]:
+            return 1
+        if not self.verify:
+            return 0
+        scope = {"hostgroup": hostgroup} if hostgroup else {"servicegroup": servicegroup}
+        return self.verify_applied(None, "downtime", scope, all_services=all_services)
+
+    def bulk_submit(self, targets, action="ack", all_services=False):
+        """Acknowledge or schedule downtime for many targets in one run.
+
+        Args:
+            targets: List of (host, service) tuples, service may be None
+            action: Either "ack" or "downtime"
+            all_services: For host-only downtime targets, include all services
+
+        Returns:
+            Number of commands that failed
+        """
+        payloads = []
+        for host, service in targets:
+            if action == "ack":
+                payload = self._build_ack_payload(host, service=service)
+            else:
+                payload = self._build_downtime_payload(
+                    host, service=service, all_services=all_services and not service
+                )
+            payloads.append(payload)
+
+        label = "acknowledgement" if action == "ack" else "downtime"
+        if action == "downtime":
+            label = f"{self._format_downtime_duration()} downtime"
+        print(f"Submitting {len(payloads)} {label} command(s)...")
+
+        results = self._send_cmds(payloads)
+        return self._report_batch(targets, results) + self._verify_batch(targets, results, action)
+
+    def _report_batch(self, targets, results):
+        """Print a success/failure summary for a batch of commands.
+
+        Args:
+            targets: List of (host, service) tuples
+            results: Command results in the same order as targets
+
+        Returns:
+            Number of commands that failed
+        """
+        failures = [
+            (target, result)
+            for target, result in zip(targets, results)
+            if not result["ok"]
+        ]
+
+        print(
+            f"\n--- Bulk Summary: {len(results) - len(failures)} succeeded, "
+            f"{len(failures)} failed ---"
+        )
+        for (host, service), result in failures:
+            target = f"{host} -> {service}" if service else host
+            print(f"{target}: {result['message']}")
+
+        self._print_throughput()
+        return len(failures)
+
+    def schedule_rechecks(self, targets, window=None):
+        """Force rechecks of many targets, spread evenly over a window.
+
+        Check times are staggered so Nagios never has to run the whole
+        batch in the same second, and submissions go through the
+        concurrent, rate-limited command pipeline.
+
+        Args:
+            targets: List of (host, service) tuples, service may be None
+            window: Seconds to spread the checks over (default: recheck_window)
+
+        Returns:
+            Number of commands that failed
+        """
+        window = self.recheck_window if window is None else window
+        step = window / len(targets) if len(targets) > 1 else 0
+        now = time.time()
+        payloads = [
+            self._build_recheck_payload(host, service, now + index * step)
+            for index, (host, service) in enumerate(targets)
+        ]
+        print(f"Scheduling {len(payloads)} forced recheck(s) over {window}s...")
+        return self._report_batch(targets, self._send_cmds(payloads))
+
+    def recheck(self, host, service=None, all_services=False, window=None):
+        """Force a recheck of a host, one service, or a host and all its services.
+
+        Returns:
+            Number of commands that failed
+        """
+        targets = [(host, service)]
+        if all_services:
+            services = self._get_service_names(host)
+            if not services:
+                resolved = self._resolve_host(host)
+                if resolved != host:
+                    host = resolved
+                    services = self._get_service_names(host)
+            targets = [(host, None)] + [(host, svc) for svc in services]
+        return self.schedule_rechecks(targets, window)
+
+    def recheck_service_issues(self, host=None, window=None):
+        """Force a recheck of every WARNING, CRITICAL or UNKNOWN service.
+
+        Args:
+            host: Optional host to limit the rechecks to
+            window: Seconds to spread the checks over
+
+        Returns:
+            Number of commands that failed
+        """
+        params = {"query": "servicelist", "details": "false", "servicestatus": "warning critical unknown"}
+        if host:
+            params["hostname"] = host
+        targets = [(svc_host, service) for svc_host, service, _ in self._iter_services(params)]
+        if not targets:
+            print("🎉 No service issues found!")
+            return 0
+        return self.schedule_rechecks(targets, window)
+
+    def toggle_alerts(
+        self, enable=True, host=None, service=None, all_services=False, hostgroup=None, servicegroup=None
+    ):
+        if hostgroup and not host:
+            self._print_toggle_action(enable, f"hosts in hostgroup '{hostgroup}'")
+            self._post_cmd({"cmd_typ": 65 if enable else 66, "cmd_mod": 2, "hostgroup": hostgroup})
+            if all_services:
+                # The hosts' own notifications are toggled above; this covers their services
+                self._print_toggle_action(enable, f"all services in hostgroup '{hostgroup}'")
+                self._post_cmd({"cmd_typ": 63 if enable else 64, "cmd_mod": 2, "hostgroup": hostgroup})
+        elif servicegroup and not host:
+            cmd_typ = 109 if enable else 110
+            self._print_toggle_action(enable, f"services in servicegroup '{servicegroup}'")
+            self._post_cmd({"cmd_typ": cmd_typ, "cmd_mod": 2, "servicegroup": servicegroup})
+        elif host:
+            if all_services:
+                cmd_typ = 28 if enable else 29
+                self._print_toggle_action(enable, f"all services on '{host}'")
+                self._post_cmd({"cmd_typ": cmd_typ, "cmd_mod": 2, "host": host})
+            elif service:
+                cmd_typ = 22 if enable else 23
+                self._print_toggle_action(enable, f"'{service}' on '{host}'")
+                self._post_cmd(
+                    {
+                        "cmd_typ": cmd_typ,
+                        "cmd_mod": 2,
+                        "host": host,
+                        "service": service,
+                    }
+                )
+            else:
+                cmd_typ = 24 if enable else 25
+                self._print_toggle_action(enable, f"host '{host}'")
+                self._post_cmd({"cmd_typ": cmd_typ, "cmd_mod": 2, "host": host})
+        else:
+            self._print_toggle_action(enable, "global notifications")
+            self._post_cmd({"cmd_typ": 12 if enable else 11, "cmd_mod": 2})
+            # Cached program status no longer reflects the global setting
+            self.cache.invalidate("programstatus")
@@ -0,0 +1,227 @@
+# -*- coding: utf-8 -*-
+"""mozzod: optional long-lived helper that keeps mozzo warm.
+
+The daemon imports mozzo once and keeps an HTTP session (with its
+pooled TLS connections) for each config file. The mozzo command
+forwards its arguments over a UNIX socket, and the daemon runs them
+through the same code path as an in-process call, streaming back the
+exact stdout and stderr as they are written, then the exit status. The
+client side of the protocol lives in mozzo.ipc.
+
+Runs redirect the process-wide stdout/stderr and working directory, so
+only one runs at a time; a request arriving meanwhile is answered as
+busy right away and mozzo runs it in-process instead of waiting.
+"""
+import argparse
+import contextlib
+import io
+import os
+import signal
+import socket
+import socketserver
+import sys
+import threading
+
+from mozzo.ipc import FRAME_SIZE, _recv_message, _send_message, default_socket_path
+
+
+class WarmClients:
+    """Client factory reusing one HTTP session per config file.
+
+    Each run keeps its own session settings (such as its deadline) but
+    shares the warm session's adapters, i.e. its connection pools and
+    circuit breaker.
+    """
+
+    def __init__(self):
+        self.sessions = {}
+
+    def __call__(self, **kwargs):
+        from mozzo.client import MozzoNagiosClient
+
+        client = MozzoNagiosClient(**kwargs)
+        session = self.sessions.get(client.config_file)
+        if session is None:
+            self.sessions[client.config_file] = client.session
+        else:
+            client.session.close()
+            for prefix, adapter in session.adapters.items():
+                client.session.mount(prefix, adapter)
+        return client
+
+
+class FrameWriter(io.TextIOBase):
+    """Text stream sending each write to the client as a frame.
+
+    Args:
+        sock: Connected client socket
+        name: "stdout" or "stderr"
+    """
+
+    def __init__(self, sock, name):
+        self.sock = sock
+        self.name = name
+        self.lost = False
+
+    def writable(self):
+        return True
+
+    def write(self, text):
+        if text and not self.lost:
+            try:
+                for start in range(0, len(text), FRAME_SIZE):
+                    _send_message(self.sock, {self.name: text[start:start + FRAME_SIZE]})
+            except OSError:
+                # The client went away; finish the run without output
+                self.lost = True
+        return len(text)
+
+
+def execute(argv, cwd, client_factory, stdout, stderr):
+    """Run mozzo in this process with its output redirected.
+
+    Returns:
+        Exit status of the run
+    """
+    from mozzo.cli import run
+
+    exit_code = 0
+    previous_cwd = os.getcwd()
+    try:
+        os.chdir(cwd)
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            try:
+                run(argv, client_factory=client_factory)
+            except SystemExit as e:
+                if isinstance(e.code, str):
+                    print(e.code, file=sys.stderr)
+                    exit_code = 1
+                else:
+                    exit_code = e.code or 0
+    except OSError as e:
+        stderr.write(f"❌ mozzod: {e}\n")
+        exit_code = 1
+    finally:
+        os.chdir(previous_cwd)
+
+    return exit_code
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        try:
+            request = _recv_message(self.rfile)
+        except ValueError:
+            return
+        if not request:
+            return
+        if not self.server.run_lock.acquire(blocking=False):
+            try:
+                _send_message(self.connection, {"busy": True})
+            except OSError:
+                pass
+            return
+        try:
+            self._run(request)
+        finally:
+            self.server.run_lock.release()
+
+    def _run(self, request):
+        try:
+            _send_message(self.connection, {"accepted": True})
+        except OSError:
+            return
+        exit_code = execute(
+            request.get("argv", []),
+            request.get("cwd", "/"),
+            self.server.clients,
+            FrameWriter(self.connection, "stdout"),
+            FrameWriter(self.connection, "stderr"),
+        )
+        try:
+            _send_message(self.connection, {"exit": exit_code})
+        except OSError:
+            pass
+
+
+def _socket_in_use(socket_path):
+    """Check if a live daemon answers on socket_path."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(socket_path)
+        except OSError:
+            return False
+    return True
+
+
+class MozzoDaemon(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """UNIX socket server running one mozzo invocation at a time.
+
+    Connections are accepted in threads so a request arriving during a
+    long run gets an immediate busy answer instead of queueing.
+
+    Raises:
+        OSError: If another daemon is already listening on socket_path
+    """
+
+    daemon_threads = True
+
+    def __init__(self, socket_path):
+        directory = os.path.dirname(socket_path)
+        if directory:
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+        if os.path.exists(socket_path):
+            if _socket_in_use(socket_path):
+                raise OSError(f"mozzod is already running on {socket_path}")
+            # Left behind by a daemon that did not shut down cleanly
+            os.remove(socket_path)
+
+        self.clients = WarmClients()
+        self.run_lock = threading.Lock()
+        old_umask = os.umask(0o177)
+        try:
+            super().__init__(socket_path, _Handler)
+        finally:
+            os.umask(old_umask)
+
+    def server_close(self):
+        super().server_close()
+        try:
+            os.remove(self.server_address)
+        except OSError:
+            pass
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="mozzod", description="Mozzo background daemon"
+    )
+    parser.add_argument(
+        "--socket",
+        type=str,
+        default=None,
+        help="UNIX socket path (default: $MOZZO_SOCKET or $XDG_RUNTIME_DIR/mozzo/mozzod.sock)",
+    )
+    args = parser.parse_args()
+    socket_path = args.socket or default_socket_path()
+
+    # Warm up the heavy imports once
+    import mozzo.client  # noqa: F401
+
+    try:
+        server = MozzoDaemon(socket_path)
+    except OSError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    print(f"mozzod listening on {socket_path}")
+    try:
+        server.serve_forever()
+    except (KeyboardInterrupt, SystemExit):
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+"""Alert and state change history built on archivejson.cgi.
+
+History is fetched in pages with start/count so entries can be printed
+as soon as each page arrives, and only one page is held in memory.
+Host, service, group and state filters are sent to archivejson.cgi,
+except the state filter for statechangelist, which is applied here.
+"""
+import datetime
+import itertools
+import sys
+
+import requests
+
+from mozzo.writers import FORMATS, write_rows
+
+HISTORY_FIELDS = [
+    "timestamp",
+    "time",
+    "object_type",
+    "host",
+    "service",
+    "state",
+    "state_type",
+    "output",
+]
+
+HISTORY_PAGE_SIZE = 500
+
+HOST_STATES = ("UP", "DOWN", "UNREACHABLE")
+SERVICE_STATES = ("OK", "WARNING", "UNKNOWN", "CRITICAL")
+
+
+class HistoryMixin:
+    def _history_params(self, query, days, host=None, service=None, hostgroup=None, servicegroup=None, state=None):
+        """Build archivejson.cgi alertlist/statechangelist params.
+
+        Args:
+            query: "alertlist" or "statechangelist"
+            days: Number of days to look back
+            host: Optional host name
+            service: Optional service description
+            hostgroup: Optional hostgroup (alertlist only)
+            servicegroup: Optional servicegroup (alertlist only)
+            state: Optional state name (e.g. "CRITICAL" or "DOWN")
+
+        Returns:
+            Dictionary of query params without start/count
+        """
+        now_dt = datetime.datetime.now()
+        params = {
+            "query": query,
+            "formatoptions": "enumerate",
+            "starttime": int((now_dt - datetime.timedelta(days=days)).timestamp()),
+            "endtime": int(now_dt.timestamp()),
+        }
+        if host:
+            params["hostname"] = host
+        if service:
+            params["servicedescription"] = service
+
+        if query == "statechangelist":
+            # statechangelist covers exactly one host or service
+            params["objecttype"] = "service" if service else "host"
+            return params
+
+        if hostgroup:
+            params["hostgroup"] = hostgroup
+        if servicegroup:
+            params["servicegroup"] = servicegroup
+        if state in HOST_STATES:
+            params["objecttypes"] = "host"
+            params["hoststates"] = state.lower()
+        elif state in SERVICE_STATES:
+            params["objecttypes"] = "service"
+            params["servicestates"] = state.lower()
+        elif service or servicegroup:
+            params["objecttypes"] = "service"
+        return params
+
+    def _history_entry(self, item):
+        """Normalize an alertlist/statechangelist item into a history row."""
+        timestamp = int(self._normalize_timestamp(item.get("timestamp", 0)))
+        service = item.get("description") or item.get("service_description") or ""
+        object_type = str(item.get("object_type") or ("service" if service else "host")).lower()
+        return {
+            "timestamp": timestamp,
+            "time": datetime.datetime.fromtimestamp(timestamp).strftime(self.date_format),
+            "object_type": object_type,
+            "host": item.get("host_name") or item.get("name") or "",
+            "service": service,
+            "state": str(item.get("state", "")).upper(),
+            "state_type": str(item.get("state_type", "")).upper(),
+            "output": item.get("plugin_output", ""),
+        }
+
+    def iter_history(self, query="alertlist", days=1.0, page_size=HISTORY_PAGE_SIZE, **filters):
+        """Yield history rows page by page from archivejson.cgi.
+
+        Args:
+            query: "alertlist" or "statechangelist"
+            days: Number of days to look back
+            page_size: Entries requested per archivejson.cgi call
+            **filters: host, service, hostgroup, servicegroup and state
+                (see _history_params)
+
+        Yields:
+            History rows (see HISTORY_FIELDS)
+
+        Raises:
+            requests.exceptions.RequestException: If a page cannot be fetched
+        """
+        params = self._history_params(query, days, **filters)
+        # statechangelist has no state filter parameter
+        state = filters.get("state") if query == "statechangelist" else None
+        start = 0
+        while True:
+            response = self.session.get(
+                self.archive_url,
+                params=dict(params, start=start, count=page_size),
+                auth=self.auth,
+                verify=self.verify_ssl,
+            )
+            response.raise_for_status()
+            items = response.json().get("data", {}).get(query) or []
+
+            for item in items:
+                row = self._history_entry(item)
+                if state is None or row["state"] == state:
+                    yield row
+
+            if len(items) < page_size:
+                return
+            start += len(items)
+
+    def show_history(self, query="alertlist", days=1.0, output_format="text", **filters):
+        """Stream alert or state change history in the requested format.
+
+        Args:
+            query: "alertlist" or "statechangelist"
+            days: Number of days to look back
+            output_format: One of "text", "json", "ndjson", "csv"
+            **filters: host, service, hostgroup, servicegroup and state
+        """
+        rows = self.iter_history(query, days, **filters)
+        try:
+            # Fetch the first page before printing any header
+            first = next(rows, None)
+            rows = itertools.chain([first] if first else [], rows)
+
+            if output_format in FORMATS:
+                write_rows(rows, output_format, HISTORY_FIELDS)
+            else:
+                title = "Alert History" if query == "alertlist" else "State Change History"
+                print(f"\n--- {title} (Last {days} day(s)) ---\n")
+                if first is None:
+                    print("No history entries found for the specified time range.")
+                for row in rows:
+                    self._print_history_row(row)
+        except (requests.exceptions.RequestException, ValueError) as e:
+            print(f"❌ Error fetching history: {e}")
+            sys.exit(1)
+
+    def _print_history_row(self, row):
+        icon = self.STATUS_EMOJIS.get(row["state"], "")
+        icon = f"{icon} " if icon else ""
+        if row["object_type"] == "service":
+            target = f"SERVICE ALERT: {row['host']};{row['service']}"
+        else:
+            target = f"HOST ALERT: {row['host']}"
+        print(f"{icon}[{row['time']}] {target};{row['state']};{row['state_type']};{row['output']}")
@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+"""Client side of the mozzod protocol.
+
+Kept free of heavy imports: the mozzo entry point loads this module on
+every run, and only touches json/socket once a daemon socket exists.
+Each message is a single line of JSON.
+"""
+import os
+import sys
+
+# Upper bound on a single request or response message
+MAX_MESSAGE = 64 * 1024 * 1024
+
+# Characters of output sent per frame, well below MAX_MESSAGE
+FRAME_SIZE = 64 * 1024
+
+# Seconds to wait for the daemon to accept a run before running in-process
+ACCEPT_TIMEOUT = 5
+
+
+def default_socket_path():
+    """Return the mozzod socket path ($MOZZO_SOCKET overrides)."""
+    if os.environ.get("MOZZO_SOCKET"):
+        return os.environ["MOZZO_SOCKET"]
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return os.path.join(runtime_dir, "mozzo", "mozzod.sock")
+    return os.path.expanduser("~/.cache/mozzo/mozzod.sock")
+
+
+def can_forward(args):
+    """Check if parsed mozzo args can be served by the daemon.
+
+    Runs that read stdin or stream output indefinitely (--follow) stay
+    in-process.
+    """
+    return getattr(args, "bulk", None) != "-" and not getattr(args, "follow", False)
+
+
+def _send_message(sock, message):
+    import json
+
+    sock.sendall(json.dumps(message).encode("utf-8") + b"\n")
+
+
+def _recv_message(stream):
+    import json
+
+    line = stream.readline(MAX_MESSAGE)
+    if not line:
+        return None
+    return json.loads(line.decode("utf-8"))
+
+
+def forward(argv, socket_path=None, timeout=None):
+    """Run mozzo arguments through a running mozzod.
+
+    The daemon first confirms it accepted the request (or answers that
+    it is busy with another run), then sends the run's stdout and
+    stderr as frames in the order they were written, and finally the
+    exit status.
+
+    Args:
+        argv: mozzo argument list
+        socket_path: Daemon socket (defaults to default_socket_path())
+        timeout: Optional socket timeout in seconds once the run started
+
+    Returns:
+        Exit status of the run, or None if no daemon accepted the
+        request (the caller should then run in-process)
+    """
+    path = socket_path or default_socket_path()
+    if not os.path.exists(path):
+        return None
+
+    import socket
+
+    try:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(ACCEPT_TIMEOUT)
+        sock.connect(path)
+    except OSError:
+        return None
+
+    with sock, sock.makefile("rb") as stream:
+        try:
+            _send_message(sock, {"argv": list(argv), "cwd": os.getcwd()})
+            accepted = _recv_message(stream)
+        except (OSError, ValueError):
+            return None
+        if not accepted or not accepted.get("accepted"):
+            # No answer or busy with another run
+            return None
+
+        # From here on the daemon is running the command, so it must
+        # never be run a second time in-process
+        try:
+            sock.settimeout(timeout)
+            while True:
+                frame = _recv_message(stream)
+                if frame is None:
+                    break
+                if "exit" in frame:
+                    return frame["exit"]
+                for name, out in (("stdout", sys.stdout), ("stderr", sys.stderr)):
+                    if name in frame:
+                        out.write(frame[name])
+                        out.flush()
+            error = "connection closed"
+        except (OSError, ValueError) as e:
+            error = e
+
+    sys.stderr.write(f"❌ Lost connection to mozzod before the run finished ({error}); not retrying in-process.\n")
+    sys.stderr.flush()
+    return 1
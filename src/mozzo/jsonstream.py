@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""Incremental parsing of large statusjson.cgi responses.
+
+A fleet-wide servicelist&details=true response can run to hundreds of
+megabytes. iter_servicelist() walks data.servicelist.<host>.<service>
+while the body streams in and decodes one service record at a time
+with JSONDecoder.raw_decode, so only the record being parsed is held
+in memory.
+"""
+import codecs
+import json
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+
+
+class _Reader:
+    """Cursor over JSON text arriving in byte chunks."""
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._utf8 = codecs.getincrementaldecoder("utf-8")("replace")
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self):
+        """Append the next chunk, dropping text already consumed.
+
+        Returns:
+            False once the input is exhausted
+        """
+        while not self.eof:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                self.eof = True
+                text = self._utf8.decode(b"", final=True)
+            else:
+                text = self._utf8.decode(chunk)
+            if text:
+                self.buf = self.buf[self.pos:] + text
+                self.pos = 0
+                return True
+        return False
+
+    def peek(self):
+        """Return the next non-whitespace character without consuming it."""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                raise ValueError("Unexpected end of JSON response")
+
+    def expect(self, char):
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Expected {char!r} but found {found!r} in JSON response")
+        self.pos += 1
+
+    def value(self):
+        """Decode the complete JSON value at the cursor."""
+        self.peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # A number ending exactly at the buffer end may continue in
+            # the next chunk
+            if end == len(self.buf) and self._fill():
+                continue
+            self.pos = end
+            return value
+
+    def members(self):
+        """Yield the keys of the object at the cursor.
+
+        The caller must consume each member's value (with value() or a
+        nested members()) before asking for the next key.
+        """
+        self.expect("{")
+        if self.peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            if self.peek() != '"':
+                raise ValueError("Expected an object key in JSON response")
+            key = self.value()
+            self.expect(":")
+            yield key
+            separator = self.peek()
+            self.pos += 1
+            if separator == "}":
+                return
+            if separator != ",":
+                raise ValueError(f"Expected ',' or '}}' but found {separator!r} in JSON response")
+
+
+def iter_servicelist(chunks):
+    """Yield service records from a streamed servicelist response.
+
+    Args:
+        chunks: Iterable of bytes making up a statusjson.cgi
+            query=servicelist response body
+
+    Yields:
+        (host, service, details) tuples in response order; details is
+        the status code when the query used details=false
+
+    Raises:
+        ValueError: If the response is not valid JSON
+    """
+    reader = _Reader(chunks)
+    for key in reader.members():
+        if key != "data":
+            reader.value()
+            continue
+        for data_key in reader.members():
+            if data_key != "servicelist":
+                reader.value()
+                continue
+            for host in reader.members():
+                for service in reader.members():
+                    yield host, service, reader.value()
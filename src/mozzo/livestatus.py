@@ -0,0 +1,257 @@
+# -*- coding: utf-8 -*-
+"""MK Livestatus status backend.
+
+Reads host, service and program status from a Livestatus UNIX or TCP
+socket. Filters and column selection are sent with the query so the
+Nagios side only returns the rows and fields mozzo actually needs.
+"""
+import json
+import socket
+
+from mozzo.status import (
+    HOST_STATE_TO_CODE,
+    HOST_STATUS_CODES,
+    SERVICE_STATE_TO_CODE,
+    SERVICE_STATUS_CODES,
+    StatusBackend,
+    StatusSourceError,
+    UnsupportedQuery,
+    status_code,
+)
+
+HOST_COLUMNS = [
+    "name",
+    "state",
+    "has_been_checked",
+    "state_type",
+    "current_attempt",
+    "plugin_output",
+    "long_plugin_output",
+    "last_check",
+    "last_state_change",
+    "acknowledged",
+    "scheduled_downtime_depth",
+    "notifications_enabled",
+]
+
+SERVICE_COLUMNS = [
+    "host_name",
+    "description",
+    "state",
+    "has_been_checked",
+    "state_type",
+    "current_attempt",
+    "plugin_output",
+    "long_plugin_output",
+    "last_check",
+    "last_state_change",
+    "acknowledged",
+    "scheduled_downtime_depth",
+    "notifications_enabled",
+    "host_groups",
+    "groups",
+]
+
+PROGRAM_COLUMNS = [
+    "program_version",
+    "program_start",
+    "nagios_pid",
+    "enable_notifications",
+    "execute_service_checks",
+    "execute_host_checks",
+    "accept_passive_service_checks",
+    "accept_passive_host_checks",
+    "enable_event_handlers",
+    "enable_flap_detection",
+    "process_performance_data",
+]
+
+
+def _escape(value):
+    # Livestatus queries are line based; a newline would end the header
+    return " ".join(str(value).splitlines())
+
+
+def _state_filters(codes, state_to_code, prefix="Filter"):
+    """Build an OR'ed Livestatus filter block for a set of statusjson codes.
+
+    With prefix="Stats" the block is a single Stats: counter instead.
+    """
+    combine = "Stats" if prefix == "Stats" else ""
+    terms = []
+    for code in sorted(codes):
+        if code == 1:
+            terms.append([f"{prefix}: has_been_checked = 0"])
+            continue
+        for state, mapped in state_to_code.items():
+            if mapped == code:
+                terms.append(
+                    [f"{prefix}: state = {state}", f"{prefix}: has_been_checked = 1", f"{combine}And: 2"]
+                )
+
+    if not terms:
+        # Nothing can match an empty set of states
+        return [f"{prefix}: state = -1"]
+
+    lines = [line for term in terms for line in term]
+    if len(terms) > 1:
+        lines.append(f"{combine}Or: {len(terms)}")
+    return lines
+
+
+class LivestatusBackend(StatusBackend):
+    """Status backend talking to an MK Livestatus socket.
+
+    Args:
+        address: UNIX socket path, or "host:port" for TCP
+        timeout: Socket timeout in seconds
+    """
+
+    def __init__(self, address, timeout=60):
+        self.address = address
+        self.timeout = timeout
+
+    def _connect(self):
+        if ":" in self.address and not self.address.startswith("/"):
+            host, _, port = self.address.rpartition(":")
+            return socket.create_connection((host, int(port)), timeout=self.timeout)
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(self.address)
+        return sock
+
+    def query(self, table, columns, filters=None):
+        """Run a Livestatus GET query.
+
+        Args:
+            table: Livestatus table name (hosts, services, status)
+            columns: List of column names to return
+            filters: Optional list of raw "Filter:"/"Or:"/"And:" header lines
+
+        Returns:
+            List of rows as dictionaries keyed by column name
+
+        Raises:
+            StatusSourceError: On connection errors or error responses
+        """
+        headers = [f"Columns: {' '.join(columns)}"] + list(filters or [])
+        return [dict(zip(columns, row)) for row in self._request(table, headers)]
+
+    def _request(self, table, headers):
+        lines = [f"GET {table}"]
+        lines.extend(headers)
+        lines.extend(["OutputFormat: json", "ResponseHeader: fixed16", "", ""])
+        request = "\n".join(lines).encode("utf-8")
+
+        try:
+            with self._connect() as sock:
+                sock.sendall(request)
+                sock.shutdown(socket.SHUT_WR)
+                chunks = []
+                while True:
+                    chunk = sock.recv(65536)
+                    if not chunk:
+                        break
+                    chunks.append(chunk)
+        except OSError as e:
+            raise StatusSourceError(f"Livestatus {self.address}: {e}")
+
+        response = b"".join(chunks)
+        header, body = response[:16], response[16:]
+        try:
+            code = int(header[:3])
+        except ValueError:
+            raise StatusSourceError(f"Livestatus {self.address}: malformed response")
+        if code != 200:
+            message = body.decode("utf-8", "replace").strip()
+            raise StatusSourceError(f"Livestatus {self.address}: {code} {message}")
+
+        try:
+            return json.loads(body.decode("utf-8", "replace"))
+        except ValueError as e:
+            raise StatusSourceError(f"Livestatus {self.address}: invalid JSON ({e})")
+
+    def count(self, table, codes, state_to_code, filters=None):
+        """Count objects per statusjson status with Livestatus Stats headers.
+
+        Returns:
+            Dictionary of status name -> count
+        """
+        headers = list(filters or [])
+        names = list(codes)
+        for name in names:
+            headers.extend(_state_filters({codes[name]}, state_to_code, prefix="Stats"))
+        rows = self._request(table, headers)
+        values = rows[0] if rows else [0] * len(names)
+        return dict(zip(names, values))
+
+    def _common_record(self, row, is_host):
+        return {
+            "status": status_code(row["state"], row["has_been_checked"], is_host=is_host),
+            "state_type": row["state_type"],
+            "current_attempt": row["current_attempt"],
+            "plugin_output": row["plugin_output"],
+            "long_plugin_output": row["long_plugin_output"],
+            # statusjson.cgi reports timestamps in milliseconds
+            "last_check": row["last_check"] * 1000,
+            "last_state_change": row["last_state_change"] * 1000,
+            "problem_has_been_acknowledged": bool(row["acknowledged"]),
+            "scheduled_downtime_depth": row["scheduled_downtime_depth"],
+            "notifications_enabled": bool(row["notifications_enabled"]),
+        }
+
+    def _filter_lines(self, filters, is_host):
+        lines = []
+        name_column = "name" if is_host else "host_name"
+        if filters.get("host_name"):
+            lines.append(f"Filter: {name_column} = {_escape(filters['host_name'])}")
+        if not is_host and filters.get("description"):
+            lines.append(f"Filter: description = {_escape(filters['description'])}")
+        if filters.get("hostgroup"):
+            column = "groups" if is_host else "host_groups"
+            lines.append(f"Filter: {column} >= {_escape(filters['hostgroup'])}")
+        if filters.get("servicegroup"):
+            if is_host:
+                # The hosts table has no servicegroup membership column
+                raise UnsupportedQuery("servicegroup filter on hosts")
+            lines.append(f"Filter: groups >= {_escape(filters['servicegroup'])}")
+        if filters.get("status") is not None:
+            state_map = HOST_STATE_TO_CODE if is_host else SERVICE_STATE_TO_CODE
+            lines.extend(_state_filters(filters["status"], state_map))
+        return lines
+
+    def hosts(self, filters):
+        rows = self.query("hosts", HOST_COLUMNS, self._filter_lines(filters, is_host=True))
+        for row in rows:
+            record = {"name": row["name"], "host_name": row["name"]}
+            record.update(self._common_record(row, is_host=True))
+            yield record
+
+    def services(self, filters):
+        rows = self.query(
+            "services", SERVICE_COLUMNS, self._filter_lines(filters, is_host=False)
+        )
+        for row in rows:
+            record = {"host_name": row["host_name"], "description": row["description"]}
+            record.update(self._common_record(row, is_host=False))
+            record["host_groups"] = row["host_groups"] or []
+            record["servicegroups"] = row["groups"] or []
+            yield record
+
+    def _query_hostcount(self, params):
+        filters = self._filter_lines(self._host_filters(params), is_host=True)
+        return {"count": self.count("hosts", HOST_STATUS_CODES, HOST_STATE_TO_CODE, filters)}
+
+    def _query_servicecount(self, params):
+        filters = self._filter_lines(self._service_filters(params), is_host=False)
+        return {"count": self.count("services", SERVICE_STATUS_CODES, SERVICE_STATE_TO_CODE, filters)}
+
+    def program_status(self):
+        rows = self.query("status", PROGRAM_COLUMNS)
+        if not rows:
+            return {}
+        status = rows[0]
+        status["program_start"] = status["program_start"] * 1000
+        for key in PROGRAM_COLUMNS[3:]:
+            status[key] = bool(status[key])
+        return status
@@ -0,0 +1,258 @@
+# -*- coding: utf-8 -*-
+"""Nagios log viewing built on showlog.cgi or the local nagios.log."""
+import datetime
+import hashlib
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+
+import requests
+
+from mozzo.status import StatusSourceError
+
+LOG_PATTERN = re.compile(r'\[(\d{2}-\d{2}-\d{4}\s+\d{2}:\d{2}:\d{2})\]\s*([^\[<\n]+)')
+
+# showlog.cgi timestamp format
+LOG_TIME_FORMAT = "%m-%d-%Y %H:%M:%S"
+
+
+def _log_epoch(timestamp):
+    return int(datetime.datetime.strptime(" ".join(timestamp.split()), LOG_TIME_FORMAT).timestamp())
+
+
+def _entry_hash(timestamp, message):
+    return hashlib.sha1(f"{timestamp} {message}".encode("utf-8")).hexdigest()[:16]
+
+
+class LogCursor:
+    """Position after the last emitted log entry, persisted between runs.
+
+    Log timestamps only have second resolution, so besides the newest
+    timestamp the cursor keeps hashes of the entries already emitted
+    for that second.
+
+    Args:
+        path: JSON file holding the cursor
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.timestamp = None
+        self.hashes = set()
+
+    def load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            self.timestamp = int(state["timestamp"])
+            self.hashes = set(state.get("hashes", []))
+        except (OSError, ValueError, KeyError, TypeError):
+            self.timestamp = None
+            self.hashes = set()
+        return self
+
+    def save(self):
+        if self.timestamp is None:
+            return
+        directory = os.path.dirname(self.path)
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"timestamp": self.timestamp, "hashes": sorted(self.hashes)}, f)
+        os.replace(tmp_path, self.path)
+
+    def is_new(self, timestamp, entry_hash):
+        if self.timestamp is None or timestamp > self.timestamp:
+            return True
+        return timestamp == self.timestamp and entry_hash not in self.hashes
+
+    def advance(self, timestamp, entry_hash):
+        if self.timestamp is None or timestamp > self.timestamp:
+            self.timestamp = timestamp
+            self.hashes = set()
+        self.hashes.add(entry_hash)
+
+
+class LogsMixin:
+    def _fetch_log_entries(self, ts_start, ts_end):
+        """Fetch log entries from showlog.cgi (or local files with log_backend: local).
+
+        Args:
+            ts_start: Window start as a Unix timestamp
+            ts_end: Window end as a Unix timestamp
+
+        Returns:
+            List of (timestamp text, message) tuples, newest first
+
+        Raises:
+            requests.exceptions.RequestException: On HTTP errors
+            StatusSourceError: If local log files cannot be read
+        """
+        if self.log_source is not None:
+            return [
+                (datetime.datetime.fromtimestamp(epoch).strftime(LOG_TIME_FORMAT), message)
+                for epoch, message in self.log_source.entries(ts_start, ts_end)
+            ]
+
+        params = {
+            'ts_start': ts_start,
+            'ts_end': ts_end
+        }
+        response = self.session.get(
+            self.showlog_url,
+            params=params,
+            auth=self.auth,
+            verify=self.verify_ssl
+        )
+        response.raise_for_status()
+        return LOG_PATTERN.findall(response.text)
+
+    def _is_state_dump(self, message):
+        return 'CURRENT HOST STATE' in message or 'CURRENT SERVICE STATE' in message
+
+    def _print_log_entry(self, timestamp, message):
+        status_icon = ''
+        if 'SERVICE ALERT' in message or 'HOST ALERT' in message:
+            for status_key, icon in self.STATUS_EMOJIS.items():
+                if status_key in message.upper():
+                    status_icon = f"{icon} "
+                    break
+
+        print(f"{status_icon}[{timestamp}] {message}")
+
+    def show_logs(self, days=1.0, full=False):
+        """Display Nagios log entries for the specified time range.
+
+        Args:
+            days: Number of days to look back (default: 1.0 for 24 hours)
+            full: If True, show all entries including CURRENT STATE (default: False)
+        """
+        start_ts = int((datetime.datetime.now() - datetime.timedelta(days=days)).timestamp())
+
+        try:
+            matches = self._fetch_log_entries(start_ts, int(datetime.datetime.now().timestamp()))
+
+            if not matches:
+                print(f"No log entries found for the last {days} day(s).")
+                return
+
+            print(f"\n--- Nagios Log Entries (Last {days} day(s)) ---\n")
+
+            displayed_count = 0
+
+            for timestamp, message in matches:
+                message = message.strip()
+                if not message:
+                    continue
+
+                if not full and self._is_state_dump(message):
+                    continue
+
+                self._print_log_entry(timestamp, message)
+                displayed_count += 1
+
+            if displayed_count == 0:
+                print("No alert entries found for the specified time range.")
+
+        except (requests.exceptions.RequestException, StatusSourceError) as e:
+            print(f"❌ Error fetching logs: {e}")
+
+    def _log_cursor(self):
+        """Return the persisted log cursor for this Nagios server."""
+        digest = hashlib.sha1(self.showlog_url.encode("utf-8")).hexdigest()[:16]
+        return LogCursor(os.path.join(self.state_dir, f"log-cursor-{digest}.json")).load()
+
+    def _emit_new_log_entries(self, cursor, days, full=False):
+        """Print log entries newer than the cursor, oldest first.
+
+        Only the window from the cursor (or the last N days without one)
+        to now is fetched. The cursor advances past every entry seen,
+        including state dumps hidden without full.
+
+        Returns:
+            Number of entries printed
+        """
+        now = int(time.time())
+        if cursor.timestamp is not None:
+            ts_start = cursor.timestamp
+        else:
+            ts_start = int(now - days * 86400)
+
+        printed = 0
+        # showlog.cgi lists newest first
+        for timestamp, message in reversed(self._fetch_log_entries(ts_start, now)):
+            message = message.strip()
+            if not message:
+                continue
+            try:
+                epoch = _log_epoch(timestamp)
+            except ValueError:
+                continue
+            entry_hash = _entry_hash(timestamp, message)
+            if not cursor.is_new(epoch, entry_hash):
+                continue
+            cursor.advance(epoch, entry_hash)
+
+            if not full and self._is_state_dump(message):
+                continue
+            self._print_log_entry(timestamp, message)
+            printed += 1
+        return printed
+
+    def show_logs_since_last(self, days=1.0, full=False):
+        """Print only log entries logged since the previous run.
+
+        The first run starts from the last N days. Nothing but new
+        entries is printed, so the output can be forwarded as is.
+        """
+        cursor = self._log_cursor()
+        try:
+            self._emit_new_log_entries(cursor, days, full)
+        except (requests.exceptions.RequestException, StatusSourceError) as e:
+            print(f"❌ Error fetching logs: {e}", file=sys.stderr)
+            sys.exit(1)
+        finally:
+            try:
+                cursor.save()
+            except OSError as e:
+                print(f"❌ Error saving log cursor: {e}", file=sys.stderr)
+
+    def follow_logs(self, days=1.0, full=False, polls=None):
+        """Print new log entries as they are logged, like tail -f.
+
+        Polls every log_poll_interval seconds. Idle polls and errors
+        double the delay up to log_poll_max_interval; new entries reset it.
+
+        Args:
+            days: Window to start from when there is no saved cursor
+            full: If True, include CURRENT STATE entries
+            polls: Stop after this many polls (default: run until interrupted)
+        """
+        interval = self.config.get("log_poll_interval", 10)
+        max_interval = self.config.get("log_poll_max_interval", 300)
+        cursor = self._log_cursor()
+        delay = interval
+        count = 0
+
+        try:
+            while polls is None or count < polls:
+                count += 1
+                try:
+                    printed = self._emit_new_log_entries(cursor, days, full)
+                except (requests.exceptions.RequestException, StatusSourceError) as e:
+                    delay = min(delay * 2, max_interval)
+                    print(f"⚠️  Error fetching logs, retrying in {delay}s: {e}", file=sys.stderr)
+                else:
+                    cursor.save()
+                    sys.stdout.flush()
+                    delay = interval if printed else min(delay * 2, max_interval)
+
+                if polls is None or count < polls:
+                    time.sleep(delay)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            cursor.save()
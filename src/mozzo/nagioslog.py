@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+"""Local nagios.log reader for mozzo runs on the Nagios host.
+
+Every Nagios log line starts with "[epoch]" and lines are written in
+time order, so each file is memory-mapped and binary-searched for the
+first line of the window. Only lines inside the window are decoded.
+A small sidecar index in the cache directory records the first and
+last timestamp of every file (keyed by mtime and size), so archives
+outside the window are skipped without being opened.
+"""
+import glob
+import json
+import mmap
+import os
+import tempfile
+
+from mozzo.status import StatusSourceError
+
+INDEX_VERSION = 1
+
+
+def _line_epoch(mm, pos):
+    """Return the [epoch] of the line starting at pos, or None."""
+    if mm[pos:pos + 1] != b"[":
+        return None
+    close = mm.find(b"]", pos, pos + 24)
+    if close < 0:
+        return None
+    try:
+        return int(mm[pos + 1:close])
+    except ValueError:
+        return None
+
+
+def _next_line(mm, pos):
+    newline = mm.find(b"\n", pos)
+    return len(mm) if newline < 0 else newline + 1
+
+
+def seek_time(mm, target):
+    """Binary-search a time-ordered log for the first line at or after target.
+
+    Args:
+        mm: Memory-mapped log file
+        target: Unix timestamp
+
+    Returns:
+        Byte offset of the first line logged at or after target
+        (len(mm) if there is none)
+    """
+    # The answer is best, or a line starting in [lo, hi); every line
+    # starting before lo was logged before target
+    lo, hi = 0, len(mm)
+    best = len(mm)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        line = mid if mid == 0 or mm[mid - 1:mid] == b"\n" else _next_line(mm, mid)
+        epoch = None
+        while line < hi:
+            epoch = _line_epoch(mm, line)
+            if epoch is not None:
+                break
+            line = _next_line(mm, line)
+        if line < hi and epoch < target:
+            lo = _next_line(mm, line)
+            continue
+        if line < hi:
+            best = line
+        # Nothing in [mid, line) carries a timestamp
+        hi = mid
+    return best
+
+
+def _first_epoch(mm):
+    pos = 0
+    while pos < len(mm):
+        epoch = _line_epoch(mm, pos)
+        if epoch is not None:
+            return epoch
+        pos = _next_line(mm, pos)
+    return None
+
+
+def _last_epoch(mm):
+    end = len(mm)
+    while end > 0:
+        start = mm.rfind(b"\n", 0, end - 1) + 1
+        epoch = _line_epoch(mm, start)
+        if epoch is not None:
+            return epoch
+        end = start
+    return None
+
+
+class LocalLogSource:
+    """Read log entries from nagios.log and its rotated archives.
+
+    Args:
+        log_file: Path to the current nagios.log
+        archive_dir: Directory holding rotated nagios-*.log files
+        cache_dir: Optional directory for the sidecar time range index
+    """
+
+    def __init__(self, log_file, archive_dir, cache_dir=None):
+        self.log_file = log_file
+        self.archive_dir = archive_dir
+        self.index_path = os.path.join(cache_dir, "log-index.json") if cache_dir else None
+
+    def _load_index(self):
+        if not self.index_path:
+            return {}
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if index.get("version") != INDEX_VERSION:
+            return {}
+        return index.get("files", {})
+
+    def _save_index(self, files):
+        if not self.index_path:
+            return
+        try:
+            directory = os.path.dirname(self.index_path)
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"version": INDEX_VERSION, "files": files}, f)
+            os.replace(tmp_path, self.index_path)
+        except OSError:
+            pass
+
+    def file_ranges(self):
+        """Return [(first epoch, last epoch, path)] for every log file, oldest first."""
+        paths = glob.glob(os.path.join(self.archive_dir, "nagios-*.log"))
+        if os.path.exists(self.log_file):
+            paths.append(self.log_file)
+
+        index = self._load_index()
+        files = {}
+        ranges = []
+        for path in paths:
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            key = os.path.abspath(path)
+            entry = index.get(key)
+            if not entry or entry["mtime_ns"] != st.st_mtime_ns or entry["size"] != st.st_size:
+                first, last = self._scan_range(path)
+                entry = {"mtime_ns": st.st_mtime_ns, "size": st.st_size, "first": first, "last": last}
+            files[key] = entry
+            if entry["first"] is not None:
+                ranges.append((entry["first"], entry["last"], path))
+
+        if files != index:
+            self._save_index(files)
+        return sorted(ranges)
+
+    def _scan_range(self, path):
+        try:
+            with open(path, "rb") as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    return None, None
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    return _first_epoch(mm), _last_epoch(mm)
+        except OSError as e:
+            raise StatusSourceError(f"{path}: {e}")
+
+    def entries(self, ts_start, ts_end):
+        """Return log entries logged within [ts_start, ts_end].
+
+        Returns:
+            List of (epoch, message) tuples, newest first
+
+        Raises:
+            StatusSourceError: If a log file cannot be read
+        """
+        found = []
+        for first, last, path in self.file_ranges():
+            if last < ts_start or first > ts_end:
+                continue
+            try:
+                with open(path, "rb") as f:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        pos = seek_time(mm, ts_start)
+                        while pos < len(mm):
+                            end = _next_line(mm, pos)
+                            epoch = _line_epoch(mm, pos)
+                            if epoch is not None:
+                                if epoch > ts_end:
+                                    break
+                                close = mm.find(b"]", pos)
+                                message = mm[close + 1:end].decode("utf-8", "replace").strip()
+                                found.append((epoch, message))
+                            pos = end
+            except (OSError, ValueError) as e:
+                raise StatusSourceError(f"{path}: {e}")
+        found.reverse()
+        return found
@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+"""Rate limiting for cmd.cgi submissions.
+
+Every cmd.cgi call forks a CGI on the Nagios server and takes the
+command pipe lock, so large batches are spaced out instead of being
+fired all at once, and fewer commands are kept in flight when the
+server shows signs of overload.
+"""
+import threading
+import time
+
+
+class RateLimiter:
+    """Space calls at least 1/rate seconds apart, across threads.
+
+    Args:
+        rate: Maximum calls per second (None or 0 disables limiting)
+        clock: Monotonic clock, replaceable in tests
+        sleep: Sleep function, replaceable in tests
+    """
+
+    def __init__(self, rate=None, clock=time.monotonic, sleep=time.sleep):
+        self.rate = float(rate) if rate else None
+        self.clock = clock
+        self.sleep = sleep
+        self._lock = threading.Lock()
+        self._next = None
+
+    def acquire(self):
+        """Block until the next call may start."""
+        if not self.rate:
+            return
+        with self._lock:
+            now = self.clock()
+            slot = now if self._next is None else max(now, self._next)
+            self._next = slot + 1.0 / self.rate
+        if slot > now:
+            self.sleep(slot - now)
+
+
+# Latency within this many seconds of the fastest seen is never overload
+LATENCY_SLACK = 0.25
+
+
+class AdaptiveLimiter:
+    """AIMD limit on cmd.cgi commands in flight, with a hard rate cap.
+
+    The limit starts low and grows by about one per round of fast
+    successes (additive increase). A 5xx response, a timeout or a
+    latency well above the fastest seen halves it (multiplicative
+    decrease), at most once per round.
+
+    Args:
+        max_concurrency: Upper bound on commands in flight
+        max_rps: Hard cap on commands started per second (None: no cap)
+        latency_factor: Latency above the fastest seen times this factor
+            counts as overload
+        clock: Monotonic clock, replaceable in tests
+        sleep: Sleep function, replaceable in tests
+    """
+
+    def __init__(self, max_concurrency=8, max_rps=None, latency_factor=2.0, clock=time.monotonic, sleep=time.sleep):
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.limit = float(min(2, self.max_concurrency))
+        self.latency_factor = latency_factor
+        self.rate = RateLimiter(max_rps, clock=clock, sleep=sleep)
+        self.clock = clock
+        self._cond = threading.Condition()
+        self._in_flight = 0
+        self._baseline = None
+        self._last_decrease = None
+        self.reset_stats()
+
+    def reset_stats(self):
+        """Start a new throughput measurement."""
+        self.completed = 0
+        self.overloads = 0
+        self._first_start = None
+        self._last_end = None
+
+    def acquire(self):
+        """Block until a command may be sent.
+
+        Returns:
+            Start time to pass to release()
+        """
+        with self._cond:
+            while self._in_flight >= int(self.limit):
+                self._cond.wait()
+            self._in_flight += 1
+        self.rate.acquire()
+        start = self.clock()
+        with self._cond:
+            if self._first_start is None:
+                self._first_start = start
+        return start
+
+    def release(self, start, overloaded=False):
+        """Record a finished command and adjust the limit.
+
+        Args:
+            start: Value returned by acquire()
+            overloaded: True for 5xx responses and timeouts
+        """
+        end = self.clock()
+        latency = end - start
+        with self._cond:
+            self._in_flight -= 1
+            self.completed += 1
+            self._last_end = end
+
+            if not overloaded:
+                if self._baseline is None or latency < self._baseline:
+                    self._baseline = latency
+                elif latency > max(self._baseline * self.latency_factor, self._baseline + LATENCY_SLACK):
+                    overloaded = True
+
+            if overloaded:
+                self.overloads += 1
+                # Commands started before the last decrease already saw it
+                if self._last_decrease is None or start >= self._last_decrease:
+                    self.limit = max(1.0, self.limit / 2)
+                    self._last_decrease = end
+            else:
+                self.limit = min(float(self.max_concurrency), self.limit + 1.0 / self.limit)
+            self._cond.notify_all()
+
+    def stats(self):
+        """Return throughput since the last reset_stats().
+
+        Returns:
+            Dictionary with commands, overloads, elapsed seconds, rate
+            (commands per second, None if unknown) and concurrency
+        """
+        with self._cond:
+            elapsed = 0.0
+            if self._first_start is not None and self._last_end is not None:
+                elapsed = max(0.0, self._last_end - self._first_start)
+            return {
+                "commands": self.completed,
+                "overloads": self.overloads,
+                "elapsed": elapsed,
+                "rate": self.completed / elapsed if elapsed > 0 else None,
+                "concurrency": int(self.limit),
+            }
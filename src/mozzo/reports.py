@@ -0,0 +1,554 @@
+# -*- coding: utf-8 -*-
+"""Uptime and availability reporting built on archivejson.cgi."""
+import csv
+import datetime
+import json
+import sys
+
+import requests
+
+from mozzo.status import StatusSourceError
+from mozzo.writers import FORMATS, write_rows
+
+
+HOST_TIME_FIELDS = (
+    "time_up",
+    "time_down",
+    "time_unreachable",
+    "time_indeterminate_nodata",
+    "time_indeterminate_notrunning",
+)
+SERVICE_TIME_FIELDS = (
+    "time_ok",
+    "time_warning",
+    "time_unknown",
+    "time_critical",
+    "time_indeterminate_nodata",
+    "time_indeterminate_notrunning",
+)
+
+HOST_REPORT_FIELDS = ["host", "percent_up", "percent_down", "percent_unreachable"]
+SERVICE_REPORT_FIELDS = [
+    "host",
+    "service",
+    "percent_ok",
+    "percent_warning",
+    "percent_unknown",
+    "percent_critical",
+]
+
+
+def host_percentages(avail):
+    """Convert archivejson host time_* totals into percentages.
+
+    Args:
+        avail: Host availability object from archivejson.cgi
+
+    Returns:
+        Dictionary with percent_up/down/unreachable, or None without data
+    """
+    total_time = sum(avail.get(field, 0) for field in HOST_TIME_FIELDS)
+    if total_time <= 0:
+        return None
+    return {
+        "percent_up": (avail.get("time_up", 0) / total_time) * 100,
+        "percent_down": (avail.get("time_down", 0) / total_time) * 100,
+        "percent_unreachable": (avail.get("time_unreachable", 0) / total_time) * 100,
+    }
+
+
+def service_percentages(avail):
+    """Convert archivejson service time_* totals into percentages.
+
+    Args:
+        avail: Service availability object from archivejson.cgi
+
+    Returns:
+        Dictionary with percent_ok/warning/unknown/critical, or None
+        without data
+    """
+    total_time = sum(avail.get(field, 0) for field in SERVICE_TIME_FIELDS)
+    if total_time <= 0:
+        return None
+    return {
+        "percent_ok": (avail.get("time_ok", 0) / total_time) * 100,
+        "percent_warning": (avail.get("time_warning", 0) / total_time) * 100,
+        "percent_unknown": (avail.get("time_unknown", 0) / total_time) * 100,
+        "percent_critical": (avail.get("time_critical", 0) / total_time) * 100,
+    }
+
+
+def month_slices(start, end):
+    """Split a [start, end) window at local calendar month boundaries.
+
+    Args:
+        start: Window start as a Unix timestamp
+        end: Window end as a Unix timestamp
+
+    Returns:
+        List of (start, end) tuples covering the window in order
+    """
+    slices = []
+    current = start
+    while current < end:
+        month_start = datetime.datetime.fromtimestamp(current).replace(
+            day=1, hour=0, minute=0, second=0, microsecond=0
+        )
+        next_month = (month_start + datetime.timedelta(days=32)).replace(day=1)
+        boundary = min(int(next_month.timestamp()), end)
+        slices.append((current, boundary))
+        current = boundary
+    return slices
+
+
+def _object_key(item):
+    return (item.get("host_name") or item.get("name"), item.get("description"))
+
+
+def merge_availability(total, data):
+    """Add one archivejson availability response into a running total.
+
+    time_* fields are summed; lists of hosts/services are matched by
+    host name and service description so each object accumulates its
+    own totals. The input data is never modified.
+
+    Args:
+        total: Dictionary accumulating merged data (updated in place)
+        data: Availability "data" dictionary for one time slice
+
+    Returns:
+        total
+    """
+    for key, value in data.items():
+        if key.startswith("time_") and isinstance(value, (int, float)):
+            total[key] = total.get(key, 0) + value
+        elif isinstance(value, dict):
+            merge_availability(total.setdefault(key, {}), value)
+        elif isinstance(value, list):
+            items = total.setdefault(key, [])
+            index = {_object_key(item): item for item in items}
+            for item in value:
+                if not isinstance(item, dict):
+                    continue
+                merged = index.get(_object_key(item))
+                if merged is None:
+                    merged = index[_object_key(item)] = {}
+                    items.append(merged)
+                merge_availability(merged, item)
+        else:
+            total.setdefault(key, value)
+    return total
+
+
+def _iter_availability_objects(data, is_host):
+    """Yield host or service availability objects from any response shape.
+
+    Single-object queries return "host"/"service", list queries return
+    "hostlist"/"servicelist", and group queries nest members under
+    "hostgroup"/"servicegroup".
+    """
+    item_key, list_key = ("host", "hostlist") if is_host else ("service", "servicelist")
+    member_key = "hosts" if is_host else "services"
+
+    if isinstance(data.get(item_key), dict):
+        yield data[item_key]
+    for item in data.get(list_key) or []:
+        yield item
+    for group_key in ("hostgroup", "servicegroup"):
+        group = data.get(group_key)
+        if isinstance(group, dict):
+            for item in group.get(member_key) or []:
+                yield item
+
+
+class ReportsMixin:
+    def _availability_params(self, object_type, starttime, endtime, **filters):
+        """Build archivejson.cgi availability query params.
+
+        Args:
+            object_type: "hosts", "services", "hostgroups" or "servicegroups"
+            starttime: Window start as a Unix timestamp
+            endtime: Window end as a Unix timestamp
+            **filters: Extra params (hostname, servicedescription, hostgroup,
+                servicegroup); None values are dropped
+
+        Returns:
+            Dictionary of query params
+        """
+        params = {
+            "query": "availability",
+            "availabilityobjecttype": object_type,
+            "starttime": starttime,
+            "endtime": endtime,
+            "assumeinitialstate": "true",
+            "assumestateretention": "true",
+            "assumestatesduringnagiosdowntime": "true",
+        }
+        params.update({key: value for key, value in filters.items() if value is not None})
+        return params
+
+    def _query_availability(self, params, cache=False):
+        """Run an archivejson.cgi availability query.
+
+        Args:
+            params: Query params from _availability_params()
+            cache: If True, the window is complete and in the past; its
+                response never changes and is cached on disk without expiry
+
+        Returns:
+            The response "data" dictionary, or None on error
+        """
+        cache_key = None
+        if cache and self.cache_mode != "off":
+            cache_key = self.availability_cache.key("availability", self.archive_url, params, user=self.auth[0])
+            if self.cache_mode == "use":
+                cached = self.availability_cache.get(cache_key, float("inf"))
+                if cached is not None:
+                    return cached
+
+        try:
+            arch_resp = self.session.get(
+                self.archive_url,
+                params=params,
+                auth=self.auth,
+                verify=self.verify_ssl
+            )
+            if arch_resp.status_code != 200:
+                print(f"⚠️  archivejson.cgi returned HTTP {arch_resp.status_code}", file=sys.stderr)
+                return None
+            data = arch_resp.json().get("data", {})
+        except (requests.exceptions.RequestException, ValueError) as e:
+            print(f"⚠️  Error fetching availability data: {e}", file=sys.stderr)
+            return None
+
+        if cache_key:
+            self.availability_cache.set(cache_key, data)
+        return data
+
+    def _fetch_availability_window(self, object_type, days, **filters):
+        """Fetch availability for the last N days in calendar-month slices.
+
+        Slices are queried concurrently, so Nagios replays a month of
+        archive logs per request instead of the whole window, and their
+        time_* totals are summed. Whole months in the past are served
+        from the on-disk cache; the partial first and current slices are
+        always fetched. With availability_backend: archivelog the whole
+        window is computed from the local logs instead.
+
+        Args:
+            object_type: archivejson availability object type
+            days: Number of days to query, ending now
+            **filters: Extra query params (see _availability_params)
+
+        Returns:
+            Merged availability "data" dictionary, or None if any slice failed
+        """
+        now_dt = datetime.datetime.now()
+        start = int((now_dt - datetime.timedelta(days=days)).timestamp())
+        end = int(now_dt.timestamp())
+
+        if self.availability_source is not None:
+            # Local logs are read once for the whole window
+            try:
+                return self.availability_source.availability(
+                    self._availability_params(object_type, start, end, **filters)
+                )
+            except StatusSourceError as e:
+                print(f"❌ Error reading Nagios logs: {e}", file=sys.stderr)
+                return None
+
+        slices = month_slices(start, end)
+        queries = [
+            (
+                self._availability_params(object_type, slice_start, slice_end, **filters),
+                0 < index < len(slices) - 1,
+            )
+            for index, (slice_start, slice_end) in enumerate(slices)
+        ]
+        results = self._fan_out(lambda query: self._query_availability(*query), queries)
+        if any(data is None for data in results):
+            return None
+
+        total = {}
+        for data in results:
+            merge_availability(total, data)
+        return total
+
+    def _fetch_availability_data(self, host, service=None, days=365):
+        """Fetch availability data from archive API.
+
+        Args:
+            host: Target host
+            service: Optional service name (None for host availability)
+            days: Number of days to query
+
+        Returns:
+            Dictionary with availability percentages, or None on error
+        """
+        data = self._fetch_availability_window(
+            "services" if service else "hosts",
+            days,
+            hostname=host,
+            servicedescription=service,
+        )
+        if not data:
+            return None
+
+        avail = data.get("service" if service else "host", {})
+        if not avail:
+            return None
+
+        if service:
+            if avail.get("description") != service:
+                return {"_debug_raw_dump": {"data": data}}
+            return service_percentages(avail)
+
+        if not (avail.get("name") == host or avail.get("host_name") == host):
+            return None
+        return host_percentages(avail)
+
+    def _fleet_scope(self, host=None, hostgroup=None, servicegroup=None, services=False):
+        """Pick the archivejson object type and filter for a fleet report.
+
+        Returns:
+            Tuple of (object type, filters dict, True for host rows)
+        """
+        if host:
+            return "services", {"hostname": host}, False
+        if hostgroup:
+            return "hostgroups", {"hostgroup": hostgroup}, True
+        if servicegroup:
+            return "servicegroups", {"servicegroup": servicegroup}, False
+        if services:
+            return "services", {}, False
+        return "hosts", {}, True
+
+    def fetch_fleet_availability(self, days, host=None, hostgroup=None, servicegroup=None, services=False):
+        """Fetch availability for many objects with a single archivejson call.
+
+        Args:
+            days: Number of days to report on
+            host: Report on every service on this host
+            hostgroup: Report on every host in this hostgroup
+            servicegroup: Report on every service in this servicegroup
+            services: With no other filter, report on every service
+                instead of every host
+
+        Returns:
+            Iterator of report rows (see HOST_REPORT_FIELDS and
+            SERVICE_REPORT_FIELDS), or None if the query failed
+        """
+        object_type, filters, is_host = self._fleet_scope(host, hostgroup, servicegroup, services)
+        data = self._fetch_availability_window(object_type, days, **filters)
+        if data is None:
+            return None
+        return self._availability_rows(data, is_host)
+
+    def _availability_rows(self, data, is_host):
+        for avail in _iter_availability_objects(data, is_host):
+            if is_host:
+                row = dict.fromkeys(HOST_REPORT_FIELDS)
+                row["host"] = avail.get("name") or avail.get("host_name")
+                row.update(host_percentages(avail) or {})
+            else:
+                row = dict.fromkeys(SERVICE_REPORT_FIELDS)
+                row["host"] = avail.get("host_name")
+                row["service"] = avail.get("description")
+                row.update(service_percentages(avail) or {})
+            yield row
+
+    def show_fleet_availability(
+        self, days, host=None, hostgroup=None, servicegroup=None, services=False, output_format="text"
+    ):
+        """Print a fleet availability report, streaming one row per object.
+
+        Args:
+            days: Number of days to report on
+            host: Report on every service on this host
+            hostgroup: Report on every host in this hostgroup
+            servicegroup: Report on every service in this servicegroup
+            services: Report on every service when no filter is given
+            output_format: One of "text", "json", "ndjson", "csv"
+        """
+        is_host = self._fleet_scope(host, hostgroup, servicegroup, services)[2]
+        rows = self.fetch_fleet_availability(days, host, hostgroup, servicegroup, services)
+        if rows is None:
+            print("❌ Error fetching availability data")
+            sys.exit(1)
+
+        if output_format in FORMATS:
+            write_rows(rows, output_format, HOST_REPORT_FIELDS if is_host else SERVICE_REPORT_FIELDS)
+        else:
+            self._print_fleet_text(rows, days, is_host)
+
+    def _print_fleet_text(self, rows, days, is_host):
+        print(f"\n--- {days}-Day Fleet Availability Report ---")
+        if is_host:
+            print(f"{'Host':<40} | {'UP':>8} | {'DOWN':>8} | {'UNREACH':>8}")
+            print("-" * 73)
+            columns = ("percent_up", "percent_down", "percent_unreachable")
+        else:
+            print(
+                f"{'Host':<30} | {'Service':<30} | {'OK':>8} | {'WARNING':>8} | "
+                f"{'UNKNOWN':>8} | {'CRITICAL':>8}"
+            )
+            print("-" * 111)
+            columns = ("percent_ok", "percent_warning", "percent_unknown", "percent_critical")
+
+        count = 0
+        for row in rows:
+            values = " | ".join(
+                f"{row[column]:>7.3f}%" if row[column] is not None else f"{'N/A':>8}"
+                for column in columns
+            )
+            if is_host:
+                print(f"{str(row['host']):<40} | {values}")
+            else:
+                print(f"{str(row['host']):<30} | {str(row['service']):<30} | {values}")
+            count += 1
+
+        if count == 0:
+            print("No availability data found.")
+
+    def _print_uptime_report(self, report_data, output_format, is_host=False):
+        """Print uptime/availability report in requested format.
+
+        Args:
+            report_data: Dictionary with report information
+            output_format: One of "json", "ndjson", "csv", "text"
+            is_host: True for host reports, False for service reports
+        """
+        if output_format == "json":
+            print(json.dumps(report_data, indent=2))
+        elif output_format == "ndjson":
+            print(json.dumps(report_data))
+        elif output_format == "csv":
+            report_data.pop("_debug_raw_dump", None)
+            writer = csv.DictWriter(sys.stdout, fieldnames=report_data.keys())
+            writer.writeheader()
+            writer.writerow(report_data)
+        else:
+            days = report_data.get("availability_days", 365)
+
+            if is_host:
+                print(f"\n--- Host Status & Uptime: '{report_data['host']}' ---")
+                print(f"Status        : {report_data['status']}")
+                print(f"State Duration: {report_data['duration']}")
+                print(f"Output        : {report_data['output']}")
+                print(f"\n--- {days}-Day Availability Report ---")
+
+                if report_data.get("percent_up") is not None:
+                    print(f"{'State':<12} | {'% Total Time':<15}")
+                    print("-" * 32)
+                    print(f"{'UP':<12} | {report_data['percent_up']:.3f}%")
+                    print(f"{'DOWN':<12} | {report_data['percent_down']:.3f}%")
+                    print(
+                        f"{'UNREACHABLE':<12} | "
+                        f"{report_data['percent_unreachable']:.3f}%"
+                    )
+            else:
+                host = report_data.get("host")
+                service = report_data.get("service")
+                print(f"\n--- Status & Uptime: '{service}' on '{host}' ---")
+                print(f"Status        : {report_data['status']}")
+                print(f"State Duration: {report_data['duration']}")
+                print(f"Output        : {report_data['output']}")
+                print(f"\n--- {days}-Day Availability Report ---")
+
+                if report_data.get("percent_ok") is not None:
+                    print(f"{'State':<10} | {'% Total Time':<15}")
+                    print("-" * 30)
+                    print(f"{'OK':<10} | {report_data['percent_ok']:.3f}%")
+                    print(f"{'WARNING':<10} | {report_data['percent_warning']:.3f}%")
+                    print(f"{'UNKNOWN':<10} | {report_data['percent_unknown']:.3f}%")
+                    print(f"{'CRITICAL':<10} | {report_data['percent_critical']:.3f}%")
+
+    def show_service_uptime(self, host, service, days=365, output_format="text"):
+        """Displays uptime duration and dynamic availability report."""
+        params = {
+            "query": "service",
+            "hostname": host,
+            "servicedescription": service,
+        }
+
+        # Status and availability are independent CGI calls; run them together
+        response, avail_data = self._fan_out(
+            lambda call: call(),
+            [
+                lambda: self._get_json(params),
+                lambda: self._fetch_availability_data(host, service=service, days=days),
+            ],
+        )
+        svc_data = response.get("data", {}).get("service", {})
+
+        if not svc_data:
+            print(
+                f"⚠️  Service '{service}' on host '{host}' not found.",
+                file=sys.stderr,
+            )
+            return
+
+        status_code = svc_data.get("status")
+        status_text = self._get_status_text(status_code, is_host=False)
+        plugin_output = svc_data.get("plugin_output", "N/A")
+
+        last_change = svc_data.get("last_state_change", 0)
+        duration_str = self._format_duration(last_change)
+
+        report_data = {
+            "host": host,
+            "service": service,
+            "status": status_text,
+            "duration": duration_str,
+            "output": plugin_output,
+            "availability_days": days,
+            "percent_ok": None,
+            "percent_warning": None,
+            "percent_unknown": None,
+            "percent_critical": None,
+        }
+
+        # Merge Dynamic Availability Report
+        if avail_data:
+            report_data.update(avail_data)
+
+        self._print_uptime_report(report_data, output_format, is_host=False)
+
+    def show_host_uptime(self, host, days=365, output_format="text"):
+        """Displays uptime duration and availability report for a HOST."""
+        params = {"query": "host", "hostname": host}
+        response, avail_data = self._fan_out(
+            lambda call: call(),
+            [
+                lambda: self._get_json(params),
+                lambda: self._fetch_availability_data(host, service=None, days=days),
+            ],
+        )
+        host_data = response.get("data", {}).get("host", {})
+
+        if not host_data:
+            print(f"⚠️  Host '{host}' not found.", file=sys.stderr)
+            return
+
+        status_code = host_data.get("status")
+        status_text = self._get_status_text(status_code, is_host=True)
+        plugin_output = host_data.get("plugin_output", "N/A")
+
+        last_change = host_data.get("last_state_change", 0)
+        duration_str = self._format_duration(last_change)
+
+        report_data = {
+            "host": host,
+            "status": status_text,
+            "duration": duration_str,
+            "output": plugin_output,
+            "availability_days": days,
+            "percent_up": None,
+            "percent_down": None,
+            "percent_unreachable": None,
+        }
+
+        if avail_data:
+            report_data.update(avail_data)
+
+        self._print_uptime_report(report_data, output_format, is_host=True)
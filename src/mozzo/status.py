@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+"""Alternative status sources that answer statusjson.cgi style queries.
+
+A StatusBackend takes the same params MozzoNagiosClient passes to
+statusjson.cgi and returns a dictionary shaped like the CGI response, so
+every status command works unchanged on top of it.
+"""
+import abc
+from urllib.parse import parse_qs
+
+# statusjson.cgi status codes
+SERVICE_STATUS_CODES = {
+    "pending": 1,
+    "ok": 2,
+    "warning": 4,
+    "unknown": 8,
+    "critical": 16,
+}
+HOST_STATUS_CODES = {
+    "pending": 1,
+    "up": 2,
+    "down": 4,
+    "unreachable": 8,
+}
+
+# Nagios state numbers (as in status.dat and Livestatus) -> statusjson codes
+SERVICE_STATE_TO_CODE = {0: 2, 1: 4, 2: 16, 3: 8}
+HOST_STATE_TO_CODE = {0: 2, 1: 4, 2: 8}
+
+
+class StatusSourceError(Exception):
+    """Raised when a status source cannot be read."""
+
+
+class UnsupportedQuery(StatusSourceError):
+    """Raised for queries a backend cannot answer; callers fall back to CGI."""
+
+
+def parse_params(params):
+    """Normalize statusjson params given as a dict or query string.
+
+    Args:
+        params: Dictionary or "query=...&details=true" style string
+
+    Returns:
+        Dictionary of string values
+    """
+    if isinstance(params, str):
+        return {key: values[-1] for key, values in parse_qs(params).items()}
+    return {key: str(value) for key, value in params.items()}
+
+
+def status_filter(value, codes):
+    """Convert a statusjson status list like "warning critical" to codes.
+
+    Returns:
+        Set of statusjson status codes, or None when no filter applies
+    """
+    if not value:
+        return None
+    names = value.replace("+", " ").replace(",", " ").split()
+    return {codes[name.lower()] for name in names if name.lower() in codes}
+
+
+def status_code(state, has_been_checked=True, is_host=False):
+    """Convert a Nagios state number into a statusjson status code."""
+    if not has_been_checked:
+        return 1
+    if is_host:
+        return HOST_STATE_TO_CODE.get(state, state)
+    return SERVICE_STATE_TO_CODE.get(state, state)
+
+
+def record_matches(record, filters):
+    """Check a normalized host/service record against simple filters.
+
+    Args:
+        record: Record with statusjson field names
+        filters: Dictionary with optional "host_name", "description" and
+            "status" (set of codes) keys
+
+    Returns:
+        True if the record passes every filter
+    """
+    if filters.get("host_name") and record.get("host_name") != filters["host_name"]:
+        return False
+    if filters.get("description") and record.get("description") != filters["description"]:
+        return False
+    if filters.get("status") is not None and record.get("status") not in filters["status"]:
+        return False
+    return True
+
+
+class StatusBackend(abc.ABC):
+    """Base class answering statusjson.cgi queries from another source.
+
+    Subclasses implement hosts(), services() and program_status(). The
+    host and service generators receive a filters dictionary (see
+    record_matches()) and must only yield matching records.
+    """
+
+    # statusjson.cgi filter params this backend applies (others raise
+    # UnsupportedQuery or are ignored)
+    FILTER_PARAMS = frozenset(
+        {"hostname", "servicedescription", "hoststatus", "servicestatus", "hostgroup", "servicegroup"}
+    )
+
+    @abc.abstractmethod
+    def hosts(self, filters):
+        """Yield host records matching filters."""
+
+    @abc.abstractmethod
+    def services(self, filters):
+        """Yield service records matching filters."""
+
+    @abc.abstractmethod
+    def program_status(self):
+        """Return the statusjson programstatus dictionary."""
+
+    def get_json(self, params):
+        """Answer a statusjson.cgi query.
+
+        Args:
+            params: Same dict or query string passed to statusjson.cgi
+
+        Returns:
+            Dictionary shaped like the statusjson.cgi response
+
+        Raises:
+            UnsupportedQuery: If this backend cannot answer the query
+            StatusSourceError: If the source cannot be read
+        """
+        params = parse_params(params)
+        query = params.get("query", "")
+        handler = getattr(self, f"_query_{query}", None)
+        if handler is None:
+            raise UnsupportedQuery(f"query={query} is not supported")
+        return {
+            "result": {"query": query, "type_code": 0, "type_text": "Success"},
+            "data": handler(params),
+        }
+
+    def _host_filters(self, params):
+        filters = {
+            "host_name": params.get("hostname"),
+            "status": status_filter(params.get("hoststatus"), HOST_STATUS_CODES),
+        }
+        if params.get("hostgroup") or params.get("servicegroup"):
+            filters["hostgroup"] = params.get("hostgroup")
+            filters["servicegroup"] = params.get("servicegroup")
+        return filters
+
+    def _service_filters(self, params):
+        filters = {
+            "host_name": params.get("hostname"),
+            "description": params.get("servicedescription"),
+            "status": status_filter(params.get("servicestatus"), SERVICE_STATUS_CODES),
+        }
+        if params.get("hostgroup") or params.get("servicegroup"):
+            filters["hostgroup"] = params.get("hostgroup")
+            filters["servicegroup"] = params.get("servicegroup")
+        return filters
+
+    def _query_hostlist(self, params):
+        details = params.get("details") == "true"
+        hostlist = {}
+        for record in self.hosts(self._host_filters(params)):
+            hostlist[record["host_name"]] = record if details else record["status"]
+        return {"hostlist": hostlist}
+
+    def _query_host(self, params):
+        filters = {"host_name": params.get("hostname")}
+        return {"host": next(iter(self.hosts(filters)), {})}
+
+    def _query_servicelist(self, params):
+        details = params.get("details") == "true"
+        servicelist = {}
+        for record in self.services(self._service_filters(params)):
+            services = servicelist.setdefault(record["host_name"], {})
+            services[record["description"]] = record if details else record["status"]
+        return {"servicelist": servicelist}
+
+    def _query_service(self, params):
+        filters = {
+            "host_name": params.get("hostname"),
+            "description": params.get("servicedescription"),
+        }
+        return {"service": next(iter(self.services(filters)), {})}
+
+    def _count(self, records, codes):
+        counts = dict.fromkeys(codes, 0)
+        names = {code: name for name, code in codes.items()}
+        for record in records:
+            name = names.get(record["status"])
+            if name:
+                counts[name] += 1
+        return counts
+
+    def _query_hostcount(self, params):
+        return {"count": self._count(self.hosts(self._host_filters(params)), HOST_STATUS_CODES)}
+
+    def _query_servicecount(self, params):
+        return {"count": self._count(self.services(self._service_filters(params)), SERVICE_STATUS_CODES)}
+
+    def _query_programstatus(self, params):
+        return {"programstatus": self.program_status()}
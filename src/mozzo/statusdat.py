@@ -0,0 +1,355 @@
+# -*- coding: utf-8 -*-
+"""Local status.dat / objects.cache status backend.
+
+For mozzo runs on the Nagios host itself. status.dat is parsed as a
+stream through a memory map, keeping only the handful of fields mozzo
+needs per host and service, so memory stays bounded even for very large
+status files. The parsed result is kept as a snapshot on disk keyed by
+the file's mtime and size; repeated runs against an unchanged file load
+the snapshot instead of parsing again.
+"""
+import hashlib
+import mmap
+import os
+import pickle
+import sys
+import tempfile
+
+from mozzo.status import StatusBackend, StatusSourceError, UnsupportedQuery, record_matches, status_code
+
+SNAPSHOT_VERSION = 1
+
+COMMON_FIELDS = (
+    "host_name",
+    "current_state",
+    "has_been_checked",
+    "state_type",
+    "current_attempt",
+    "plugin_output",
+    "long_plugin_output",
+    "last_check",
+    "last_state_change",
+    "problem_has_been_acknowledged",
+    "scheduled_downtime_depth",
+    "notifications_enabled",
+)
+HOST_FIELDS = COMMON_FIELDS
+SERVICE_FIELDS = COMMON_FIELDS + ("service_description",)
+
+PROGRAM_FIELDS = {
+    "nagios_pid": "nagios_pid",
+    "program_start": "program_start",
+    "enable_notifications": "enable_notifications",
+    "active_service_checks_enabled": "execute_service_checks",
+    "active_host_checks_enabled": "execute_host_checks",
+    "passive_service_checks_enabled": "accept_passive_service_checks",
+    "passive_host_checks_enabled": "accept_passive_host_checks",
+    "enable_event_handlers": "enable_event_handlers",
+    "enable_flap_detection": "enable_flap_detection",
+    "process_performance_data": "process_performance_data",
+}
+
+_INT_FIELDS = {
+    "current_state",
+    "has_been_checked",
+    "state_type",
+    "current_attempt",
+    "last_check",
+    "last_state_change",
+    "problem_has_been_acknowledged",
+    "scheduled_downtime_depth",
+    "notifications_enabled",
+}
+
+
+def _file_key(path):
+    st = os.stat(path)
+    return (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+
+
+def _iter_blocks(path, wanted):
+    """Stream "name {" ... "}" blocks from a Nagios status/objects file.
+
+    Args:
+        path: File to read
+        wanted: Mapping of block name -> set of keys to keep
+
+    Yields:
+        (block name, {key: value}) for blocks listed in wanted
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            block = None
+            keep = None
+            fields = None
+            for raw in iter(mm.readline, b""):
+                line = raw.strip()
+                if not line or line.startswith(b"#"):
+                    continue
+                if line.endswith(b"{"):
+                    block = line[:-1].strip().decode("utf-8", "replace")
+                    keep = wanted.get(block)
+                    fields = {} if keep is not None else None
+                    continue
+                if line == b"}":
+                    if fields is not None:
+                        yield block, fields
+                    block = keep = fields = None
+                    continue
+                if fields is None:
+                    continue
+
+                # objects.cache uses whitespace, status.dat uses '='
+                if block.startswith("define "):
+                    key, _, value = line.partition(b"\t")
+                    if not value:
+                        key, _, value = line.partition(b" ")
+                else:
+                    key, _, value = line.partition(b"=")
+                key = key.strip().decode("utf-8", "replace")
+                if key in keep:
+                    fields[key] = value.strip().decode("utf-8", "replace")
+
+
+def _to_record(fields, names):
+    values = []
+    for name in names:
+        value = fields.get(name, "")
+        if name in _INT_FIELDS:
+            try:
+                value = int(float(value)) if value else 0
+            except ValueError:
+                value = 0
+        elif name in ("host_name", "service_description"):
+            value = sys.intern(value)
+        elif name == "long_plugin_output":
+            value = value.replace("\\n", "\n")
+        values.append(value)
+    return tuple(values)
+
+
+def parse_status_file(path):
+    """Parse status.dat into compact host/service tuples.
+
+    Args:
+        path: Path to status.dat
+
+    Returns:
+        Dictionary with "hosts" and "services" (lists of tuples ordered as
+        HOST_FIELDS/SERVICE_FIELDS) and "program" (dict)
+    """
+    wanted = {
+        "hoststatus": set(HOST_FIELDS),
+        "servicestatus": set(SERVICE_FIELDS),
+        "programstatus": set(PROGRAM_FIELDS),
+    }
+    hosts = []
+    services = []
+    program = {}
+    for block, fields in _iter_blocks(path, wanted):
+        if block == "servicestatus":
+            services.append(_to_record(fields, SERVICE_FIELDS))
+        elif block == "hoststatus":
+            hosts.append(_to_record(fields, HOST_FIELDS))
+        else:
+            program = fields
+    return {"hosts": hosts, "services": services, "program": program}
+
+
+def parse_objects_cache(path):
+    """Parse hostgroup and servicegroup membership from objects.cache.
+
+    Returns:
+        Dictionary with "hostgroups" ({group: set(host)}) and
+        "servicegroups" ({group: set((host, service))})
+    """
+    wanted = {
+        "define hostgroup": {"hostgroup_name", "members"},
+        "define servicegroup": {"servicegroup_name", "members"},
+    }
+    hostgroups = {}
+    servicegroups = {}
+    for block, fields in _iter_blocks(path, wanted):
+        members = [m.strip() for m in fields.get("members", "").split(",") if m.strip()]
+        if block == "define hostgroup":
+            hostgroups[fields.get("hostgroup_name", "")] = set(members)
+        else:
+            pairs = set(zip(members[0::2], members[1::2]))
+            servicegroups[fields.get("servicegroup_name", "")] = pairs
+    return {"hostgroups": hostgroups, "servicegroups": servicegroups}
+
+
+class _Snapshot:
+    """Parsed file contents cached on disk, keyed by file mtime and size."""
+
+    def __init__(self, name, path, parser, cache_dir=None):
+        self.name = name
+        self.path = path
+        self.parser = parser
+        self.cache_dir = cache_dir
+        self.key = None
+        self.data = None
+
+    def _cache_path(self):
+        digest = hashlib.sha1(os.path.abspath(self.path).encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.cache_dir, f"{self.name}-{digest}.pickle")
+
+    def load(self):
+        try:
+            key = _file_key(self.path)
+        except OSError as e:
+            raise StatusSourceError(f"{self.path}: {e}")
+
+        if key == self.key:
+            return self.data
+
+        data = self._load_cached(key)
+        if data is None:
+            try:
+                data = self.parser(self.path)
+            except OSError as e:
+                raise StatusSourceError(f"{self.path}: {e}")
+            self._store_cached(key, data)
+
+        self.key, self.data = key, data
+        return data
+
+    def _load_cached(self, key):
+        if not self.cache_dir:
+            return None
+        try:
+            with open(self._cache_path(), "rb") as f:
+                version, cached_key, data = pickle.load(f)
+        except Exception:
+            # Missing, partial or stale-format snapshot; just reparse
+            return None
+        if version != SNAPSHOT_VERSION or tuple(cached_key) != key:
+            return None
+        return data
+
+    def _store_cached(self, key, data):
+        if not self.cache_dir:
+            return
+        try:
+            os.makedirs(self.cache_dir, mode=0o700, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump((SNAPSHOT_VERSION, key, data), f, pickle.HIGHEST_PROTOCOL)
+            # Atomic swap so parallel mozzo runs never see a partial snapshot
+            os.replace(tmp_path, self._cache_path())
+        except OSError:
+            pass
+
+
+class StatusDatBackend(StatusBackend):
+    """Status backend reading status.dat (and objects.cache for groups).
+
+    Args:
+        status_file: Path to status.dat
+        objects_cache: Optional path to objects.cache for group membership
+        cache_dir: Optional directory for parsed snapshots
+    """
+
+    def __init__(self, status_file, objects_cache=None, cache_dir=None):
+        self.status = _Snapshot("statusdat", status_file, parse_status_file, cache_dir)
+        self.objects = (
+            _Snapshot("objectscache", objects_cache, parse_objects_cache, cache_dir)
+            if objects_cache
+            else None
+        )
+
+    def _group_members(self, filters):
+        """Return (hosts, services) allowed by group filters, or None."""
+        if not (filters.get("hostgroup") or filters.get("servicegroup")):
+            return None
+        if self.objects is None:
+            raise UnsupportedQuery("group filters need objects_cache")
+
+        try:
+            groups = self.objects.load()
+        except StatusSourceError:
+            raise UnsupportedQuery(f"cannot read {self.objects.path}")
+        hosts = None
+        services = None
+        if filters.get("hostgroup"):
+            hosts = groups["hostgroups"].get(filters["hostgroup"], set())
+        if filters.get("servicegroup"):
+            services = groups["servicegroups"].get(filters["servicegroup"], set())
+        return hosts, services
+
+    def _record(self, values, names, is_host):
+        fields = dict(zip(names, values))
+        record = {
+            "host_name": fields["host_name"],
+            "status": status_code(
+                fields["current_state"], fields["has_been_checked"], is_host=is_host
+            ),
+            "state_type": fields["state_type"],
+            "current_attempt": fields["current_attempt"],
+            "plugin_output": fields["plugin_output"],
+            "long_plugin_output": fields["long_plugin_output"],
+            # statusjson.cgi reports timestamps in milliseconds
+            "last_check": fields["last_check"] * 1000,
+            "last_state_change": fields["last_state_change"] * 1000,
+            "problem_has_been_acknowledged": bool(fields["problem_has_been_acknowledged"]),
+            "scheduled_downtime_depth": fields["scheduled_downtime_depth"],
+            "notifications_enabled": bool(fields["notifications_enabled"]),
+        }
+        if is_host:
+            record["name"] = fields["host_name"]
+        else:
+            record["description"] = fields["service_description"]
+        return record
+
+    def hosts(self, filters):
+        members = self._group_members(filters)
+        data = self.status.load()
+        if members is not None and members[1] is not None:
+            service_hosts = {host for host, _ in members[1]}
+        else:
+            service_hosts = None
+
+        for values in data["hosts"]:
+            host = values[0]
+            if filters.get("host_name") and host != filters["host_name"]:
+                continue
+            if members is not None:
+                if members[0] is not None and host not in members[0]:
+                    continue
+                if service_hosts is not None and host not in service_hosts:
+                    continue
+            record = self._record(values, HOST_FIELDS, is_host=True)
+            if record_matches(record, filters):
+                yield record
+
+    def services(self, filters):
+        members = self._group_members(filters)
+        data = self.status.load()
+        for values in data["services"]:
+            host = values[0]
+            if filters.get("host_name") and host != filters["host_name"]:
+                continue
+            if members is not None:
+                if members[0] is not None and host not in members[0]:
+                    continue
+                if members[1] is not None and (host, values[-1]) not in members[1]:
+                    continue
+            record = self._record(values, SERVICE_FIELDS, is_host=False)
+            if record_matches(record, filters):
+                yield record
+
+    def program_status(self):
+        program = self.status.load()["program"]
+        status = {}
+        for key, name in PROGRAM_FIELDS.items():
+            try:
+                status[name] = int(program.get(key, 0))
+            except ValueError:
+                status[name] = 0
+        for name in status:
+            if name not in ("nagios_pid", "program_start"):
+                status[name] = bool(status[name])
+        status["program_start"] *= 1000
+        return status
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""Parsing of bulk --ack/--downtime target lists.
+
+Each non-blank line is one target in any of the following forms:
+
+    host01.example.com
+    host01.example.com;HTTP
+    host01.example.com,HTTP
+    {"host": "host01.example.com", "service": "HTTP"}
+
+Lines starting with '#' are ignored, as is a header row such as
+``host,service``.
+"""
+import csv
+import json
+
+HOST_KEYS = ("host", "host_name", "hostname")
+SERVICE_KEYS = ("service", "service_description", "servicedescription", "description")
+
+
+def _parse_json_line(line, lineno):
+    try:
+        record = json.loads(line)
+    except ValueError as e:
+        raise ValueError(f"line {lineno}: invalid JSON ({e})")
+    if not isinstance(record, dict):
+        raise ValueError(f"line {lineno}: expected a JSON object")
+
+    host = next((record[k] for k in HOST_KEYS if record.get(k)), None)
+    service = next((record[k] for k in SERVICE_KEYS if record.get(k)), None)
+    return host, service
+
+
+def _parse_csv_line(line):
+    row = next(csv.reader([line]), [])
+    host = row[0] if row else None
+    service = row[1] if len(row) > 1 else None
+    return host, service
+
+
+def read_targets(stream):
+    """Read (host, service) targets from a file-like object.
+
+    Args:
+        stream: Iterable of text lines (open file or sys.stdin)
+
+    Returns:
+        List of (host, service) tuples in input order with duplicates
+        removed; service is None for host targets
+
+    Raises:
+        ValueError: If a line cannot be parsed into a target
+    """
+    targets = []
+    seen = set()
+
+    for lineno, raw in enumerate(stream, start=1):
+        line = raw.strip()
+        if not line or line.startswith("#"):
+            continue
+
+        if line.startswith("{"):
+            host, service = _parse_json_line(line, lineno)
+        else:
+            if ";" in line or "," not in line:
+                host, _, service = line.partition(";")
+            else:
+                host, service = _parse_csv_line(line)
+            if host and host.strip().lower() in HOST_KEYS:
+                # Header row
+                continue
+
+        host = host.strip() if host else ""
+        service = service.strip() if service else None
+        if not host:
+            raise ValueError(f"line {lineno}: missing host")
+
+        target = (host, service or None)
+        if target not in seen:
+            seen.add(target)
+            targets.append(target)
+
+    return targets
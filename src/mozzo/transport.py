@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+"""HTTP transport pieces shared by every CGI request.
+
+RetrySession adds an overall deadline per mozzo run and jittered retries
+for idempotent requests (GET/HEAD only; cmd.cgi POSTs are never
+repeated). TimeoutHTTPAdapter applies the default (connect, read)
+timeouts and feeds a CircuitBreaker, which fails fast once the Nagios
+server is clearly down instead of waiting out a timeout per request.
+"""
+import random
+import threading
+import time
+
+import requests
+import urllib3
+
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+RETRY_METHODS = frozenset({"GET", "HEAD"})
+
+# Gateway errors mean the CGI never ran; anything else is a real answer
+RETRY_STATUSES = frozenset({502, 503, 504})
+
+
+class DeadlineExceeded(requests.exceptions.Timeout):
+    """Raised when the run's overall deadline has passed."""
+
+
+class CircuitOpen(requests.exceptions.ConnectionError):
+    """Raised instead of sending a request while the circuit is open."""
+
+
+class Deadline:
+    """Overall time budget for one mozzo run.
+
+    Args:
+        seconds: Budget in seconds (None for no deadline)
+        clock: Monotonic clock, replaceable in tests
+    """
+
+    def __init__(self, seconds=None, clock=time.monotonic):
+        self.seconds = seconds
+        self.clock = clock
+        self.expires = clock() + seconds if seconds else None
+
+    def remaining(self):
+        """Return the seconds left, or None without a deadline."""
+        if self.expires is None:
+            return None
+        return self.expires - self.clock()
+
+
+class CircuitBreaker:
+    """Stop sending requests after repeated connection failures.
+
+    After threshold consecutive failures the circuit opens and requests
+    fail immediately with CircuitOpen for reset_timeout seconds. Then
+    requests are let through again; one success closes the circuit, one
+    more failure opens it for another reset_timeout.
+
+    Args:
+        threshold: Consecutive failures that open the circuit (0 disables it)
+        reset_timeout: Seconds to fail fast before trying again
+        clock: Monotonic clock, replaceable in tests
+    """
+
+    def __init__(self, threshold=5, reset_timeout=30, clock=time.monotonic):
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = None
+
+    def check(self):
+        """Raise CircuitOpen while the circuit is open."""
+        with self._lock:
+            if self._opened_at is None:
+                return
+            waited = self.clock() - self._opened_at
+            if waited < self.reset_timeout:
+                raise CircuitOpen(
+                    f"Nagios server looks down after {self._failures} failed requests; "
+                    f"not retrying for another {self.reset_timeout - waited:.0f}s"
+                )
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self.threshold and self._failures >= self.threshold:
+                self._opened_at = self.clock()
+
+
+class TimeoutHTTPAdapter(requests.adapters.HTTPAdapter):
+    """HTTPAdapter that sets a default timeout for all requests.
+
+    Args:
+        timeout: Seconds, or a (connect, read) tuple
+        breaker: Optional CircuitBreaker shared by every request
+    """
+
+    def __init__(self, timeout=60, *args, breaker=None, **kwargs):
+        self.timeout = timeout
+        self.breaker = breaker
+        super().__init__(*args, **kwargs)
+
+    def send(self, request, **kwargs):
+        # Use the instance timeout if no timeout is explicitly provided
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.timeout
+        if self.breaker is None:
+            return super().send(request, **kwargs)
+
+        self.breaker.check()
+        try:
+            response = super().send(request, **kwargs)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+            self.breaker.record_failure()
+            raise
+        if response.status_code in RETRY_STATUSES:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+        return response
+
+
+class RetrySession(requests.Session):
+    """Session with default timeouts, GET-only retries and a deadline.
+
+    Args:
+        timeout: Default seconds, or a (connect, read) tuple
+        retries: Extra attempts for GET/HEAD after a connection error,
+            timeout or gateway error (502/503/504)
+        backoff: Base delay; attempt n waits a random time up to
+            backoff * 2**n seconds ("full jitter")
+        backoff_max: Upper bound on a single delay
+        deadline: Optional Deadline shared by every request in the run
+        sleep: Sleep function, replaceable in tests
+    """
+
+    def __init__(self, timeout=60, retries=0, backoff=0.5, backoff_max=10.0, deadline=None, sleep=time.sleep):
+        super().__init__()
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.backoff_max = backoff_max
+        self.deadline = deadline or Deadline()
+        self.sleep = sleep
+
+    def _clip_timeout(self, timeout):
+        """Shorten a (connect, read) timeout to fit the deadline."""
+        remaining = self.deadline.remaining()
+        if remaining is None:
+            return timeout
+        if remaining <= 0:
+            raise DeadlineExceeded(f"Deadline of {self.deadline.seconds}s exceeded")
+        if isinstance(timeout, tuple):
+            return tuple(remaining if t is None else min(t, remaining) for t in timeout)
+        return remaining if timeout is None else min(timeout, remaining)
+
+    def request(self, method, url, **kwargs):
+        timeout = kwargs.pop("timeout", None)
+        if timeout is None:
+            timeout = self.timeout
+        attempts = 1 + (self.retries if method.upper() in RETRY_METHODS else 0)
+
+        for attempt in range(attempts):
+            last = attempt == attempts - 1
+            try:
+                response = super().request(method, url, timeout=self._clip_timeout(timeout), **kwargs)
+            except (DeadlineExceeded, CircuitOpen):
+                raise
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                if last:
+                    raise
+                error, response = e, None
+            else:
+                if last or response.status_code not in RETRY_STATUSES:
+                    return response
+                error = None
+
+            delay = random.uniform(0, min(self.backoff_max, self.backoff * 2 ** attempt))
+            remaining = self.deadline.remaining()
+            if remaining is not None and delay >= remaining:
+                # No time left for another attempt
+                if error is not None:
+                    raise error
+                return response
+            if response is not None:
+                response.close()
+            self.sleep(delay)
@@ -0,0 +1,456 @@
+# -*- coding: utf-8 -*-
+"""Read-only status views built on statusjson.cgi queries."""
+import csv
+import datetime
+import itertools
+import json
+import sys
+
+from mozzo.status import HOST_STATUS_CODES, SERVICE_STATUS_CODES, status_filter
+from mozzo.writers import FORMATS, write_rows
+
+SERVICE_CSV_FIELDS = ["host", "service", "status_code", "status"]
+
+
+class StatusViewsMixin:
+    def _build_service_result(self, host, service_name, details):
+        """Build standardized service result dictionary.
+
+        Args:
+            host: Host name
+            service_name: Service description
+            details: Service details from API
+
+        Returns:
+            Dictionary with service result data
+        """
+        status_code = details.get("status")
+        status_text = self._get_status_text(status_code, is_host=False)
+
+        return {
+            "host": host,
+            "service": service_name,
+            "status_code": status_code,
+            "status": status_text,
+            "plugin_output": details.get("plugin_output", ""),
+            "long_plugin_output": details.get("long_plugin_output", ""),
+        }
+
+    def show_unhandled(self):
+        print("\n--- Unhandled Service Alerts ---")
+
+        # 1. Server-Side Filtering: Ask Nagios ONLY for non-OK services.
+        query_str = (
+            "query=servicelist&details=true&" "servicestatus=warning+critical+unknown"
+        )
+        host_params = {"query": "hostlist", "details": "true"}
+        issue_states = {4: "WARNING", 8: "UNKNOWN", 16: "CRITICAL"}
+
+        # 2. Single pass over the streamed service list: keep only
+        # unhandled services, grouped by host
+        unhandled = {}
+        for host, svc_name, details in self._iter_services(query_str):
+            if details.get("status") not in issue_states:
+                continue
+            if self._is_handled(details):
+                continue
+            unhandled.setdefault(host, []).append((svc_name, details))
+
+        # 3. Bulk Loading: fetch every host's state in one hostlist query,
+        # only when there is something unhandled to check it against
+        hosts = {}
+        if unhandled:
+            hosts = self._get_json(host_params).get("data", {}).get("hostlist", {})
+
+        found = False
+
+        for host, svc_items in unhandled.items():
+            # Skip services whose host problem is already handled
+            if self._is_handled(hosts.get(host, {})):
+                continue
+
+            for svc_name, details in svc_items:
+                found = True
+                status_text = issue_states[details.get("status")]
+                print(
+                    f"[{status_text}] {host} -> {svc_name}\n"
+                    f"    Output: {details.get('plugin_output')}"
+                )
+
+        if not found:
+            print("🎉 No unhandled service alerts found!")
+
+    def show_service_issues(self, host=None):
+        issue_states = {4: "⚠️  WARNING", 8: "❓ UNKNOWN", 16: "❌ CRITICAL"}
+        print("\n--- List Service Issues ---")
+
+        params = {"query": "servicelist", "details": "false"}
+
+        if host:
+            params["hostname"] = host
+
+        services = self._get_json(params).get("data", {}).get("servicelist", {})
+
+        found = False
+        for current_host, svc_dict in services.items():
+            host_has_issues = False
+            for svc_name, svc_status in svc_dict.items():
+                if svc_status in issue_states:
+                    host_has_issues = True
+                    found = True
+
+            if host_has_issues:
+                print(f"{current_host}:")
+                for svc_name, svc_status in svc_dict.items():
+                    if svc_status in issue_states:
+                        print(
+                            f"    {issue_states[svc_status]} "
+                            f"for service: {svc_name}"
+                        )
+
+        if not found:
+            print("🎉 No service issues found!")
+
+    def _print_service_results(
+        self, results, output_format, show_output, header_text, secondary_key
+    ):
+        """Helper method to format and print service results consistently.
+
+        results may be any iterable; rows are printed as they are produced.
+        """
+        if output_format in FORMATS:
+            write_rows(results, output_format, SERVICE_CSV_FIELDS)
+        else:
+            print(f"\n--- {header_text} ---")
+            for r in results:
+                extended_out = (
+                    f"\n{'-' * 70}\n{r.get('plugin_output', '')}\n"
+                    f"{r.get('long_plugin_output', '')}\n"
+                    if show_output
+                    else ""
+                )
+                print(
+                    f"{'-' * 70}\n{r['status']:<12} | "
+                    f"{r[secondary_key]}{extended_out}".strip()
+                )
+            print("-" * 70)
+
+    def _service_list_params(self, host=None, service=None, output_filter=None, hostgroup=None, servicegroup=None):
+        """Build a servicelist query with every requested filter pushed to the source.
+
+        Args:
+            host: Host name (hostname)
+            service: Service description (servicedescription)
+            output_filter: Status name such as "CRITICAL" (servicestatus)
+            hostgroup: Hostgroup name
+            servicegroup: Servicegroup name
+
+        Returns:
+            Dictionary of statusjson.cgi params
+        """
+        params = {"query": "servicelist", "details": "true"}
+        pushed = {
+            "hostname": host,
+            "servicedescription": service,
+            "servicestatus": output_filter.lower() if output_filter else None,
+            "hostgroup": hostgroup,
+            "servicegroup": servicegroup,
+        }
+        params.update({key: value for key, value in pushed.items() if value})
+        return params
+
+    def _filtered_services(self, params):
+        """Yield servicelist rows, re-checking the query filters in Python.
+
+        Rows a source returns despite a filter (e.g. one ignoring a
+        parameter) are dropped. Host, description and status are always
+        on the row; group membership only when the source reports it.
+
+        Yields:
+            (host, service, details) tuples
+        """
+        wanted_status = status_filter(params.get("servicestatus"), SERVICE_STATUS_CODES)
+        checked = {key for key in ("hostname", "servicedescription", "servicestatus") if params.get(key)}
+        dropped = 0
+        for host, service, details in self._iter_services(params):
+            matches = all(
+                value == params[key]
+                for key, value in (("hostname", host), ("servicedescription", service))
+                if params.get(key)
+            )
+            if wanted_status is not None:
+                matches = matches and details.get("status") in wanted_status
+            for key, field in (("hostgroup", "host_groups"), ("servicegroup", "servicegroups")):
+                if params.get(key) and field in details:
+                    checked.add(key)
+                    matches = matches and params[key] in details[field]
+            if not matches:
+                dropped += 1
+                continue
+            yield host, service, details
+
+        if self.debug_query:
+            self._print_query_debug(params, checked, dropped)
+
+    def _print_query_debug(self, params, checked, dropped):
+        """Report which filters the source applied and which Python re-checked."""
+        source = self.answered_by or self.status_backend
+        if source == "statusjson" or self.status_source is None:
+            server_side = None
+        else:
+            server_side = self.status_source.FILTER_PARAMS
+        applied = ", ".join(
+            f"{key}={value}"
+            for key, value in params.items()
+            if key not in ("query", "details") and (server_side is None or key in server_side)
+        )
+        in_python = ", ".join(key for key in params if key in checked)
+        message = (
+            f"🔎 {params.get('query')} via {source}, server-side: {applied or 'none'}; "
+            f"checked in Python: {in_python or 'none'}"
+        )
+        if dropped:
+            message += f"; {dropped} non-matching row(s) dropped"
+        print(message, file=sys.stderr)
+
+    def show_host_services(
+        self,
+        host,
+        service=None,
+        show_output=False,
+        output_filter=None,
+        output_format="text",
+        hostgroup=None,
+        servicegroup=None,
+    ):
+        """Displays services for a specific host, optionally filtered."""
+        params = self._service_list_params(host, service, output_filter, hostgroup, servicegroup)
+        results = (
+            self._build_service_result(host, svc_name, details)
+            for svc_host, svc_name, details in self._filtered_services(params)
+        )
+
+        # Read up to the first match before printing any header
+        first = next(results, None)
+        if first is None:
+            if service or output_filter or hostgroup or servicegroup:
+                msg = f" for specified filter '{output_filter}'" if output_filter else ""
+                print(
+                    f"⚠️  Service '{service}' not found on host '{host}'{msg}.",
+                    file=sys.stderr,
+                )
+            else:
+                print(f"⚠️  No services found for host '{host}'.", file=sys.stderr)
+            return
+
+        header = (
+            f"Monitored Service: '{service}' on '{host}'"
+            if service
+            else f"Monitored Services for Host: '{host}'"
+        )
+        self._print_service_results(
+            itertools.chain([first], results),
+            output_format,
+            show_output,
+            header,
+            secondary_key="service",
+        )
+
+    def show_single_service(
+        self,
+        service=None,
+        show_output=False,
+        output_filter=None,
+        output_format="text",
+        hostgroup=None,
+        servicegroup=None,
+    ):
+        """Displays a specific service, across all hosts."""
+        if not service:
+            print(
+                "⚠️  No service specified. We should never be here.",
+                file=sys.stderr,
+            )
+            return
+
+        params = self._service_list_params(None, service, output_filter, hostgroup, servicegroup)
+        results = (
+            self._build_service_result(system_name, svc_name, details)
+            for system_name, svc_name, details in self._filtered_services(params)
+        )
+
+        # Read up to the first match before printing any header
+        first = next(results, None)
+        if first is None:
+            if output_filter:
+                msg = f" using the specified filter '{output_filter}'"
+                print(f"⚠️  No results found for service '{service}'{msg}.", file=sys.stderr)
+            else:
+                print(f"⚠️  No hosts found running service '{service}'.", file=sys.stderr)
+            return
+
+        header = f"Monitored Service: '{service}'"
+        self._print_service_results(
+            itertools.chain([first], results), output_format, show_output, header, secondary_key="host"
+        )
+
+    def show_status(self):
+        print("\n--- Nagios Core Status ---")
+        prog = (
+            self._get_json({"query": "programstatus"}, cache=True)
+            .get("data", {})
+            .get("programstatus", {})
+        )
+        status_map = {
+            "Notifications Enabled": prog.get("enable_notifications"),
+            "Active Service Checks": prog.get("execute_service_checks"),
+            "Active Host Checks": prog.get("execute_host_checks"),
+            "Event Handlers": prog.get("enable_event_handlers"),
+        }
+        for key, val in status_map.items():
+            print(f"{key:<25}: {'✅ ENABLED' if val else '❌ DISABLED'}")
+        print()
+
+    def fetch_summary(self, hostgroup=None, servicegroup=None):
+        """Fetch host/service state totals and program status.
+
+        Uses the hostcount/servicecount queries, so Nagios returns only
+        a handful of numbers instead of every object.
+
+        Returns:
+            Dictionary with "hosts" and "services" (state name -> count)
+            and "program" (programstatus data)
+        """
+        scope = {}
+        if hostgroup:
+            scope["hostgroup"] = hostgroup
+        if servicegroup:
+            scope["servicegroup"] = servicegroup
+
+        # Live state only: a cached programstatus would go stale when polled
+        host_resp, service_resp, prog_resp = self._fan_out(
+            self._get_json,
+            [dict(scope, query="hostcount"), dict(scope, query="servicecount"), {"query": "programstatus"}],
+        )
+        host_counts = host_resp.get("data", {}).get("count", {})
+        service_counts = service_resp.get("data", {}).get("count", {})
+        return {
+            "hosts": {name: host_counts.get(name, 0) for name in HOST_STATUS_CODES},
+            "services": {name: service_counts.get(name, 0) for name in SERVICE_STATUS_CODES},
+            "program": prog_resp.get("data", {}).get("programstatus", {}),
+        }
+
+    def show_summary(self, hostgroup=None, servicegroup=None, output_format="text"):
+        """Print host and service state totals, cheap enough to poll.
+
+        Args:
+            hostgroup: Optional hostgroup to limit the totals to
+            servicegroup: Optional servicegroup to limit the totals to
+            output_format: One of "text", "json", "ndjson", "csv"
+        """
+        summary = self.fetch_summary(hostgroup, servicegroup)
+
+        if output_format == "json":
+            print(json.dumps(summary, indent=2))
+            return
+        if output_format == "ndjson":
+            print(json.dumps(summary))
+            return
+        if output_format == "csv":
+            writer = csv.DictWriter(sys.stdout, fieldnames=["object_type", "state", "count"])
+            writer.writeheader()
+            for object_type in ("hosts", "services"):
+                for state, count in summary[object_type].items():
+                    writer.writerow({"object_type": object_type[:-1], "state": state.upper(), "count": count})
+            return
+
+        scope = hostgroup or servicegroup
+        print(f"\n--- Nagios Summary{f' ({scope})' if scope else ''} ---")
+        for label, object_type, codes, is_host in (
+            ("Hosts", "hosts", HOST_STATUS_CODES, True),
+            ("Services", "services", SERVICE_STATUS_CODES, False),
+        ):
+            counts = summary[object_type]
+            parts = [
+                f"{self._get_status_text(codes[name], is_host=is_host)}: {count}"
+                for name, count in counts.items()
+            ]
+            print(f"{f'{label} ({sum(counts.values())})':<16}: {'  '.join(parts)}")
+
+        prog = summary["program"]
+        print(f"{'Notifications':<16}: {'✅ ENABLED' if prog.get('enable_notifications') else '❌ DISABLED'}")
+        print()
+
+    def show_ack_history(self, host, service=None, days=7):
+        """Displays full acknowledgement history by querying active comments."""
+        # Use query=commentlist with details=true for reliable Status API data
+        params = {"query": "commentlist", "details": "true"}
+        start_ts = (datetime.datetime.now() - datetime.timedelta(days=days)).timestamp()
+
+        print(f"\n--- Acknowledgement History ({days} days) ---")
+        if service:
+            print(f"Target: {host} -> {service}")
+        else:
+            print(f"Target: Host {host}")
+        print("-" * 70)
+
+        try:
+            # Query active status for persistent comments
+            resp = self._get_json(params)
+            data = resp.get("data", {})
+            comments_blob = data.get("commentlist") or data.get("comments") or {}
+
+            # Correctly handle Nagios 4.4 dictionary iteration
+            if isinstance(comments_blob, dict):
+                comment_items = comments_blob.values()
+            else:
+                comment_items = comments_blob
+
+            found_any = False
+            for details in comment_items:
+                # Ensure we have a valid data dictionary
+                if not isinstance(details, dict):
+                    continue
+
+                # Type 4 is Acknowledgement
+                if int(details.get("entry_type", 0)) != 4:
+                    continue
+
+                # Fix Millisecond timestamps (detect values > 10,000,000,000)
+                entry_time = self._normalize_timestamp(float(details.get("entry_time", 0)))
+
+                if entry_time < start_ts:
+                    continue
+
+                log_host = details.get("host_name", "")
+                if not self._matches_host(log_host, host):
+                    continue
+
+                is_match = False
+                if service:
+                    # Service acks must match description exactly
+                    log_svc = details.get("service_description", "").lower()
+                    if log_svc == service.lower():
+                        is_match = True
+                else:
+                    # Host acks have empty service descriptions
+                    if not details.get("service_description"):
+                        is_match = True
+
+                if is_match:
+                    found_any = True
+                    ts = datetime.datetime.fromtimestamp(entry_time).strftime(
+                        self.date_format
+                    )
+                    author = details.get("author", "Unknown")
+                    msg = details.get("comment_data", "N/A")
+
+                    print(f"[{ts}] Author: {author}")
+                    print(f"    Message: {msg}")
+                    print("-" * 30)
+
+            if not found_any:
+                print("No persistent acknowledgements found for this time range.")
+
+        except Exception as e:
+            print(f"❌ Error fetching history from status API: {e}")
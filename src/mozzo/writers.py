@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""Streaming row writers for json, ndjson and csv output.
+
+Rows are consumed one at a time from any iterable, so memory stays
+flat however many rows a query returns. Output goes through a small
+write buffer that is flushed after the first row (so it shows up
+immediately) and then whenever the buffer fills. The json writer
+prints exactly what json.dumps(list(rows), indent=2) would.
+"""
+import csv
+import json
+import sys
+
+BUFFER_SIZE = 64 * 1024
+
+FORMATS = ("json", "ndjson", "csv")
+
+
+class BufferedOutput:
+    """Batch small writes into large ones on top of a text stream.
+
+    Args:
+        out: Text stream to write to (default: sys.stdout at call time)
+        limit: Buffered characters that trigger a flush
+    """
+
+    def __init__(self, out=None, limit=BUFFER_SIZE):
+        self.out = out if out is not None else sys.stdout
+        self.limit = limit
+        self._parts = []
+        self._size = 0
+
+    def write(self, text):
+        self._parts.append(text)
+        self._size += len(text)
+        if self._size >= self.limit:
+            self.flush()
+
+    def flush(self):
+        if self._parts:
+            self.out.write("".join(self._parts))
+            self._parts = []
+            self._size = 0
+        self.out.flush()
+
+
+def write_json(rows, out=None):
+    """Write rows as an indented JSON array, one element at a time."""
+    buffer = BufferedOutput(out)
+    first = True
+    for row in rows:
+        item = json.dumps(row, indent=2).replace("\n", "\n  ")
+        buffer.write(("[\n  " if first else ",\n  ") + item)
+        if first:
+            buffer.flush()
+        first = False
+    buffer.write("[]\n" if first else "\n]\n")
+    buffer.flush()
+
+
+def write_ndjson(rows, out=None):
+    """Write one compact JSON document per row."""
+    buffer = BufferedOutput(out)
+    first = True
+    for row in rows:
+        buffer.write(json.dumps(row) + "\n")
+        if first:
+            buffer.flush()
+            first = False
+    buffer.flush()
+
+
+def write_csv(rows, fieldnames, out=None):
+    """Write rows as CSV with a header; keys outside fieldnames are dropped."""
+    buffer = BufferedOutput(out)
+    writer = csv.DictWriter(buffer, fieldnames=fieldnames, extrasaction="ignore")
+    writer.writeheader()
+    first = True
+    for row in rows:
+        writer.writerow(row)
+        if first:
+            buffer.flush()
+            first = False
+    buffer.flush()
+
+
+def write_rows(rows, output_format, fieldnames, out=None):
+    """Write rows in one of FORMATS.
+
+    Args:
+        rows: Iterable of dictionaries
+        output_format: "json", "ndjson" or "csv"
+        fieldnames: CSV columns
+        out: Optional text stream (default: sys.stdout)
+    """
+    if output_format == "json":
+        write_json(rows, out)
+    elif output_format == "ndjson":
+        write_ndjson(rows, out)
+    elif output_format == "csv":
+        write_csv(rows, fieldnames, out)
+    else:
+        raise ValueError(f"Unsupported output format: {output_format}")
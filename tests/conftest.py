@@ -4,12 +4,12 @@ import pytest
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../src'))
 
-from mozzo.cli import MozzoNagiosClient  # noqa: E402
+from mozzo.client import MozzoNagiosClient  # noqa: E402
 
 
 @pytest.fixture
 def mock_config_file(tmp_path):
-    config_content = """
+    config_content = f"""
 nagios_server: https://nagios.example.com
 nagios_cgi_path: /nagios/cgi-bin
 nagios_username: testuser
@@ -18,6 +18,8 @@ default_downtime: 120
 default_reporting_days: 365
 verify_ssl: false
 date_format: "%m-%d-%Y %H:%M:%S"
+cache_dir: {tmp_path / "cache"}
+state_dir: {tmp_path / "state"}
 """
     config_file = tmp_path / "config.yml"
     config_file.write_text(config_content)
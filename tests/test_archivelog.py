@@ -0,0 +1,149 @@
+import datetime
+import os
+from unittest.mock import patch
+
+import pytest
+
+from mozzo import archivelog
+from mozzo.archivelog import ArchiveLogAvailability, log_files, read_events, state_totals
+from mozzo.reports import HOST_TIME_FIELDS, SERVICE_TIME_FIELDS
+
+ALL_OPTIONS = {
+    "assume_initial_state": True,
+    "assume_state_retention": True,
+    "assume_states_during_downtime": True,
+}
+
+LOG = """\
+[1000] CURRENT HOST STATE: web01;UP;HARD;1;PING OK
+[1000] CURRENT SERVICE STATE: web01;HTTP;OK;HARD;1;HTTP OK
+[1000] CURRENT SERVICE STATE: web01;DNS;OK;HARD;1;DNS OK
+[1100] SERVICE ALERT: web01;HTTP;CRITICAL;SOFT;1;timeout
+[1200] SERVICE ALERT: web01;HTTP;CRITICAL;HARD;3;timeout
+[1300] SERVICE ALERT: web01;HTTP;OK;HARD;1;HTTP OK
+[1400] HOST ALERT: web01;DOWN;HARD;3;PING CRITICAL
+[1500] Caught SIGTERM, shutting down...
+[1500] Successfully shutdown... (PID=42)
+[1600] Nagios 4.4.6 starting... (PID=43)
+[1700] HOST ALERT: web01;UP;HARD;1;PING OK
+[1800] SERVICE DOWNTIME ALERT: web01;DNS;STARTED; downtime
+"""
+
+
+@pytest.fixture
+def log_file(tmp_path):
+    path = tmp_path / "nagios.log"
+    path.write_text(LOG)
+    return str(path)
+
+
+def _totals(log_file, fields, options=ALL_OPTIONS, use_numpy=None, start=1000, end=2000):
+    hosts, services, runs = read_events([log_file], end)
+    events = hosts if fields is HOST_TIME_FIELDS else services
+    return state_totals(events, fields, start, end, runs, options, use_numpy=use_numpy)
+
+
+def test_read_events_hard_states_only(log_file):
+    hosts, services, runs = read_events([log_file], 2000)
+    assert list(services.times) == [1000, 1000, 1200, 1300]
+    assert hosts.names == ["web01"]
+    assert runs.stopped == [(1500, 1600)]
+    assert runs.starts == [1600]
+
+
+def test_service_totals(log_file):
+    totals = _totals(log_file, SERVICE_TIME_FIELDS)
+    assert totals[("web01", "HTTP")]["time_ok"] == 900
+    assert totals[("web01", "HTTP")]["time_critical"] == 100
+    assert totals[("web01", "DNS")]["time_ok"] == 1000
+
+
+def test_host_downtime_not_running(log_file):
+    options = dict(ALL_OPTIONS, assume_states_during_downtime=False)
+    totals = _totals(log_file, HOST_TIME_FIELDS, options)["web01"]
+    assert totals["time_up"] == 400 + 300
+    assert totals["time_down"] == 200
+    assert totals["time_indeterminate_notrunning"] == 100
+
+
+def test_no_state_retention_resets_after_restart(log_file):
+    options = dict(ALL_OPTIONS, assume_state_retention=False)
+    totals = _totals(log_file, HOST_TIME_FIELDS, options)["web01"]
+    # DOWN is forgotten at the 1600 restart until the 1700 recovery
+    assert totals["time_down"] == 200
+    assert totals["time_indeterminate_nodata"] == 100
+    assert totals["time_up"] == 700
+
+
+def test_assume_initial_state(tmp_path):
+    path = tmp_path / "nagios.log"
+    path.write_text("[1500] SERVICE ALERT: db01;MySQL;WARNING;HARD;3;slow\n")
+
+    assumed = _totals(str(path), SERVICE_TIME_FIELDS)[("db01", "MySQL")]
+    assert assumed["time_warning"] == 1000
+
+    options = dict(ALL_OPTIONS, assume_initial_state=False)
+    unknown = _totals(str(path), SERVICE_TIME_FIELDS, options)[("db01", "MySQL")]
+    assert unknown["time_indeterminate_nodata"] == 500
+    assert unknown["time_warning"] == 500
+
+
+@pytest.mark.parametrize("fields", [HOST_TIME_FIELDS, SERVICE_TIME_FIELDS])
+@pytest.mark.parametrize("retention", [True, False])
+@pytest.mark.parametrize("downtime", [True, False])
+def test_numpy_and_python_agree(log_file, fields, retention, downtime):
+    pytest.importorskip("numpy")
+    options = dict(ALL_OPTIONS, assume_state_retention=retention, assume_states_during_downtime=downtime)
+    for window in ((1000, 2000), (1250, 1650), (900, 1550)):
+        assert _totals(log_file, fields, options, True, *window) == _totals(log_file, fields, options, False, *window)
+
+
+def test_pure_python_fallback_without_numpy(log_file):
+    with patch.object(archivelog, "np", None):
+        totals = _totals(log_file, SERVICE_TIME_FIELDS)
+    assert totals[("web01", "HTTP")]["time_critical"] == 100
+
+
+def test_log_files_selects_window(tmp_path):
+    archive_dir = tmp_path / "archives"
+    archive_dir.mkdir()
+    names = ["nagios-01-01-2025-00.log", "nagios-01-02-2025-00.log", "nagios-01-03-2025-00.log"]
+    for name in names:
+        (archive_dir / name).write_text("")
+    current = tmp_path / "nagios.log"
+    current.write_text("")
+
+    start = datetime.datetime(2025, 1, 1, 12).timestamp()
+    files = log_files(str(current), str(archive_dir), start, datetime.datetime(2025, 1, 5).timestamp())
+    assert [os.path.basename(f) for f in files] == names[1:] + ["nagios.log"]
+
+    files = log_files(str(current), str(archive_dir), start, datetime.datetime(2025, 1, 1, 18).timestamp())
+    assert [os.path.basename(f) for f in files] == ["nagios-01-02-2025-00.log"]
+
+
+def test_availability_shapes(log_file, tmp_path):
+    source = ArchiveLogAvailability(log_file, str(tmp_path / "archives"))
+    window = {"starttime": 1000, "endtime": 2000, "assumeinitialstate": "true",
+              "assumestateretention": "true", "assumestatesduringnagiosdowntime": "true"}
+
+    service = source.availability(dict(window, availabilityobjecttype="services", hostname="web01", servicedescription="HTTP"))
+    assert service["service"]["description"] == "HTTP"
+    assert service["service"]["time_critical"] == 100
+
+    hosts = source.availability(dict(window, availabilityobjecttype="hosts"))
+    assert [row["name"] for row in hosts["hostlist"]] == ["web01"]
+
+    on_host = source.availability(dict(window, availabilityobjecttype="services", hostname="web01"))
+    assert [row["description"] for row in on_host["servicelist"]] == ["DNS", "HTTP"]
+
+
+def test_client_uses_archive_logs(client, log_file, tmp_path):
+    client.availability_source = ArchiveLogAvailability(log_file, str(tmp_path / "archives"))
+    with patch.object(client.session, "get") as mock_get, \
+            patch("mozzo.reports.datetime") as mock_datetime:
+        mock_datetime.datetime.now.return_value = datetime.datetime.fromtimestamp(2000)
+        mock_datetime.timedelta = datetime.timedelta
+        result = client._fetch_availability_data("web01", service="HTTP", days=1000 / 86400)
+
+    mock_get.assert_not_called()
+    assert result["percent_critical"] == 10.0
@@ -0,0 +1,108 @@
+import datetime
+import os
+from unittest.mock import Mock, patch
+
+from mozzo.reports import merge_availability, month_slices
+
+
+def _ts(*args):
+    return int(datetime.datetime(*args).timestamp())
+
+
+def test_month_slices_split_on_calendar_months():
+    slices = month_slices(_ts(2025, 1, 15, 12), _ts(2025, 3, 10))
+    assert slices == [
+        (_ts(2025, 1, 15, 12), _ts(2025, 2, 1)),
+        (_ts(2025, 2, 1), _ts(2025, 3, 1)),
+        (_ts(2025, 3, 1), _ts(2025, 3, 10)),
+    ]
+
+
+def test_month_slices_within_one_month():
+    assert month_slices(_ts(2025, 6, 2), _ts(2025, 6, 3)) == [(_ts(2025, 6, 2), _ts(2025, 6, 3))]
+    assert month_slices(10, 10) == []
+
+
+def test_merge_availability_sums_per_object():
+    first = {"hostlist": [{"name": "a", "time_up": 10}, {"name": "b", "time_down": 5}]}
+    second = {"hostlist": [{"name": "b", "time_down": 5, "time_up": 1}, {"name": "c", "time_up": 2}]}
+    total = merge_availability(merge_availability({}, first), second)
+
+    assert total == {
+        "hostlist": [
+            {"name": "a", "time_up": 10},
+            {"name": "b", "time_down": 10, "time_up": 1},
+            {"name": "c", "time_up": 2},
+        ]
+    }
+    # Inputs are left untouched
+    assert first["hostlist"][1] == {"name": "b", "time_down": 5}
+
+
+def test_merge_availability_single_service():
+    total = {}
+    for ok, crit in ((90, 10), (50, 50)):
+        merge_availability(total, {"service": {"description": "HTTP", "time_ok": ok, "time_critical": crit}})
+    assert total == {"service": {"description": "HTTP", "time_ok": 140, "time_critical": 60}}
+
+
+def _slice_response(params):
+    response = Mock()
+    response.status_code = 200
+    response.json.return_value = {
+        "data": {"host": {"name": "web01", "time_up": params["endtime"] - params["starttime"]}}
+    }
+    return response
+
+
+def test_availability_window_queries_slices_concurrently(client):
+    client.concurrency = 4
+    with patch.object(client.session, "get", side_effect=lambda url, params, **kw: _slice_response(params)) as mock_get:
+        data = client._fetch_availability_window("hosts", 90, hostname="web01")
+
+    windows = sorted((c.kwargs["params"]["starttime"], c.kwargs["params"]["endtime"]) for c in mock_get.call_args_list)
+    assert len(windows) >= 3
+    assert all(a[1] == b[0] for a, b in zip(windows, windows[1:]))
+    assert data["host"]["time_up"] == windows[-1][1] - windows[0][0]
+
+
+def test_past_slices_are_cached(client):
+    with patch.object(client.session, "get", side_effect=lambda url, params, **kw: _slice_response(params)) as mock_get:
+        client._fetch_availability_window("hosts", 90, hostname="web01")
+        first_calls = mock_get.call_count
+        mock_get.reset_mock()
+        client._fetch_availability_window("hosts", 90, hostname="web01")
+
+    # Whole past months come from the cache; only the partial oldest and
+    # current slices are fetched again
+    assert first_calls >= 3
+    assert mock_get.call_count == 2
+    assert len(os.listdir(os.path.join(client.cache_dir, "availability"))) == first_calls - 2
+
+
+def test_no_cache_mode_refetches_everything(client):
+    client.cache_mode = "off"
+    with patch.object(client.session, "get", side_effect=lambda url, params, **kw: _slice_response(params)) as mock_get:
+        client._fetch_availability_window("hosts", 90)
+        first_calls = mock_get.call_count
+        client._fetch_availability_window("hosts", 90)
+
+    assert mock_get.call_count == 2 * first_calls
+
+
+def test_failed_slice_fails_window(client):
+    bad = Mock(status_code=500)
+    with patch.object(client.session, "get", return_value=bad):
+        assert client._fetch_availability_window("hosts", 90) is None
+
+
+def test_past_slices_survive_response_cache_eviction(client):
+    client.cache.max_entries = 1
+    with patch.object(client.session, "get", side_effect=lambda url, params, **kw: _slice_response(params)) as mock_get:
+        client._fetch_availability_window("hosts", 90, hostname="web01")
+        for i in range(5):
+            client.cache.set(client.cache.key("servicelist", "u", {"hostname": f"web{i}"}), {})
+        mock_get.reset_mock()
+        client._fetch_availability_window("hosts", 90, hostname="web01")
+
+    assert mock_get.call_count == 2
@@ -0,0 +1,76 @@
+import io
+from unittest.mock import patch
+
+import pytest
+
+from mozzo.targets import read_targets
+
+
+def test_read_targets_semicolon_lines():
+    stream = io.StringIO("web01;HTTP\nweb02\n\n# comment\n")
+    assert read_targets(stream) == [("web01", "HTTP"), ("web02", None)]
+
+
+def test_read_targets_csv_with_header():
+    stream = io.StringIO('host,service\nweb01,HTTP\nweb02,"Disk, /var"\ndb01,\n')
+    assert read_targets(stream) == [
+        ("web01", "HTTP"),
+        ("web02", "Disk, /var"),
+        ("db01", None),
+    ]
+
+
+def test_read_targets_ndjson():
+    stream = io.StringIO(
+        '{"host": "web01", "service": "HTTP"}\n'
+        '{"host_name": "db01"}\n'
+    )
+    assert read_targets(stream) == [("web01", "HTTP"), ("db01", None)]
+
+
+def test_read_targets_removes_duplicates():
+    stream = io.StringIO("web01;HTTP\nweb01;HTTP\nweb01\n")
+    assert read_targets(stream) == [("web01", "HTTP"), ("web01", None)]
+
+
+def test_read_targets_invalid_json():
+    with pytest.raises(ValueError, match="line 2"):
+        read_targets(io.StringIO("web01\n{not json\n"))
+
+
+def test_read_targets_missing_host():
+    with pytest.raises(ValueError, match="missing host"):
+        read_targets(io.StringIO(";HTTP\n"))
+
+
+def test_bulk_submit_ack_summary(client, capsys):
+    targets = [("web01", "HTTP"), ("web02", None), ("web03", "DNS")]
+    results = [
+        {"ok": True, "message": "ok"},
+        {"ok": False, "message": "❌ HTTP Error submitting command: boom"},
+        {"ok": True, "message": "ok"},
+    ]
+    with patch.object(client, "_send_cmds", return_value=results) as mock_send:
+        failed = client.bulk_submit(targets, action="ack")
+
+    payloads = mock_send.call_args[0][0]
+    assert [p["cmd_typ"] for p in payloads] == [34, 33, 34]
+    assert failed == 1
+
+    captured = capsys.readouterr()
+    assert "Submitting 3 acknowledgement command(s)..." in captured.out
+    assert "2 succeeded, 1 failed" in captured.out
+    assert "web02: ❌ HTTP Error submitting command: boom" in captured.out
+    assert captured.out.count("ok") == 0
+
+
+def test_bulk_submit_downtime_all_services(client):
+    results = [{"ok": True, "message": "ok"}] * 2
+    with patch.object(client, "_send_cmds", return_value=results) as mock_send:
+        failed = client.bulk_submit(
+            [("web01", None), ("web02", "HTTP")], action="downtime", all_services=True
+        )
+
+    payloads = mock_send.call_args[0][0]
+    assert [p["cmd_typ"] for p in payloads] == [86, 56]
+    assert failed == 0
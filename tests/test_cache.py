@@ -0,0 +1,115 @@
+import os
+import time
+from unittest.mock import Mock, patch
+
+from mozzo.cache import ResponseCache
+
+
+def _json_response(data):
+    response = Mock()
+    response.json.return_value = data
+    return response
+
+
+def test_cache_roundtrip_and_ttl(tmp_path):
+    cache = ResponseCache(str(tmp_path))
+    key = cache.key("hostlist", "https://nagios/statusjson.cgi", {"query": "hostlist"})
+    cache.set(key, {"data": {"hostlist": {"web01": 2}}})
+
+    assert cache.get(key, ttl=60) == {"data": {"hostlist": {"web01": 2}}}
+    with patch("mozzo.cache.time.time", return_value=time.time() + 120):
+        assert cache.get(key, ttl=60) is None
+
+
+def test_cache_key_ignores_param_order(tmp_path):
+    cache = ResponseCache(str(tmp_path))
+    a = cache.key("servicelist", "u", {"query": "servicelist", "hostname": "web01"})
+    b = cache.key("servicelist", "u", {"hostname": "web01", "query": "servicelist"})
+    assert a == b
+    assert a.startswith("servicelist-")
+
+
+def test_cache_lru_eviction(tmp_path):
+    cache = ResponseCache(str(tmp_path), max_entries=2)
+    cache.set("hostlist-a", 1)
+    cache.set("hostlist-b", 2)
+    past = time.time() - 100
+    os.utime(tmp_path / "hostlist-a.json", (past, past))
+    os.utime(tmp_path / "hostlist-b.json", (past - 50, past - 50))
+
+    # Reading "b" marks it as recently used, so "a" is evicted next
+    assert cache.get("hostlist-b", ttl=60) == 2
+    cache.set("hostlist-c", 3)
+
+    assert sorted(os.listdir(tmp_path)) == ["hostlist-b.json", "hostlist-c.json"]
+
+
+def test_cache_ignores_corrupt_entry(tmp_path):
+    cache = ResponseCache(str(tmp_path))
+    (tmp_path / "hostlist-x.json").write_text("{not json")
+    assert cache.get("hostlist-x", ttl=60) is None
+
+
+def test_get_json_uses_cache(client):
+    data = {"data": {"hostlist": {"web01": 2}}}
+    with patch.object(client.session, "get", return_value=_json_response(data)) as mock_get:
+        assert client._get_json({"query": "hostlist"}, cache=True) == data
+        assert client._get_json({"query": "hostlist"}, cache=True) == data
+    assert mock_get.call_count == 1
+
+
+def test_get_json_refresh_and_no_cache(client):
+    data = {"data": {"hostlist": {"web01": 2}}}
+    with patch.object(client.session, "get", return_value=_json_response(data)) as mock_get:
+        client._get_json({"query": "hostlist"}, cache=True)
+        client.cache_mode = "refresh"
+        client._get_json({"query": "hostlist"}, cache=True)
+        client.cache_mode = "off"
+        client._get_json({"query": "hostlist"}, cache=True)
+    assert mock_get.call_count == 3
+
+
+def test_get_json_uncached_query_type(client):
+    data = {"data": {"servicelist": {}}}
+    with patch.object(client.session, "get", return_value=_json_response(data)) as mock_get:
+        client._get_json({"query": "service"}, cache=True)
+        client._get_json({"query": "service"}, cache=True)
+    assert mock_get.call_count == 2
+
+
+def test_resolve_host_shortname(client):
+    data = {"data": {"hostlist": {"web01.example.com": 2, "db01.example.com": 2}}}
+    with patch.object(client, "_get_json", return_value=data):
+        assert client._resolve_host("web01") == "web01.example.com"
+        assert client._resolve_host("db01.example.com") == "db01.example.com"
+        assert client._resolve_host("missing") == "missing"
+
+
+def test_ack_all_services_resolves_shortname(client):
+    responses = {
+        ("servicelist", "web01"): {"data": {"servicelist": {}}},
+        ("hostlist", None): {"data": {"hostlist": {"web01.example.com": 2}}},
+        ("servicelist", "web01.example.com"): {
+            "data": {"servicelist": {"web01.example.com": {"HTTP": 2}}}
+        },
+    }
+
+    def fake_get_json(params, cache=False):
+        assert cache is True
+        return responses[(params["query"], params.get("hostname"))]
+
+    result = {"ok": True, "message": "ok"}
+    with patch.object(client, "_get_json", side_effect=fake_get_json), \
+            patch.object(client, "_send_cmd", return_value=result) as mock_send:
+        client.ack_all_services("web01")
+
+    hosts = {call[0][0]["host"] for call in mock_send.call_args_list}
+    assert hosts == {"web01.example.com"}
+
+
+def test_cache_key_depends_on_user(tmp_path):
+    cache = ResponseCache(str(tmp_path))
+    a = cache.key("hostlist", "u", {"query": "hostlist"}, user="alice")
+    b = cache.key("hostlist", "u", {"query": "hostlist"}, user="bob")
+    assert a != b
+    assert "alice" not in a
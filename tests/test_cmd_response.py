@@ -0,0 +1,110 @@
+from unittest.mock import Mock, patch
+
+import requests
+
+
+def _streamed_response(chunks):
+    consumed = []
+    remaining = iter(chunks)
+
+    # Like a real stream, each call continues where the last one stopped
+    def iter_content(chunk_size=1):
+        for chunk in remaining:
+            consumed.append(chunk)
+            yield chunk
+
+    response = Mock()
+    response.encoding = "utf-8"
+    response.iter_content = iter_content
+    response.raise_for_status = Mock()
+    response.consumed = consumed
+    return response
+
+
+def test_send_cmd_success_stops_reading(client):
+    response = _streamed_response([
+        b"<html><head></head><body>",
+        b"<div class='infoMessage'>Your command request was successfully submitted",
+        b" to Nagios for processing.</div>",
+        b"<p>" + b"x" * 4096 + b"</p>",
+    ])
+
+    assert client._parse_cmd_response(response)["status"] == "submitted"
+    assert len(response.consumed) == 2
+
+
+def test_send_cmd_drains_short_page_and_reuses_connection(client):
+    response = _streamed_response([
+        b"<div class='infoMessage'>Your command request was successfully submitted",
+        b" to Nagios for processing.</div>",
+        b"<p>" + b"x" * 4096 + b"</p>",
+    ])
+
+    with patch.object(client.session, "post", return_value=response) as mock_post:
+        result = client._send_cmd({"cmd_typ": 33, "cmd_mod": 2, "host": "web01"})
+
+    assert result["ok"] is True
+    assert result["status"] == "submitted"
+    assert result["error"] is None
+    assert mock_post.call_args[1]["stream"] is True
+    assert len(response.consumed) == 3
+    response.raw.release_conn.assert_called_once()
+    response.close.assert_not_called()
+
+
+def test_send_cmd_closes_connection_after_long_page(client):
+    client.CMD_DRAIN_LIMIT = 8192
+    response = _streamed_response([b"successfully submitted"] + [b"x" * 4096] * 10)
+
+    with patch.object(client.session, "post", return_value=response):
+        assert client._send_cmd({"cmd_typ": 33, "host": "web01"})["ok"]
+
+    assert len(response.consumed) == 4
+    response.close.assert_called_once()
+    response.raw.release_conn.assert_not_called()
+
+
+def test_send_cmd_reports_nagios_error(client):
+    response = _streamed_response([
+        b"<P><DIV CLASS='errorMessage'>Sorry, but you are not authorized ",
+        b"to commit the specified command.</DIV></P>",
+    ])
+
+    with patch.object(client.session, "post", return_value=response):
+        result = client._send_cmd({"cmd_typ": 33, "cmd_mod": 2, "host": "web01"})
+
+    assert result["ok"] is False
+    assert result["status"] == "rejected"
+    assert result["error"] == (
+        "Sorry, but you are not authorized to commit the specified command."
+    )
+
+
+def test_send_cmd_stops_at_byte_budget(client):
+    client.CMD_RESPONSE_BUDGET = 8192
+    response = _streamed_response([b"x" * 4096] * 10)
+
+    assert client._parse_cmd_response(response)["status"] == "unconfirmed"
+    assert len(response.consumed) == 2
+
+
+def test_send_cmd_http_error(client):
+    with patch.object(
+        client.session,
+        "post",
+        side_effect=requests.exceptions.RequestException("Connection error"),
+    ):
+        result = client._send_cmd({"cmd_typ": 33, "cmd_mod": 2, "host": "web01"})
+
+    assert result["ok"] is False
+    assert result["status"] == "http_error"
+    assert "Connection error" in result["message"]
+
+
+def test_post_cmd_prints_result(client, capsys):
+    response = _streamed_response([b"successfully submitted"])
+
+    with patch.object(client.session, "post", return_value=response):
+        client._post_cmd({"cmd_typ": 33, "cmd_mod": 2, "host": "web01"})
+
+    assert "✅ Command successfully submitted to Nagios." in capsys.readouterr().out
@@ -0,0 +1,116 @@
+import os
+import threading
+
+import pytest
+
+from mozzo import cmdfile
+
+
+DATE_FORMAT = "%m-%d-%Y %H:%M:%S"
+
+
+def _read_fifo(path, sink):
+    with open(path, "r", encoding="utf-8") as f:
+        sink.append(f.read())
+
+
+def test_format_ack_service(client):
+    payload = client._build_ack_payload("web01", service="HTTP")
+    lines = cmdfile.format_command(payload, "admin", "on it", DATE_FORMAT)
+    assert lines == ["ACKNOWLEDGE_SVC_PROBLEM;web01;HTTP;2;0;0;admin;on it"]
+
+
+def test_format_downtime_all_services(client):
+    client.days = None
+    client.downtime_mins = 60
+    payload = client._build_downtime_payload("web01", all_services=True)
+    lines = cmdfile.format_command(payload, "admin", "maint", client.date_format)
+
+    assert len(lines) == 2
+    assert lines[0].startswith("SCHEDULE_HOST_DOWNTIME;web01;")
+    assert lines[1].startswith("SCHEDULE_HOST_SVC_DOWNTIME;web01;")
+    fields = lines[1].split(";")
+    start, end, fixed, trigger, duration = (int(f) for f in fields[2:7])
+    assert end - start == 3600
+    assert duration == 3600
+    assert (fixed, trigger) == (1, 0)
+
+
+def test_format_toggle_and_global():
+    assert cmdfile.format_command(
+        {"cmd_typ": 23, "cmd_mod": 2, "host": "web01", "service": "HTTP"},
+        "admin", "", DATE_FORMAT,
+    ) == ["DISABLE_SVC_NOTIFICATIONS;web01;HTTP"]
+    assert cmdfile.format_command(
+        {"cmd_typ": 12, "cmd_mod": 2}, "admin", "", DATE_FORMAT
+    ) == ["ENABLE_NOTIFICATIONS"]
+
+
+def test_format_strips_newlines():
+    lines = cmdfile.format_command(
+        {"cmd_typ": 33, "host": "web01"}, "admin", "line one\n[0] SHUTDOWN_PROGRAM", DATE_FORMAT
+    )
+    assert len(lines) == 1
+    assert "\n" not in lines[0]
+
+
+def test_format_unsupported_command():
+    with pytest.raises(cmdfile.UnsupportedCommand):
+        cmdfile.format_command({"cmd_typ": 9999}, "admin", "", DATE_FORMAT)
+
+
+def test_write_commands_named_pipe(tmp_path):
+    fifo = str(tmp_path / "nagios.cmd")
+    os.mkfifo(fifo)
+    received = []
+    reader = threading.Thread(target=_read_fifo, args=(fifo, received))
+    reader.start()
+
+    # Give the reader a moment to open the FIFO
+    for _ in range(100):
+        try:
+            cmdfile.write_commands(fifo, ["ENABLE_NOTIFICATIONS", "DISABLE_NOTIFICATIONS"], timestamp=1700000000)
+            break
+        except OSError:
+            threading.Event().wait(0.01)
+    reader.join(timeout=5)
+
+    assert received == [
+        "[1700000000] ENABLE_NOTIFICATIONS\n[1700000000] DISABLE_NOTIFICATIONS\n"
+    ]
+
+
+def test_write_commands_no_reader(tmp_path):
+    fifo = str(tmp_path / "nagios.cmd")
+    os.mkfifo(fifo)
+    with pytest.raises(OSError):
+        cmdfile.write_commands(fifo, ["ENABLE_NOTIFICATIONS"])
+
+
+def test_client_file_backend_batches_single_write(client, tmp_path):
+    command_file = tmp_path / "nagios.cmd"
+    command_file.write_text("")
+    client.command_backend = "file"
+    client.command_file = str(command_file)
+
+    payloads = [
+        client._build_ack_payload("web01"),
+        client._build_ack_payload("web01", service="HTTP"),
+        {"cmd_typ": 9999, "cmd_mod": 2},
+    ]
+    results = client._send_cmds(payloads)
+
+    assert [r["status"] for r in results] == ["submitted", "submitted", "rejected"]
+    lines = command_file.read_text().splitlines()
+    assert len(lines) == 2
+    assert "ACKNOWLEDGE_HOST_PROBLEM;web01;" in lines[0]
+    assert "ACKNOWLEDGE_SVC_PROBLEM;web01;HTTP;" in lines[1]
+
+
+def test_client_file_backend_write_error(client, tmp_path):
+    client.command_backend = "file"
+    client.command_file = str(tmp_path / "missing" / "nagios.cmd")
+
+    result = client._send_cmd(client._build_ack_payload("web01"))
+    assert result["ok"] is False
+    assert result["status"] == "write_error"
@@ -0,0 +1,65 @@
+import threading
+import time
+from unittest.mock import patch
+
+
+def test_fan_out_preserves_order(client):
+    client.concurrency = 4
+
+    def slow_double(n):
+        time.sleep(0.01 * (5 - n))
+        return n * 2
+
+    assert client._fan_out(slow_double, [1, 2, 3, 4]) == [2, 4, 6, 8]
+
+
+def test_fan_out_respects_concurrency_limit(client):
+    client.concurrency = 2
+    lock = threading.Lock()
+    active = [0]
+    peak = [0]
+
+    def track(_):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.02)
+        with lock:
+            active[0] -= 1
+
+    client._fan_out(track, range(6))
+    assert peak[0] <= 2
+
+
+def test_fan_out_sequential_when_concurrency_one(client):
+    client.concurrency = 1
+    threads = set()
+    client._fan_out(lambda _: threads.add(threading.current_thread()), range(3))
+    assert threads == {threading.current_thread()}
+
+
+def test_connection_pool_sized_to_concurrency(mock_config_file):
+    from mozzo.client import MozzoNagiosClient
+    client = MozzoNagiosClient(config_path=mock_config_file, concurrency=12)
+    assert client.concurrency == 12
+    assert client.session.get_adapter("https://nagios.example.com")._pool_maxsize == 12
+
+
+def test_ack_all_services_reports_in_order(client, capsys):
+    services = {"data": {"servicelist": {"web01": {"DNS": 2, "HTTP": 16, "SSH": 2}}}}
+    with patch.object(client, "_get_json", return_value=services), \
+            patch.object(client, "_send_cmd", return_value={"ok": True, "message": "ok"}) as mock_send:
+        client.ack_all_services("web01")
+
+    assert mock_send.call_count == 4
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[1:] == [
+        "Acknowledging host 'web01'...",
+        "ok",
+        "Acknowledging service 'DNS' on host 'web01'...",
+        "ok",
+        "Acknowledging service 'HTTP' on host 'web01'...",
+        "ok",
+        "Acknowledging service 'SSH' on host 'web01'...",
+        "ok",
+    ]
@@ -0,0 +1,171 @@
+import json
+import socket
+import sys
+import threading
+from argparse import Namespace
+from unittest.mock import patch
+
+import pytest
+
+from mozzo import daemon, ipc
+from mozzo.cli import run
+from mozzo.client import MozzoNagiosClient
+
+
+PROGRAM_STATUS = {
+    "data": {
+        "programstatus": {
+            "enable_notifications": True,
+            "execute_service_checks": True,
+            "execute_host_checks": False,
+            "enable_event_handlers": True,
+        }
+    }
+}
+
+
+@pytest.fixture
+def mozzod(tmp_path):
+    socket_path = str(tmp_path / "d.sock")
+    server = daemon.MozzoDaemon(socket_path)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server, socket_path
+    server.shutdown()
+    server.server_close()
+
+
+def test_forward_without_daemon(tmp_path):
+    assert ipc.forward(["--status"], socket_path=str(tmp_path / "missing.sock")) is None
+
+
+def _frames(socket_path, argv):
+    # Talk to the daemon directly: in tests it shares this process, so
+    # ipc.forward() writing to sys.stdout would race its redirection
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(socket_path)
+        sock.sendall(json.dumps({"argv": argv, "cwd": "/"}).encode("utf-8") + b"\n")
+        with sock.makefile("rb") as stream:
+            return [json.loads(line) for line in stream]
+
+
+def _joined(frames, name):
+    return "".join(frame.get(name, "") for frame in frames)
+
+
+def test_daemon_matches_in_process_output(mozzod, mock_config_file, capsys):
+    _, socket_path = mozzod
+    argv = ["-c", mock_config_file, "--status"]
+
+    with patch.object(MozzoNagiosClient, "_get_json", return_value=PROGRAM_STATUS):
+        run(argv)
+        in_process = capsys.readouterr()
+        frames = _frames(socket_path, argv)
+
+    assert frames[0] == {"accepted": True}
+    assert frames[-1] == {"exit": 0}
+    assert _joined(frames, "stdout") == in_process.out
+    assert _joined(frames, "stderr") == in_process.err
+
+
+def test_daemon_propagates_exit_code(mozzod, tmp_path):
+    _, socket_path = mozzod
+    frames = _frames(socket_path, ["-c", str(tmp_path / "nope.yml"), "--concurrency", "0"])
+
+    assert frames[-1] == {"exit": 2}
+    assert "--concurrency must be at least 1" in _joined(frames, "stderr")
+
+
+def test_daemon_reuses_session(mozzod, mock_config_file):
+    server, socket_path = mozzod
+    argv = ["-c", mock_config_file, "--status"]
+
+    with patch.object(MozzoNagiosClient, "_get_json", return_value=PROGRAM_STATUS):
+        _frames(socket_path, argv)
+        _frames(socket_path, argv)
+
+    assert len(server.clients.sessions) == 1
+
+
+def test_can_forward_skips_stdin():
+    assert ipc.can_forward(Namespace(bulk=None)) is True
+    assert ipc.can_forward(Namespace(bulk="targets.txt")) is True
+    assert ipc.can_forward(Namespace(bulk="-")) is False
+
+
+def test_output_streamed_in_write_order(mozzod):
+    _, socket_path = mozzod
+
+    def fake_run(argv, client_factory=None):
+        print("first")
+        print("oops", file=sys.stderr)
+        print("second")
+
+    with patch("mozzo.cli.run", side_effect=fake_run):
+        frames = _frames(socket_path, ["--status"])
+
+    assert frames == [
+        {"accepted": True},
+        {"stdout": "first"}, {"stdout": "\n"},
+        {"stderr": "oops"}, {"stderr": "\n"},
+        {"stdout": "second"}, {"stdout": "\n"},
+        {"exit": 0},
+    ]
+
+
+def _one_shot_server(socket_path, accept):
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(socket_path)
+    server.listen(1)
+
+    def serve():
+        conn, _ = server.accept()
+        with conn:
+            conn.makefile("rb").readline()
+            if accept:
+                conn.sendall(b'{"accepted": true}\n{"stdout": "partial"}\n')
+        server.close()
+
+    thread = threading.Thread(target=serve, daemon=True)
+    thread.start()
+    return thread
+
+
+def test_forward_falls_back_before_accept(tmp_path):
+    socket_path = str(tmp_path / "d.sock")
+    thread = _one_shot_server(socket_path, accept=False)
+    assert ipc.forward(["--ack", "--host", "web01"], socket_path=socket_path) is None
+    thread.join()
+
+
+def test_forward_never_falls_back_after_accept(tmp_path, capsys):
+    socket_path = str(tmp_path / "d.sock")
+    thread = _one_shot_server(socket_path, accept=True)
+    assert ipc.forward(["--ack", "--host", "web01"], socket_path=socket_path) == 1
+    thread.join()
+    captured = capsys.readouterr()
+    assert captured.out == "partial"
+    assert "not retrying in-process" in captured.err
+
+
+def test_busy_daemon_falls_back_to_in_process(mozzod):
+    server, socket_path = mozzod
+    with server.run_lock:
+        assert _frames(socket_path, ["--status"]) == [{"busy": True}]
+        assert ipc.forward(["--status"], socket_path=socket_path) is None
+
+
+def test_second_daemon_refuses_live_socket(mozzod):
+    _, socket_path = mozzod
+    with pytest.raises(OSError, match="already running"):
+        daemon.MozzoDaemon(socket_path)
+
+
+def test_stale_socket_is_replaced(tmp_path):
+    socket_path = str(tmp_path / "stale.sock")
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(socket_path)
+    stale.close()
+
+    server = daemon.MozzoDaemon(socket_path)
+    server.server_close()
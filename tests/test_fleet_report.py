@@ -0,0 +1,112 @@
+import json
+from unittest.mock import Mock, patch
+
+import pytest
+
+from mozzo.reports import host_percentages, service_percentages
+
+
+def _response(data, status_code=200):
+    response = Mock()
+    response.status_code = status_code
+    response.json.return_value = {"data": data}
+    return response
+
+
+def test_percentages_match_single_object_math():
+    assert host_percentages({"time_up": 9000, "time_down": 500, "time_unreachable": 500}) == {
+        "percent_up": 90.0,
+        "percent_down": 5.0,
+        "percent_unreachable": 5.0,
+    }
+    assert service_percentages({"time_ok": 3, "time_critical": 1})["percent_critical"] == 25.0
+    assert host_percentages({}) is None
+
+
+def test_fleet_hosts_one_request_per_slice(client):
+    data = {
+        "hostlist": [
+            {"name": "web01", "time_up": 90, "time_down": 10},
+            {"name": "web02", "time_up": 100},
+        ]
+    }
+    with patch.object(client.session, "get", return_value=_response(data)) as mock_get:
+        rows = list(client.fetch_fleet_availability(30))
+
+    # One call per calendar slice, never one per host
+    assert 1 <= mock_get.call_count <= 2
+    for call in mock_get.call_args_list:
+        assert call.kwargs["params"]["availabilityobjecttype"] == "hosts"
+        assert "hostname" not in call.kwargs["params"]
+    assert [row["host"] for row in rows] == ["web01", "web02"]
+    assert rows[0]["percent_down"] == 10.0
+
+
+@pytest.mark.parametrize(
+    "kwargs,object_type,param",
+    [
+        ({"host": "web01"}, "services", ("hostname", "web01")),
+        ({"hostgroup": "linux"}, "hostgroups", ("hostgroup", "linux")),
+        ({"servicegroup": "dns"}, "servicegroups", ("servicegroup", "dns")),
+    ],
+)
+def test_fleet_scope_params(client, kwargs, object_type, param):
+    with patch.object(client.session, "get", return_value=_response({})) as mock_get:
+        assert list(client.fetch_fleet_availability(7, **kwargs)) == []
+
+    params = mock_get.call_args.kwargs["params"]
+    assert params["availabilityobjecttype"] == object_type
+    assert params[param[0]] == param[1]
+
+
+def test_fleet_group_members(client):
+    data = {
+        "servicegroup": {
+            "name": "dns",
+            "services": [
+                {"host_name": "ns1", "description": "DNS", "time_ok": 99, "time_warning": 1},
+                {"host_name": "ns2", "description": "DNS"},
+            ],
+        }
+    }
+    with patch.object(client.session, "get", return_value=_response(data)):
+        rows = list(client.fetch_fleet_availability(7, servicegroup="dns"))
+
+    assert rows[0] == {
+        "host": "ns1",
+        "service": "DNS",
+        "percent_ok": 99.0,
+        "percent_warning": 1.0,
+        "percent_unknown": 0.0,
+        "percent_critical": 0.0,
+    }
+    assert rows[1]["percent_ok"] is None
+
+
+def test_show_fleet_json_matches_dumps(client, capsys):
+    data = {"hostlist": [{"name": "a", "time_up": 1}, {"name": "b", "time_down": 1}]}
+    with patch.object(client.session, "get", return_value=_response(data)):
+        client.show_fleet_availability(30, output_format="json")
+
+    out = capsys.readouterr().out
+    rows = json.loads(out)
+    assert out == json.dumps(rows, indent=2) + "\n"
+    assert [row["host"] for row in rows] == ["a", "b"]
+
+
+def test_show_fleet_csv(client, capsys):
+    data = {"servicelist": [{"host_name": "web01", "description": "HTTP", "time_ok": 1}]}
+    with patch.object(client.session, "get", return_value=_response(data)):
+        client.show_fleet_availability(30, host="web01", output_format="csv")
+
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0] == "host,service,percent_ok,percent_warning,percent_unknown,percent_critical"
+    assert lines[1] == "web01,HTTP,100.0,0.0,0.0,0.0"
+
+
+def test_show_fleet_query_error_exits(client, capsys):
+    with patch.object(client.session, "get", return_value=_response({}, status_code=500)):
+        with pytest.raises(SystemExit):
+            client.show_fleet_availability(30, output_format="csv")
+
+    assert "host,percent_up" not in capsys.readouterr().out
@@ -0,0 +1,121 @@
+from unittest.mock import Mock, patch
+
+import pytest
+
+from mozzo.cli import run
+from mozzo.cmdfile import format_command
+
+
+OK = {"ok": True, "status": "submitted", "error": None, "message": "✅ Command successfully submitted to Nagios."}
+
+
+def test_group_downtime_uses_native_command(client, capsys):
+    with patch.object(client, "_send_cmd", return_value=OK) as mock_send:
+        failed = client.set_downtime_group(hostgroup="rack42", all_services=True)
+
+    assert failed == 0
+    payload = mock_send.call_args.args[0]
+    assert payload["cmd_typ"] == 85
+    assert payload["hostgroup"] == "rack42"
+    assert payload["ahas"] == "on"
+    assert "hosts AND services in hostgroup 'rack42'" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize(
+    "kwargs, cmd_typ",
+    [
+        ({"hostgroup": "rack42"}, 84),
+        ({"servicegroup": "web"}, 122),
+    ],
+)
+def test_group_downtime_command_types(client, kwargs, cmd_typ):
+    assert client._build_group_downtime_payload(**kwargs)["cmd_typ"] == cmd_typ
+
+
+@pytest.mark.parametrize(
+    "kwargs, cmd_typ, key",
+    [
+        ({"hostgroup": "rack42"}, 66, "hostgroup"),
+        ({"servicegroup": "web"}, 110, "servicegroup"),
+    ],
+)
+def test_group_notification_toggle(client, kwargs, cmd_typ, key):
+    with patch.object(client, "_post_cmd") as mock_post:
+        client.toggle_alerts(enable=False, **kwargs)
+
+    payload = mock_post.call_args.args[0]
+    assert payload["cmd_typ"] == cmd_typ
+    assert payload[key] == kwargs[key]
+
+
+@pytest.mark.parametrize("enable, cmd_typs", [(False, [66, 64]), (True, [65, 63])])
+def test_hostgroup_toggle_all_services_covers_hosts_and_services(client, capsys, enable, cmd_typs):
+    with patch.object(client, "_post_cmd") as mock_post:
+        client.toggle_alerts(enable=enable, hostgroup="rack42", all_services=True)
+
+    payloads = [c.args[0] for c in mock_post.call_args_list]
+    assert [p["cmd_typ"] for p in payloads] == cmd_typs
+    assert all(p["hostgroup"] == "rack42" for p in payloads)
+    out = capsys.readouterr().out
+    assert "hosts in hostgroup 'rack42'" in out
+    assert "all services in hostgroup 'rack42'" in out
+
+
+def test_ack_group_resolves_problems_in_one_query_each(client, capsys):
+    hosts = {"data": {"hostlist": {"web03": 4}}}
+    services = [("web01", "HTTP", 16), ("web02", "Disk", 4)]
+    with patch.object(client, "_get_json", return_value=hosts) as mock_get, \
+            patch.object(client, "_iter_services", return_value=iter(services)) as mock_iter, \
+            patch.object(client, "_send_cmd", return_value=OK) as mock_send:
+        failed = client.ack_group(hostgroup="rack42", all_services=True)
+
+    assert failed == 0
+    assert mock_get.call_args.args[0] == {"query": "hostlist", "hostgroup": "rack42", "hoststatus": "down unreachable"}
+    assert mock_iter.call_args.args[0]["hostgroup"] == "rack42"
+    sent = sorted((p["host"], p.get("service")) for p in (c.args[0] for c in mock_send.call_args_list))
+    assert sent == [("web01", "HTTP"), ("web02", "Disk"), ("web03", None)]
+    assert "3 succeeded, 0 failed" in capsys.readouterr().out
+
+
+def test_ack_group_without_problems(client, capsys):
+    with patch.object(client, "_iter_services", return_value=iter([])), \
+            patch.object(client, "_send_cmd") as mock_send:
+        assert client.ack_group(servicegroup="web") == 0
+
+    mock_send.assert_not_called()
+    assert "No problems found in servicegroup 'web'" in capsys.readouterr().out
+
+
+def test_format_group_commands():
+    payload = {
+        "cmd_typ": 85,
+        "hostgroup": "rack42",
+        "fixed": 1,
+        "start_time": 1700000000,
+        "end_time": 1700003600,
+        "ahas": "on",
+    }
+    assert format_command(payload, "admin", "maint", "%s") == [
+        "SCHEDULE_HOSTGROUP_HOST_DOWNTIME;rack42;1700000000;1700003600;1;0;3600;admin;maint",
+        "SCHEDULE_HOSTGROUP_SVC_DOWNTIME;rack42;1700000000;1700003600;1;0;3600;admin;maint",
+    ]
+    assert format_command({"cmd_typ": 110, "servicegroup": "web"}, "admin", "", "%s") == [
+        "DISABLE_SERVICEGROUP_SVC_NOTIFICATIONS;web"
+    ]
+
+
+def test_cli_group_actions_do_not_fall_back_to_global():
+    client = Mock()
+    client.set_downtime_group.return_value = 0
+    run(["--disable-alerts", "--hostgroup", "rack42"], client_factory=lambda **kw: client)
+    run(["--downtime", "--servicegroup", "web"], client_factory=lambda **kw: client)
+
+    assert client.toggle_alerts.call_args.kwargs["hostgroup"] == "rack42"
+    client.set_downtime_group.assert_called_once_with(None, "web", False)
+
+
+def test_cli_group_ack_failure_exits():
+    client = Mock()
+    client.ack_group.return_value = 2
+    with pytest.raises(SystemExit):
+        run(["--ack", "--hostgroup", "rack42"], client_factory=lambda **kw: client)
@@ -0,0 +1,138 @@
+import json
+from unittest.mock import Mock, patch
+
+import pytest
+import requests
+
+from mozzo.cli import run
+
+
+def _page(items, query="alertlist"):
+    response = Mock()
+    response.json.return_value = {"data": {query: items}}
+    return response
+
+
+def _alert(n, state="critical"):
+    return {
+        "timestamp": 1700000000000 + n * 1000,
+        "object_type": "service",
+        "host_name": "web01",
+        "description": "HTTP",
+        "state_type": "hard",
+        "state": state,
+        "plugin_output": f"output {n}",
+    }
+
+
+def test_history_paginates_until_short_page(client):
+    pages = [_page([_alert(0), _alert(1)]), _page([_alert(2), _alert(3)]), _page([_alert(4)])]
+    with patch.object(client.session, "get", side_effect=pages) as mock_get:
+        rows = list(client.iter_history("alertlist", 1, page_size=2))
+
+    assert [row["output"] for row in rows] == [f"output {n}" for n in range(5)]
+    starts = [c.kwargs["params"]["start"] for c in mock_get.call_args_list]
+    assert starts == [0, 2, 4]
+    assert all(c.kwargs["params"]["count"] == 2 for c in mock_get.call_args_list)
+
+
+def test_history_streams_first_page_before_fetching_next(client):
+    with patch.object(client.session, "get", side_effect=[_page([_alert(0)]), _page([])]) as mock_get:
+        rows = client.iter_history("alertlist", 1, page_size=1)
+        next(rows)
+        assert mock_get.call_count == 1
+
+
+def test_history_filters_pushed_to_server(client):
+    params = client._history_params(
+        "alertlist", 7, host="web01", service="HTTP", hostgroup="linux", state="CRITICAL"
+    )
+    assert params["hostname"] == "web01"
+    assert params["servicedescription"] == "HTTP"
+    assert params["hostgroup"] == "linux"
+    assert params["objecttypes"] == "service"
+    assert params["servicestates"] == "critical"
+
+    params = client._history_params("alertlist", 7, state="DOWN")
+    assert params["objecttypes"] == "host"
+    assert params["hoststates"] == "down"
+
+    params = client._history_params("statechangelist", 7, host="web01")
+    assert params["objecttype"] == "host"
+    assert "objecttypes" not in params
+
+
+def test_history_entry_normalized(client):
+    row = client._history_entry({"timestamp": 1700000000000, "object_type": "host", "name": "web01",
+                                 "state": "down", "state_type": "hard", "plugin_output": "PING CRITICAL"})
+    assert row["timestamp"] == 1700000000
+    assert row["host"] == "web01"
+    assert row["service"] == ""
+    assert row["state"] == "DOWN"
+
+
+@pytest.mark.parametrize("output_format", ["json", "ndjson", "csv", "text"])
+def test_show_history_formats(client, capsys, output_format):
+    with patch.object(client.session, "get", return_value=_page([_alert(0), _alert(1)])):
+        client.show_history("alertlist", 1, output_format)
+
+    out = capsys.readouterr().out
+    if output_format == "json":
+        assert [row["output"] for row in json.loads(out)] == ["output 0", "output 1"]
+    elif output_format == "ndjson":
+        assert [json.loads(line)["output"] for line in out.splitlines()] == ["output 0", "output 1"]
+    elif output_format == "csv":
+        lines = out.splitlines()
+        assert lines[0] == "timestamp,time,object_type,host,service,state,state_type,output"
+        assert len(lines) == 3
+    else:
+        assert "SERVICE ALERT: web01;HTTP;CRITICAL;HARD;output 1" in out
+
+
+def test_show_history_error_before_output(client, capsys):
+    with patch.object(client.session, "get", side_effect=requests.exceptions.ConnectionError("boom")):
+        with pytest.raises(SystemExit):
+            client.show_history("alertlist", 1, "csv")
+
+    out = capsys.readouterr().out
+    assert "timestamp,time" not in out
+    assert "❌ Error fetching history" in out
+
+
+def test_cli_state_changes_requires_host(mock_config_file):
+    with pytest.raises(SystemExit):
+        run(["-c", mock_config_file, "--state-changes"])
+
+
+def test_cli_alerts_dispatch(mock_config_file):
+    client = Mock()
+    run(["-c", mock_config_file, "--alerts", "--host", "web01", "--output-filter", "critical",
+         "--format", "ndjson", "--days", "2"], client_factory=lambda **kw: client)
+    client.show_history.assert_called_once_with(
+        "alertlist", 2.0, "ndjson", host="web01", service=None, hostgroup=None,
+        servicegroup=None, state="CRITICAL",
+    )
+
+
+def test_cli_alerts_host_state_filter(mock_config_file, client):
+    with patch.object(client.session, "get", return_value=_page([])) as mock_get:
+        run(["-c", mock_config_file, "--alerts", "--hostgroup", "linux", "--output-filter", "down"],
+            client_factory=lambda **kw: client)
+
+    params = mock_get.call_args.kwargs["params"]
+    assert params["objecttypes"] == "host"
+    assert params["hoststates"] == "down"
+    assert params["hostgroup"] == "linux"
+
+
+def test_state_changes_filtered_by_host_state(client):
+    items = [dict(_alert(0, "down"), object_type="host"), dict(_alert(1, "up"), object_type="host")]
+    with patch.object(client.session, "get", return_value=_page(items, "statechangelist")):
+        rows = list(client.iter_history("statechangelist", 1, host="web01", state="DOWN"))
+
+    assert [row["state"] for row in rows] == ["DOWN"]
+
+
+def test_cli_host_state_filter_needs_history(mock_config_file):
+    with pytest.raises(SystemExit):
+        run(["-c", mock_config_file, "--status", "--output-filter", "DOWN"], client_factory=Mock())
@@ -0,0 +1,84 @@
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from mozzo.jsonstream import iter_servicelist
+
+
+RESPONSE = {
+    "format_version": 0,
+    "result": {"query": "servicelist", "type_code": 0, "message": "Süccess"},
+    "data": {
+        "selectors": {"servicestatus": [4, 16]},
+        "servicelist": {
+            "web01": {
+                "HTTP": {"status": 16, "plugin_output": "HTTP CRITICAL – timeout", "last_check": 1700000000123},
+                "Disk /": {"status": 4, "plugin_output": "DISK WARNING"},
+            },
+            "web02": {},
+            "db01": {"MySQL": {"status": 2, "plugin_output": "Uptime: 12345"}},
+        },
+    },
+}
+
+EXPECTED = [
+    ("web01", "HTTP", RESPONSE["data"]["servicelist"]["web01"]["HTTP"]),
+    ("web01", "Disk /", RESPONSE["data"]["servicelist"]["web01"]["Disk /"]),
+    ("db01", "MySQL", RESPONSE["data"]["servicelist"]["db01"]["MySQL"]),
+]
+
+
+def _chunks(data, size, indent=None):
+    body = json.dumps(data, indent=indent, ensure_ascii=False).encode("utf-8")
+    return [body[i:i + size] for i in range(0, len(body), size)]
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 5, 64, 1 << 20])
+@pytest.mark.parametrize("indent", [None, 2])
+def test_iter_servicelist_any_chunking(size, indent):
+    # Chunk boundaries split keys, numbers and multi-byte characters
+    assert list(iter_servicelist(_chunks(RESPONSE, size, indent))) == EXPECTED
+
+
+def test_iter_servicelist_status_codes_only():
+    response = {"data": {"servicelist": {"web01": {"HTTP": 16, "DNS": 2}}}}
+    assert list(iter_servicelist(_chunks(response, 1))) == [("web01", "HTTP", 16), ("web01", "DNS", 2)]
+
+
+def test_iter_servicelist_without_servicelist():
+    assert list(iter_servicelist(_chunks({"result": {}, "data": {}}, 4))) == []
+
+
+@pytest.mark.parametrize("body", [b'{"data": {"servicelist": {"web01": {"HTTP": 1', b'{"data": [1]}', b"<html>"])
+def test_iter_servicelist_rejects_malformed(body):
+    with pytest.raises(ValueError):
+        list(iter_servicelist([body]))
+
+
+def test_iter_servicelist_is_lazy():
+    chunks = iter(_chunks(RESPONSE, 16))
+    records = iter_servicelist(chunks)
+    assert next(records)[:2] == ("web01", "HTTP")
+    # The rest of the body has not been read yet
+    assert next(chunks, None) is not None
+
+
+def test_single_service_streams_json_output(client, capsys):
+    response = {"data": {"servicelist": {
+        "web01": {"DNS": {"status": 4, "plugin_output": "slow"}},
+        "web02": {"DNS": {"status": 2, "plugin_output": "ok"}},
+    }}}
+    streamed = MagicMock()
+    streamed.__enter__.return_value = streamed
+    streamed.iter_content.return_value = _chunks(response, 9)
+
+    with patch.object(client.session, "get", return_value=streamed) as mock_get:
+        client.show_single_service("DNS", output_format="json")
+
+    assert mock_get.call_args.kwargs["stream"] is True
+    expected = [
+        client._build_service_result(host, "DNS", services["DNS"])
+        for host, services in response["data"]["servicelist"].items()
+    ]
+    assert capsys.readouterr().out == json.dumps(expected, indent=2) + "\n"
@@ -0,0 +1,168 @@
+import json
+import socket
+import threading
+
+import pytest
+
+from mozzo.livestatus import LivestatusBackend
+from mozzo.status import StatusSourceError
+
+
+SERVICE_ROW = {
+    "host_name": "web01",
+    "description": "HTTP",
+    "state": 2,
+    "has_been_checked": 1,
+    "state_type": 1,
+    "current_attempt": 3,
+    "plugin_output": "HTTP CRITICAL",
+    "long_plugin_output": "",
+    "last_check": 1700000000,
+    "last_state_change": 1690000000,
+    "acknowledged": 0,
+    "scheduled_downtime_depth": 0,
+    "notifications_enabled": 1,
+}
+
+
+class FakeLivestatus:
+    """Minimal Livestatus stand-in serving canned rows over a UNIX socket."""
+
+    def __init__(self, path, rows_by_table, status=200):
+        self.path = path
+        self.rows_by_table = rows_by_table
+        self.status = status
+        self.requests = []
+        self.server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.server.bind(path)
+        self.server.listen(5)
+        self.thread = threading.Thread(target=self._serve, daemon=True)
+        self.thread.start()
+
+    def _serve(self):
+        while True:
+            try:
+                conn, _ = self.server.accept()
+            except OSError:
+                return
+            with conn:
+                data = b""
+                while not data.endswith(b"\n\n"):
+                    chunk = conn.recv(4096)
+                    if not chunk:
+                        break
+                    data += chunk
+                request = data.decode("utf-8")
+                self.requests.append(request)
+                lines = request.splitlines()
+                table = lines[0].split()[1]
+                columns = lines[1].split(":", 1)[1].split()
+                if self.status != 200:
+                    body = b"Invalid query"
+                else:
+                    rows = [[row.get(c) for c in columns] for row in self.rows_by_table.get(table, [])]
+                    body = json.dumps(rows).encode("utf-8")
+                header = f"{self.status:<3} {len(body):>11}\n".encode("utf-8")
+                conn.sendall(header + body)
+
+    def close(self):
+        self.server.close()
+
+
+@pytest.fixture
+def livestatus(tmp_path):
+    servers = []
+
+    def start(rows_by_table, status=200):
+        server = FakeLivestatus(str(tmp_path / "live"), rows_by_table, status)
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.close()
+
+
+def test_servicelist_pushes_filters(livestatus):
+    server = livestatus({"services": [SERVICE_ROW]})
+    backend = LivestatusBackend(server.path)
+
+    response = backend.get_json(
+        "query=servicelist&details=true&servicestatus=warning+critical+unknown"
+    )
+
+    record = response["data"]["servicelist"]["web01"]["HTTP"]
+    assert record["status"] == 16
+    assert record["plugin_output"] == "HTTP CRITICAL"
+    assert record["last_state_change"] == 1690000000000
+    assert record["problem_has_been_acknowledged"] is False
+
+    request = server.requests[0]
+    assert request.startswith("GET services\n")
+    assert "Filter: state = 1" in request
+    assert "Filter: state = 2" in request
+    assert "Filter: state = 3" in request
+    assert "Or: 3" in request
+
+
+def test_servicelist_without_details(livestatus):
+    server = livestatus({"services": [SERVICE_ROW]})
+    backend = LivestatusBackend(server.path)
+
+    response = backend.get_json({"query": "servicelist", "hostname": "web01"})
+
+    assert response["data"]["servicelist"] == {"web01": {"HTTP": 16}}
+    assert "Filter: host_name = web01" in server.requests[0]
+
+
+def test_host_query(livestatus):
+    server = livestatus({"hosts": [{
+        "name": "web01", "state": 0, "has_been_checked": 1, "last_state_change": 1,
+        "last_check": 1, "acknowledged": 1, "scheduled_downtime_depth": 0,
+        "notifications_enabled": 1,
+    }]})
+    backend = LivestatusBackend(server.path)
+
+    host = backend.get_json({"query": "host", "hostname": "web01"})["data"]["host"]
+    assert host["status"] == 2
+    assert host["problem_has_been_acknowledged"] is True
+    assert "Filter: name = web01" in server.requests[0]
+
+
+def test_error_response(livestatus):
+    server = livestatus({}, status=400)
+    backend = LivestatusBackend(server.path)
+
+    with pytest.raises(StatusSourceError, match="400"):
+        backend.get_json({"query": "programstatus"})
+
+
+def test_client_uses_livestatus_backend(client, livestatus, capsys):
+    server = livestatus({
+        "status": [{
+            "enable_notifications": 1, "execute_service_checks": 1,
+            "execute_host_checks": 0, "enable_event_handlers": 1, "program_start": 1,
+        }],
+    })
+    client.status_source = LivestatusBackend(server.path)
+
+    client.show_status()
+
+    captured = capsys.readouterr()
+    assert "Notifications Enabled    : ✅ ENABLED" in captured.out
+    assert "Active Host Checks       : ❌ DISABLED" in captured.out
+
+
+def test_client_falls_back_for_unsupported_query(client, livestatus):
+    from unittest.mock import Mock, patch
+
+    server = livestatus({})
+    client.status_source = LivestatusBackend(server.path)
+    mock_response = Mock()
+    mock_response.json.return_value = {"data": {"commentlist": {}}}
+
+    with patch.object(client.session, "get", return_value=mock_response) as mock_get:
+        client._get_json({"query": "commentlist", "details": "true"})
+
+    assert mock_get.called
+    assert server.requests == []
@@ -0,0 +1,93 @@
+import argparse
+from unittest.mock import Mock, patch
+
+import requests
+
+from mozzo import ipc
+from mozzo.logs import LogCursor, _log_epoch
+
+
+def _page(*lines):
+    # showlog.cgi lists newest first
+    response = Mock()
+    response.text = "\n".join(f"<div>[{ts}] {message}</div>" for ts, message in reversed(lines))
+    return response
+
+
+FIRST = ("04-29-2026 17:30:00", "SERVICE ALERT: web01;HTTP;CRITICAL;HARD;3;down")
+SECOND = ("04-29-2026 17:30:00", "SERVICE ALERT: web01;DNS;WARNING;HARD;3;slow")
+THIRD = ("04-29-2026 17:31:00", "SERVICE ALERT: web01;HTTP;OK;HARD;1;up")
+DUMP = ("04-29-2026 17:31:00", "CURRENT HOST STATE: web01;UP;HARD;1;PING OK")
+
+
+def test_cursor_round_trip(tmp_path):
+    cursor = LogCursor(str(tmp_path / "state" / "cursor.json"))
+    cursor.advance(100, "a")
+    cursor.advance(100, "b")
+    cursor.save()
+
+    loaded = LogCursor(cursor.path).load()
+    assert loaded.timestamp == 100
+    assert not loaded.is_new(100, "a")
+    assert loaded.is_new(100, "c")
+    assert not loaded.is_new(99, "z")
+    assert loaded.is_new(101, "a")
+
+
+def test_since_last_emits_only_new_entries(client, capsys):
+    with patch.object(client.session, "get", return_value=_page(FIRST)):
+        client.show_logs_since_last()
+    assert capsys.readouterr().out.count("SERVICE ALERT") == 1
+
+    # Same-second entry plus a later one; FIRST is not repeated
+    with patch.object(client.session, "get", return_value=_page(FIRST, SECOND, THIRD)) as mock_get:
+        client.show_logs_since_last()
+
+    lines = capsys.readouterr().out.splitlines()
+    assert [line.split("] ", 1)[1] for line in lines] == [SECOND[1], THIRD[1]]
+    # Only the window since the cursor is requested
+    assert mock_get.call_args.kwargs["params"]["ts_start"] == _log_epoch(FIRST[0])
+
+
+def test_since_last_nothing_new_prints_nothing(client, capsys):
+    with patch.object(client.session, "get", return_value=_page(FIRST)):
+        client.show_logs_since_last()
+        capsys.readouterr()
+        client.show_logs_since_last()
+
+    assert capsys.readouterr().out == ""
+
+
+def test_since_last_hides_state_dumps_but_advances(client, capsys):
+    with patch.object(client.session, "get", return_value=_page(THIRD, DUMP)):
+        client.show_logs_since_last()
+    assert "CURRENT HOST STATE" not in capsys.readouterr().out
+
+    with patch.object(client.session, "get", return_value=_page(THIRD, DUMP)):
+        client.show_logs_since_last(full=True)
+    assert capsys.readouterr().out == ""
+
+
+def test_follow_polls_with_backoff(client, capsys):
+    client.config["log_poll_interval"] = 5
+    client.config["log_poll_max_interval"] = 15
+    responses = [
+        _page(FIRST),
+        _page(FIRST),
+        requests.exceptions.ConnectionError("down"),
+        _page(FIRST, THIRD),
+        _page(FIRST, THIRD),
+    ]
+    with patch.object(client.session, "get", side_effect=responses), \
+            patch("mozzo.logs.time.sleep") as mock_sleep:
+        client.follow_logs(polls=5)
+
+    assert [c.args[0] for c in mock_sleep.call_args_list] == [5, 10, 15, 5]
+    captured = capsys.readouterr()
+    assert captured.out.count("SERVICE ALERT") == 2
+    assert "retrying in 15s" in captured.err
+
+
+def test_follow_is_not_forwarded_to_daemon():
+    assert ipc.can_forward(argparse.Namespace(bulk=None, follow=False))
+    assert not ipc.can_forward(argparse.Namespace(bulk=None, follow=True))
@@ -0,0 +1,95 @@
+import datetime
+import json
+import mmap
+import os
+from unittest.mock import patch
+
+import pytest
+
+from mozzo.nagioslog import LocalLogSource, seek_time
+
+
+def _write_log(path, start, count, step=10):
+    lines = [f"[{start + i * step}] SERVICE ALERT: web01;svc{i};OK;HARD;1;ok {i}\n" for i in range(count)]
+    path.write_text("".join(lines))
+
+
+@pytest.mark.parametrize("target", [0, 1000, 1005, 1010, 1500, 1990, 2000, 5000])
+def test_seek_time_finds_first_line_at_or_after(tmp_path, target):
+    path = tmp_path / "nagios.log"
+    _write_log(path, 1000, 100)
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        pos = seek_time(mm, target)
+        expected = next((i for i, line in enumerate(mm[:].split(b"\n")) if line and int(line[1:5]) >= target), None)
+        if expected is None:
+            assert pos == len(mm)
+        else:
+            assert mm[pos:].split(b"\n", 1)[0] == mm[:].split(b"\n")[expected]
+
+
+def test_seek_time_skips_lines_without_timestamp(tmp_path):
+    path = tmp_path / "nagios.log"
+    path.write_text("[100] a\ncontinuation\n[200] b\n[300] c\n")
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        assert mm[seek_time(mm, 150):].startswith(b"[200] b")
+        assert mm[seek_time(mm, 100):].startswith(b"[100] a")
+
+
+def test_entries_across_archives_newest_first(tmp_path):
+    archives = tmp_path / "archives"
+    archives.mkdir()
+    _write_log(archives / "nagios-01-01-2025-00.log", 1000, 10)
+    _write_log(archives / "nagios-01-02-2025-00.log", 1100, 10)
+    _write_log(tmp_path / "nagios.log", 1200, 10)
+
+    source = LocalLogSource(str(tmp_path / "nagios.log"), str(archives), str(tmp_path / "cache"))
+    entries = source.entries(1080, 1210)
+    assert [epoch for epoch, _ in entries] == list(range(1210, 1079, -10))
+    assert entries[0][1] == "SERVICE ALERT: web01;svc1;OK;HARD;1;ok 1"
+
+
+def test_index_skips_files_outside_window(tmp_path):
+    archives = tmp_path / "archives"
+    archives.mkdir()
+    old = archives / "nagios-01-01-2025-00.log"
+    _write_log(old, 1000, 10)
+    _write_log(tmp_path / "nagios.log", 5000, 10)
+    source = LocalLogSource(str(tmp_path / "nagios.log"), str(archives), str(tmp_path / "cache"))
+
+    source.entries(5000, 6000)
+    with open(tmp_path / "cache" / "log-index.json") as f:
+        index = json.load(f)["files"]
+    assert index[str(old)]["first"] == 1000
+    assert index[str(old)]["last"] == 1090
+
+    opened = []
+    real_open = open
+
+    def tracking_open(path, *args, **kwargs):
+        opened.append(os.path.basename(str(path)))
+        return real_open(path, *args, **kwargs)
+
+    with patch("builtins.open", side_effect=tracking_open):
+        assert len(source.entries(5000, 6000)) == 10
+    assert "nagios-01-01-2025-00.log" not in opened
+
+
+def test_show_logs_local_backend(client, tmp_path, capsys):
+    from mozzo.nagioslog import LocalLogSource
+
+    now = int(datetime.datetime.now().timestamp())
+    (tmp_path / "nagios.log").write_text(
+        f"[{now - 7200}] SERVICE ALERT: web01;HTTP;CRITICAL;HARD;3;too old\n"
+        f"[{now - 60}] CURRENT HOST STATE: web01;UP;HARD;1;PING OK\n"
+        f"[{now - 30}] SERVICE ALERT: web01;HTTP;CRITICAL;HARD;3;down\n"
+    )
+    client.log_source = LocalLogSource(str(tmp_path / "nagios.log"), str(tmp_path / "archives"))
+
+    with patch.object(client.session, "get") as mock_get:
+        client.show_logs(days=1 / 24)
+
+    mock_get.assert_not_called()
+    out = capsys.readouterr().out
+    assert "❌ [" in out and "SERVICE ALERT: web01;HTTP;CRITICAL;HARD;3;down" in out
+    assert "too old" not in out
+    assert "CURRENT HOST STATE" not in out
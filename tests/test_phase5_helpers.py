@@ -120,3 +120,19 @@ def test_print_uptime_report_no_availability(client, capsys):
     assert "Status & Uptime" in captured.out
     assert "Availability Report" in captured.out
     assert "95.500%" not in captured.out
+
+
+def test_print_uptime_report_ndjson(client, capsys):
+    report_data = {
+        "host": "web01",
+        "status": "UP",
+        "availability_days": 365,
+        "percent_up": 99.9,
+    }
+
+    client._print_uptime_report(report_data, "ndjson", is_host=True)
+    captured = capsys.readouterr()
+
+    lines = captured.out.splitlines()
+    assert len(lines) == 1
+    assert json.loads(lines[0]) == report_data
@@ -0,0 +1,122 @@
+from unittest.mock import Mock, patch
+
+from mozzo.cli import run
+
+
+def _services(host_services):
+    return {"data": {"servicelist": host_services}}
+
+
+def _records(response):
+    def iter_services(params):
+        for host, services in response["data"]["servicelist"].items():
+            for service, details in services.items():
+                yield host, service, details
+    return iter_services
+
+
+def test_host_services_pushes_filters(client, capsys):
+    response = _services({"web01": {"HTTP": {"status": 16, "plugin_output": "down"}}})
+    with patch.object(client, "_iter_services", side_effect=_records(response)) as mock_get:
+        client.show_host_services("web01", "HTTP", output_filter="CRITICAL", hostgroup="linux")
+
+    params = mock_get.call_args.args[0]
+    assert params == {
+        "query": "servicelist",
+        "details": "true",
+        "hostname": "web01",
+        "servicedescription": "HTTP",
+        "servicestatus": "critical",
+        "hostgroup": "linux",
+    }
+    assert "HTTP" in capsys.readouterr().out
+
+
+def test_host_services_without_filters_fetches_host_only(client):
+    with patch.object(client, "_iter_services", side_effect=_records(_services({}))) as mock_get:
+        client.show_host_services("web01")
+
+    params = mock_get.call_args.args[0]
+    assert params == {"query": "servicelist", "details": "true", "hostname": "web01"}
+
+
+def test_single_service_pushes_filters(client, capsys):
+    response = _services({
+        "web01": {"DNS": {"status": 4}},
+        "web02": {"DNS": {"status": 4}},
+    })
+    with patch.object(client, "_iter_services", side_effect=_records(response)) as mock_iter:
+        client.show_single_service("DNS", output_filter="WARNING", servicegroup="dns", output_format="csv")
+
+    params = mock_iter.call_args.args[0]
+    assert params["servicedescription"] == "DNS"
+    assert params["servicestatus"] == "warning"
+    assert params["servicegroup"] == "dns"
+    assert "hostname" not in params
+    assert capsys.readouterr().out.splitlines()[1:] == ["web01,DNS,4,⚠️  WARNING", "web02,DNS,4,⚠️  WARNING"]
+
+
+def test_filter_miss_reports_filter(client, capsys):
+    with patch.object(client, "_iter_services", side_effect=_records(_services({}))):
+        client.show_single_service("DNS", output_filter="CRITICAL")
+
+    assert "using the specified filter 'CRITICAL'" in capsys.readouterr().err
+
+
+def test_debug_query_reports_pushed_predicates(client, capsys):
+    client.debug_query = True
+    with patch.object(client, "_iter_services", side_effect=_records(_services({}))):
+        client.show_host_services("web01", output_filter="OK")
+
+    err = capsys.readouterr().err
+    assert "servicelist via statusjson, server-side: hostname=web01, servicestatus=ok" in err
+    assert "checked in Python: hostname, servicestatus" in err
+
+
+def test_rows_ignoring_pushed_filters_are_dropped(client, capsys):
+    client.debug_query = True
+    # A source that ignored servicestatus and hostgroup
+    response = _services({
+        "web01": {
+            "HTTP": {"status": 16, "host_groups": ["linux"]},
+            "SSH": {"status": 2, "host_groups": ["linux"]},
+            "NTP": {"status": 16, "host_groups": ["windows"]},
+        },
+        "web02": {"HTTP": {"status": 16}},
+    })
+    with patch.object(client, "_iter_services", side_effect=_records(response)):
+        client.show_host_services("web01", output_filter="CRITICAL", hostgroup="linux", output_format="csv")
+
+    captured = capsys.readouterr()
+    assert captured.out.splitlines()[1:] == ["web01,HTTP,16,❌ CRITICAL"]
+    assert "checked in Python: hostname, servicestatus, hostgroup; 3 non-matching row(s) dropped" in captured.err
+
+
+def test_status_backend_applies_pushed_filters(client, tmp_path):
+    from mozzo.statusdat import StatusDatBackend
+
+    status = tmp_path / "status.dat"
+    status.write_text(
+        "servicestatus {\n\thost_name=web01\n\tservice_description=HTTP\n\tcurrent_state=2\n\thas_been_checked=1\n}\n"
+        "servicestatus {\n\thost_name=web01\n\tservice_description=SSH\n\tcurrent_state=0\n\thas_been_checked=1\n}\n"
+    )
+    client.status_source = StatusDatBackend(str(status))
+    data = client._get_json(client._service_list_params("web01", output_filter="CRITICAL"))
+    assert list(data["data"]["servicelist"]["web01"]) == ["HTTP"]
+
+
+def test_cli_passes_groups_and_debug(mock_config_file):
+    created = {}
+
+    def factory(**kwargs):
+        created.update(kwargs)
+        return client
+
+    client = Mock()
+    run(["-c", mock_config_file, "--status", "--service", "DNS", "--hostgroup", "linux", "--debug-query"],
+        client_factory=factory)
+
+    assert created["debug_query"] is True
+    client.show_single_service.assert_called_once_with(
+        "DNS", False, None, "text", hostgroup="linux", servicegroup=None
+    )
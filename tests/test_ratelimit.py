@@ -0,0 +1,133 @@
+import threading
+import time
+from unittest.mock import Mock, patch
+
+import requests
+
+from mozzo.ratelimit import AdaptiveLimiter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _run(limiter, clock, latency, overloaded=False):
+    start = limiter.acquire()
+    clock.now += latency
+    limiter.release(start, overloaded)
+
+
+def test_additive_increase_while_latency_is_flat():
+    clock = FakeClock()
+    limiter = AdaptiveLimiter(max_concurrency=8, clock=clock)
+    assert limiter.limit == 2
+    for _ in range(40):
+        _run(limiter, clock, 0.1)
+    assert limiter.limit == 8
+
+
+def test_multiplicative_decrease_on_overload():
+    clock = FakeClock()
+    limiter = AdaptiveLimiter(max_concurrency=8, clock=clock)
+    limiter.limit = 8.0
+    _run(limiter, clock, 0.1, overloaded=True)
+    assert limiter.limit == 4
+
+
+def test_rising_latency_counts_as_overload():
+    clock = FakeClock()
+    limiter = AdaptiveLimiter(max_concurrency=8, clock=clock)
+    limiter.limit = 8.0
+    _run(limiter, clock, 0.2)
+    _run(limiter, clock, 0.3)
+    assert limiter.overloads == 0
+    _run(limiter, clock, 1.0)
+    assert limiter.overloads == 1
+    assert limiter.limit < 8
+
+
+def test_decrease_at_most_once_per_round():
+    clock = FakeClock()
+    limiter = AdaptiveLimiter(max_concurrency=8, clock=clock)
+    limiter.limit = 8.0
+    starts = [limiter.acquire() for _ in range(3)]
+    clock.now += 0.1
+    for start in starts:
+        limiter.release(start, overloaded=True)
+    assert limiter.limit == 4
+    assert limiter.overloads == 3
+
+
+def test_limit_bounds_commands_in_flight():
+    limiter = AdaptiveLimiter(max_concurrency=4)
+    limiter.limit = 2.0
+    in_flight = []
+    peak = []
+    lock = threading.Lock()
+
+    def work():
+        start = limiter.acquire()
+        with lock:
+            in_flight.append(1)
+            peak.append(len(in_flight))
+        time.sleep(0.01)
+        with lock:
+            in_flight.pop()
+        # Keep the limit pinned for the test
+        limiter.release(start, overloaded=False)
+        limiter.limit = 2.0
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert max(peak) <= 2
+
+
+def test_stats_report_throughput():
+    clock = FakeClock()
+    limiter = AdaptiveLimiter(max_concurrency=2, clock=clock)
+    for _ in range(4):
+        _run(limiter, clock, 0.5)
+    stats = limiter.stats()
+    assert stats["commands"] == 4
+    assert stats["elapsed"] == 2.0
+    assert stats["rate"] == 2.0
+
+
+def test_send_cmd_reports_5xx_as_overload(client):
+    response = Mock()
+    error = requests.exceptions.HTTPError("503 Service Unavailable", response=Mock(status_code=503))
+    response.raise_for_status.side_effect = error
+    response.iter_content.return_value = []
+    client.cmd_limiter = Mock()
+    with patch.object(client.session, "post", return_value=response):
+        result = client._send_cmd({"cmd_typ": 33, "host": "web01"})
+
+    assert result["status"] == "http_error"
+    assert client.cmd_limiter.release.call_args.args[1] is True
+
+
+def test_send_cmd_reports_timeout_as_overload(client):
+    client.cmd_limiter = Mock()
+    with patch.object(client.session, "post", side_effect=requests.exceptions.ReadTimeout("slow")):
+        client._send_cmd({"cmd_typ": 33, "host": "web01"})
+
+    assert client.cmd_limiter.release.call_args.args[1] is True
+
+
+def test_bulk_submit_prints_throughput(client, capsys):
+    response = Mock()
+    response.encoding = "utf-8"
+    response.iter_content.return_value = [b"successfully submitted"]
+    with patch.object(client.session, "post", return_value=response):
+        client.bulk_submit([("web01", None), ("web02", None), ("web03", "HTTP")], action="ack")
+
+    out = capsys.readouterr().out
+    assert "3 succeeded, 0 failed" in out
+    assert "Throughput: 3 commands in" in out
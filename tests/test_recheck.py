@@ -0,0 +1,104 @@
+import datetime
+from unittest.mock import Mock, patch
+
+import pytest
+
+from mozzo.cli import run
+from mozzo.cmdfile import format_command
+from mozzo.ratelimit import RateLimiter
+
+
+OK = {"ok": True, "status": "submitted", "error": None, "message": "✅ Command successfully submitted to Nagios."}
+
+
+def _epoch(client, payload):
+    return datetime.datetime.strptime(payload["start_time"], client.date_format).timestamp()
+
+
+def test_rechecks_are_staggered_over_window(client, capsys):
+    targets = [("web01", None)] + [("web01", f"svc{i}") for i in range(9)]
+    with patch.object(client, "_send_cmds", side_effect=lambda payloads: [OK] * len(payloads)) as mock_send:
+        failed = client.schedule_rechecks(targets, window=100)
+
+    assert failed == 0
+    payloads = mock_send.call_args.args[0]
+    assert [p["cmd_typ"] for p in payloads] == [96] + [7] * 9
+    assert all(p["force_check"] == "on" for p in payloads)
+    times = [_epoch(client, p) for p in payloads]
+    assert times == sorted(times)
+    assert 85 <= times[-1] - times[0] <= 95
+    assert "10 forced recheck(s) over 100s" in capsys.readouterr().out
+
+
+def test_recheck_all_services(client):
+    services = {"HTTP": 2, "DNS": 16}
+    with patch.object(client, "_get_service_names", return_value=services), \
+            patch.object(client, "schedule_rechecks", return_value=0) as mock_schedule:
+        client.recheck("web01", all_services=True)
+
+    assert mock_schedule.call_args.args[0] == [("web01", None), ("web01", "HTTP"), ("web01", "DNS")]
+
+
+def test_recheck_service_issues(client):
+    issues = [("web01", "HTTP", 16), ("db01", "MySQL", 4)]
+    with patch.object(client, "_iter_services", return_value=iter(issues)) as mock_iter, \
+            patch.object(client, "schedule_rechecks", return_value=0) as mock_schedule:
+        client.recheck_service_issues(window=30)
+
+    assert mock_iter.call_args.args[0]["servicestatus"] == "warning critical unknown"
+    mock_schedule.assert_called_once_with([("web01", "HTTP"), ("db01", "MySQL")], 30)
+
+
+def test_format_forced_checks():
+    assert format_command(
+        {"cmd_typ": 7, "host": "web01", "service": "HTTP", "start_time": 1700000000, "force_check": "on"},
+        "admin", "", "%s",
+    ) == ["SCHEDULE_FORCED_SVC_CHECK;web01;HTTP;1700000000"]
+    assert format_command(
+        {"cmd_typ": 96, "host": "web01", "start_time": 1700000000}, "admin", "", "%s"
+    ) == ["SCHEDULE_HOST_CHECK;web01;1700000000"]
+
+
+def test_rate_limiter_spaces_calls():
+    now = [0.0]
+    sleeps = []
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    limiter = RateLimiter(4, clock=lambda: now[0], sleep=sleep)
+    for _ in range(3):
+        limiter.acquire()
+    assert sleeps == [0.25, 0.25]
+
+
+def test_rate_limiter_disabled():
+    sleep = Mock()
+    limiter = RateLimiter(None, sleep=sleep)
+    limiter.acquire()
+    limiter.acquire()
+    sleep.assert_not_called()
+
+
+def test_send_cmd_goes_through_limiter(client):
+    client.cmd_limiter = Mock()
+    response = Mock()
+    response.encoding = "utf-8"
+    response.iter_content.return_value = [b"successfully submitted"]
+    with patch.object(client.session, "post", return_value=response):
+        assert client._send_cmd({"cmd_typ": 96, "host": "web01"})["ok"]
+    client.cmd_limiter.acquire.assert_called_once()
+
+
+def test_cli_recheck_requires_target():
+    with pytest.raises(SystemExit):
+        run(["--recheck"], client_factory=Mock())
+
+
+def test_cli_recheck_service_issues():
+    client = Mock()
+    client.recheck_service_issues.return_value = 0
+    run(["--recheck", "--service-issues", "--recheck-window", "60"], client_factory=lambda **kw: client)
+    client.recheck_service_issues.assert_called_once_with(None, window=60.0)
+    client.show_service_issues.assert_not_called()
@@ -14,7 +14,7 @@ def test_status_maps_exist(client):
 
 
 def test_config_loading(mock_config_file):
-    from mozzo.cli import MozzoNagiosClient
+    from mozzo.client import MozzoNagiosClient
     client = MozzoNagiosClient(config_path=mock_config_file)
     assert client.auth == ('testuser', 'testpass')
     assert client.verify_ssl is False
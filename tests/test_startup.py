@@ -0,0 +1,60 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../src"))
+
+# Modules that must never load just to parse arguments
+HEAVY_MODULES = ("requests", "urllib3", "yaml", "csv", "json")
+
+# Cumulative import budget for mozzo.cli in microseconds (python -X importtime)
+IMPORT_BUDGET_US = 100000
+
+
+def _importtime(code, tmp_path):
+    env = dict(os.environ, PYTHONPATH=SRC_DIR)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=str(tmp_path),
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+    )
+    timings = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        timings[name] = int(cumulative)
+    return result, timings
+
+
+@pytest.mark.parametrize("flag", ["--version", "--help"])
+def test_version_and_help_skip_heavy_imports(flag, tmp_path):
+    code = f"import sys; sys.argv = ['mozzo', '{flag}']; from mozzo.cli import main; main()"
+    result, timings = _importtime(code, tmp_path)
+
+    assert result.returncode == 0
+    assert "mozzo" in result.stdout
+    loaded = [name for name in timings if name.split(".")[0] in HEAVY_MODULES]
+    assert loaded == []
+
+
+def test_cli_import_time_budget(tmp_path):
+    result, timings = _importtime("import mozzo.cli", tmp_path)
+
+    assert result.returncode == 0
+    assert timings["mozzo.cli"] < IMPORT_BUDGET_US, (
+        f"mozzo.cli import took {timings['mozzo.cli']}us "
+        f"(budget {IMPORT_BUDGET_US}us)"
+    )
+
+
+def test_cli_backwards_compatible_client_import():
+    from mozzo.cli import MozzoNagiosClient
+    from mozzo.client import MozzoNagiosClient as Client
+
+    assert MozzoNagiosClient is Client
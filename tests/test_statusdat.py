@@ -0,0 +1,193 @@
+import os
+from unittest.mock import patch
+
+from mozzo import statusdat
+from mozzo.statusdat import StatusDatBackend
+
+
+STATUS_DAT = """########################################
+#          NAGIOS STATUS FILE
+########################################
+
+info {
+\tcreated=1700000000
+\tversion=4.4.14
+\t}
+
+programstatus {
+\tnagios_pid=1234
+\tprogram_start=1690000000
+\tenable_notifications=1
+\tactive_service_checks_enabled=1
+\tactive_host_checks_enabled=0
+\tenable_event_handlers=1
+\t}
+
+hoststatus {
+\thost_name=web01
+\thas_been_checked=1
+\tcurrent_state=0
+\tplugin_output=PING OK
+\tlong_plugin_output=
+\tlast_state_change=1690000000
+\tproblem_has_been_acknowledged=0
+\tscheduled_downtime_depth=0
+\tnotifications_enabled=1
+\t}
+
+hoststatus {
+\thost_name=db01
+\thas_been_checked=1
+\tcurrent_state=1
+\tplugin_output=PING CRITICAL
+\tproblem_has_been_acknowledged=1
+\tscheduled_downtime_depth=0
+\tnotifications_enabled=1
+\t}
+
+servicestatus {
+\thost_name=web01
+\tservice_description=HTTP
+\thas_been_checked=1
+\tcurrent_state=2
+\tplugin_output=HTTP CRITICAL - a=b
+\tlong_plugin_output=line1\\nline2
+\tlast_state_change=1690000000
+\tproblem_has_been_acknowledged=0
+\tscheduled_downtime_depth=0
+\tnotifications_enabled=1
+\t}
+
+servicestatus {
+\thost_name=web01
+\tservice_description=SSH
+\thas_been_checked=1
+\tcurrent_state=0
+\tplugin_output=SSH OK
+\t}
+
+servicestatus {
+\thost_name=db01
+\tservice_description=MySQL
+\thas_been_checked=0
+\tcurrent_state=0
+\tplugin_output=
+\t}
+
+contactstatus {
+\tcontact_name=nagiosadmin
+\t}
+"""
+
+OBJECTS_CACHE = """define hostgroup {
+\thostgroup_name\tweb-servers
+\tmembers\tweb01
+\t}
+
+define servicegroup {
+\tservicegroup_name\tdatabases
+\tmembers\tdb01,MySQL
+\t}
+"""
+
+
+def _backend(tmp_path, cache=True):
+    status_file = tmp_path / "status.dat"
+    status_file.write_text(STATUS_DAT)
+    objects_cache = tmp_path / "objects.cache"
+    objects_cache.write_text(OBJECTS_CACHE)
+    return StatusDatBackend(
+        str(status_file),
+        objects_cache=str(objects_cache),
+        cache_dir=str(tmp_path / "cache") if cache else None,
+    )
+
+
+def test_servicelist_details(tmp_path):
+    backend = _backend(tmp_path)
+    data = backend.get_json(
+        "query=servicelist&details=true&servicestatus=warning+critical+unknown"
+    )["data"]["servicelist"]
+
+    assert list(data) == ["web01"]
+    http = data["web01"]["HTTP"]
+    assert http["status"] == 16
+    assert http["plugin_output"] == "HTTP CRITICAL - a=b"
+    assert http["long_plugin_output"] == "line1\nline2"
+    assert http["last_state_change"] == 1690000000000
+
+
+def test_servicelist_without_details_and_pending(tmp_path):
+    backend = _backend(tmp_path)
+    data = backend.get_json({"query": "servicelist"})["data"]["servicelist"]
+    assert data == {"web01": {"HTTP": 16, "SSH": 2}, "db01": {"MySQL": 1}}
+
+
+def test_host_and_hostlist(tmp_path):
+    backend = _backend(tmp_path)
+    host = backend.get_json({"query": "host", "hostname": "db01"})["data"]["host"]
+    assert host["status"] == 4
+    assert host["problem_has_been_acknowledged"] is True
+
+    hostlist = backend.get_json({"query": "hostlist"})["data"]["hostlist"]
+    assert hostlist == {"web01": 2, "db01": 4}
+
+
+def test_programstatus(tmp_path):
+    backend = _backend(tmp_path)
+    prog = backend.get_json({"query": "programstatus"})["data"]["programstatus"]
+    assert prog["enable_notifications"] is True
+    assert prog["execute_host_checks"] is False
+    assert prog["nagios_pid"] == 1234
+
+
+def test_group_filters_from_objects_cache(tmp_path):
+    backend = _backend(tmp_path)
+    by_hostgroup = backend.get_json(
+        {"query": "servicelist", "hostgroup": "web-servers"}
+    )["data"]["servicelist"]
+    assert list(by_hostgroup) == ["web01"]
+
+    by_servicegroup = backend.get_json(
+        {"query": "servicelist", "servicegroup": "databases"}
+    )["data"]["servicelist"]
+    assert by_servicegroup == {"db01": {"MySQL": 1}}
+
+
+def test_snapshot_skips_reparse_for_unchanged_file(tmp_path):
+    _backend(tmp_path).get_json({"query": "hostlist"})
+
+    # A fresh backend (new process) must load the on-disk snapshot
+    backend = StatusDatBackend(
+        str(tmp_path / "status.dat"), cache_dir=str(tmp_path / "cache")
+    )
+    with patch.object(statusdat, "parse_status_file", side_effect=AssertionError):
+        backend.status.parser = statusdat.parse_status_file
+        hostlist = backend.get_json({"query": "hostlist"})["data"]["hostlist"]
+    assert hostlist == {"web01": 2, "db01": 4}
+
+
+def test_snapshot_reparses_changed_file(tmp_path):
+    backend = _backend(tmp_path)
+    backend.get_json({"query": "hostlist"})
+
+    status_file = tmp_path / "status.dat"
+    status_file.write_text(STATUS_DAT.replace("current_state=1", "current_state=0"))
+    st = os.stat(status_file)
+    os.utime(status_file, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+    hostlist = backend.get_json({"query": "hostlist"})["data"]["hostlist"]
+    assert hostlist["db01"] == 2
+
+
+def test_client_statusdat_backend(mock_config_file, tmp_path, capsys):
+    from mozzo.client import MozzoNagiosClient
+
+    client = MozzoNagiosClient(config_path=mock_config_file)
+    client.status_source = _backend(tmp_path)
+    client.concurrency = 1
+
+    client.show_unhandled()
+
+    captured = capsys.readouterr()
+    assert "[CRITICAL] web01 -> HTTP" in captured.out
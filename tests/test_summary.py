@@ -0,0 +1,100 @@
+from unittest.mock import Mock, patch
+
+import pytest
+
+from mozzo.cli import run
+from mozzo.livestatus import LivestatusBackend
+from mozzo.status import StatusBackend
+
+
+def _responses(params, cache=False):
+    query = params["query"]
+    if query == "hostcount":
+        return {"data": {"count": {"up": 9, "down": 1, "unreachable": 0, "pending": 0}}}
+    if query == "servicecount":
+        return {"data": {"count": {"ok": 40, "warning": 2, "critical": 1, "unknown": 0, "pending": 3}}}
+    return {"data": {"programstatus": {"enable_notifications": True}}}
+
+
+def test_summary_uses_count_queries(client, capsys):
+    with patch.object(client, "_get_json", side_effect=_responses) as mock_get:
+        client.show_summary(hostgroup="linux")
+
+    queries = {call.args[0]["query"]: call.args[0] for call in mock_get.call_args_list}
+    assert set(queries) == {"hostcount", "servicecount", "programstatus"}
+    assert queries["hostcount"]["hostgroup"] == "linux"
+    assert queries["servicecount"]["hostgroup"] == "linux"
+    # Polled views must never be served from the response cache
+    assert all(not call.kwargs.get("cache") and len(call.args) == 1 for call in mock_get.call_args_list)
+
+    out = capsys.readouterr().out
+    assert "Nagios Summary (linux)" in out
+    assert "Hosts (10)" in out
+    assert "❌ DOWN: 1" in out
+    assert "Services (46)" in out
+    assert "⏳ PENDING: 3" in out
+
+
+def test_summary_csv(client, capsys):
+    with patch.object(client, "_get_json", side_effect=_responses):
+        client.show_summary(output_format="csv")
+
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0] == "object_type,state,count"
+    assert "host,DOWN,1" in lines
+    assert "service,CRITICAL,1" in lines
+
+
+def test_host_pending_code_has_label(client):
+    assert "PENDING" in client._get_status_text(1, is_host=True)
+
+
+class _Records(StatusBackend):
+    def hosts(self, filters):
+        return iter([{"status": 2}, {"status": 2}, {"status": 4}])
+
+    def services(self, filters):
+        return iter([{"status": 2}, {"status": 16}, {"status": 1}])
+
+    def program_status(self):
+        return {}
+
+
+def test_backend_counts_records():
+    backend = _Records()
+    hosts = backend.get_json({"query": "hostcount"})["data"]["count"]
+    services = backend.get_json({"query": "servicecount"})["data"]["count"]
+    assert hosts == {"pending": 0, "up": 2, "down": 1, "unreachable": 0}
+    assert services == {"pending": 1, "ok": 1, "warning": 0, "unknown": 0, "critical": 1}
+
+
+def test_backend_missing_method_fails_at_construction():
+    class _NoProgramStatus(StatusBackend):
+        def hosts(self, filters):
+            return iter([])
+
+        def services(self, filters):
+            return iter([])
+
+    with pytest.raises(TypeError):
+        _NoProgramStatus()
+
+
+def test_livestatus_counts_with_stats_headers():
+    backend = LivestatusBackend("/nonexistent")
+    with patch.object(backend, "_request", return_value=[[1, 9, 1, 0]]) as mock_request:
+        data = backend.get_json({"query": "hostcount", "hostgroup": "linux"})
+
+    assert data["data"]["count"] == {"pending": 1, "up": 9, "down": 1, "unreachable": 0}
+    table, headers = mock_request.call_args.args
+    assert table == "hosts"
+    assert headers[0] == "Filter: groups >= linux"
+    assert "Stats: has_been_checked = 0" in headers
+    assert headers.count("StatsAnd: 2") == 3
+    assert not any(h.startswith("Columns:") for h in headers)
+
+
+def test_cli_summary_dispatch():
+    client = Mock()
+    run(["--summary", "--servicegroup", "web", "--format", "json"], client_factory=lambda **kw: client)
+    client.show_summary.assert_called_once_with(None, "web", "json")
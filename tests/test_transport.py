@@ -0,0 +1,145 @@
+from unittest.mock import Mock, patch
+
+import pytest
+import requests
+
+from mozzo.transport import (
+    CircuitBreaker,
+    CircuitOpen,
+    Deadline,
+    DeadlineExceeded,
+    RetrySession,
+    TimeoutHTTPAdapter,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _response(status):
+    response = Mock()
+    response.status_code = status
+    return response
+
+
+def _session(**kwargs):
+    return RetrySession(sleep=Mock(), **kwargs)
+
+
+def test_get_retried_after_connection_error():
+    session = _session(retries=2)
+    ok = _response(200)
+    with patch.object(requests.Session, "request", side_effect=[requests.exceptions.ConnectionError("refused"), ok]) as mock_request:
+        assert session.get("https://nagios/statusjson.cgi") is ok
+    assert mock_request.call_count == 2
+    session.sleep.assert_called_once()
+
+
+def test_gateway_errors_retried_until_attempts_run_out():
+    session = _session(retries=2)
+    with patch.object(requests.Session, "request", return_value=_response(503)) as mock_request:
+        assert session.get("https://nagios/statusjson.cgi").status_code == 503
+    assert mock_request.call_count == 3
+
+
+def test_post_is_never_retried():
+    session = _session(retries=3)
+    with patch.object(requests.Session, "request", side_effect=requests.exceptions.ReadTimeout("slow")) as mock_request:
+        with pytest.raises(requests.exceptions.ReadTimeout):
+            session.post("https://nagios/cmd.cgi", data={})
+    assert mock_request.call_count == 1
+
+
+def test_backoff_is_jittered_and_bounded():
+    session = _session(retries=4, backoff=1.0, backoff_max=3.0)
+    with patch.object(requests.Session, "request", return_value=_response(502)), \
+            patch("mozzo.transport.random.uniform", side_effect=lambda low, high: high) as mock_uniform:
+        session.get("https://nagios/statusjson.cgi")
+    assert [c.args for c in mock_uniform.call_args_list] == [(0, 1.0), (0, 2.0), (0, 3.0), (0, 3.0)]
+
+
+def test_timeout_defaults_to_connect_read_tuple():
+    session = _session(timeout=(5, 30))
+    with patch.object(requests.Session, "request", return_value=_response(200)) as mock_request:
+        session.get("https://nagios/statusjson.cgi")
+    assert mock_request.call_args.kwargs["timeout"] == (5, 30)
+
+
+def test_deadline_clips_timeouts_and_fails_fast():
+    clock = FakeClock()
+    session = _session(timeout=(5, 30), deadline=Deadline(12, clock=clock))
+    with patch.object(requests.Session, "request", return_value=_response(200)) as mock_request:
+        session.get("https://nagios/statusjson.cgi")
+        assert mock_request.call_args.kwargs["timeout"] == (5, 12)
+
+        clock.now = 13
+        with pytest.raises(DeadlineExceeded):
+            session.get("https://nagios/statusjson.cgi")
+    assert mock_request.call_count == 1
+
+
+def test_no_retry_sleep_past_deadline():
+    clock = FakeClock()
+    session = _session(retries=5, backoff=10.0, deadline=Deadline(1, clock=clock))
+    error = requests.exceptions.ConnectTimeout("slow")
+    with patch.object(requests.Session, "request", side_effect=error), \
+            patch("mozzo.transport.random.uniform", return_value=5.0):
+        with pytest.raises(requests.exceptions.ConnectTimeout):
+            session.get("https://nagios/statusjson.cgi")
+    session.sleep.assert_not_called()
+
+
+def test_circuit_breaker_opens_and_resets():
+    clock = FakeClock()
+    breaker = CircuitBreaker(threshold=2, reset_timeout=30, clock=clock)
+    breaker.record_failure()
+    breaker.check()
+    breaker.record_failure()
+    with pytest.raises(CircuitOpen):
+        breaker.check()
+
+    clock.now = 31
+    breaker.check()
+    breaker.record_failure()
+    with pytest.raises(CircuitOpen):
+        breaker.check()
+
+    clock.now = 62
+    breaker.record_success()
+    breaker.check()
+
+
+def test_adapter_feeds_breaker_and_fails_fast():
+    breaker = CircuitBreaker(threshold=2, reset_timeout=30)
+    adapter = TimeoutHTTPAdapter(timeout=(5, 30), breaker=breaker)
+    request = Mock()
+    with patch.object(requests.adapters.HTTPAdapter, "send", side_effect=requests.exceptions.ConnectionError("down")) as mock_send:
+        for _ in range(2):
+            with pytest.raises(requests.exceptions.ConnectionError):
+                adapter.send(request)
+        with pytest.raises(CircuitOpen):
+            adapter.send(request)
+    assert mock_send.call_count == 2
+    assert mock_send.call_args.kwargs["timeout"] == (5, 30)
+
+
+def test_circuit_open_is_not_retried():
+    session = _session(retries=3)
+    with patch.object(requests.Session, "request", side_effect=CircuitOpen("down")) as mock_request:
+        with pytest.raises(CircuitOpen):
+            session.get("https://nagios/statusjson.cgi")
+    assert mock_request.call_count == 1
+
+
+def test_client_transport_settings(client):
+    assert isinstance(client.session, RetrySession)
+    assert client.session.timeout == (10, 60)
+    assert client.session.retries == 2
+    assert client.session.deadline.remaining() is None
+    adapter = client.session.get_adapter("https://nagios.example.com")
+    assert adapter.breaker.threshold == 5
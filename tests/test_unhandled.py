@@ -0,0 +1,87 @@
+import json
+from unittest.mock import MagicMock, patch
+
+
+SERVICES = {
+    "data": {
+        "servicelist": {
+            "web01": {
+                "HTTP": {"status": 16, "plugin_output": "HTTP CRITICAL"},
+                "DNS": {"status": 4, "problem_has_been_acknowledged": True},
+            },
+            "web02": {
+                "HTTP": {"status": 8, "plugin_output": "HTTP UNKNOWN"},
+            },
+            "db01": {
+                "MySQL": {"status": 16, "scheduled_downtime_depth": 1},
+            },
+        }
+    }
+}
+
+HOSTS = {
+    "data": {
+        "hostlist": {
+            "web01": {"status": 2},
+            "web02": {"status": 4, "problem_has_been_acknowledged": True},
+            "db01": {"status": 2},
+        }
+    }
+}
+
+
+def _streamed(data, chunk_size=7):
+    body = json.dumps(data).encode("utf-8")
+    response = MagicMock()
+    response.__enter__.return_value = response
+    response.iter_content.return_value = [body[i:i + chunk_size] for i in range(0, len(body), chunk_size)]
+    return response
+
+
+def test_is_handled_acknowledged(client):
+    assert client._is_handled({"problem_has_been_acknowledged": True}) is True
+
+
+def test_is_handled_downtime(client):
+    assert client._is_handled({"scheduled_downtime_depth": 2}) is True
+
+
+def test_is_handled_notifications_disabled(client):
+    assert client._is_handled({"notifications_enabled": False}) is True
+
+
+def test_is_handled_unhandled(client):
+    assert client._is_handled({"status": 16}) is False
+
+
+def test_show_unhandled_single_host_query(client, capsys):
+    with patch.object(client.session, "get", return_value=_streamed(SERVICES)) as mock_stream, \
+            patch.object(client, "_get_json", return_value=HOSTS) as mock_get:
+        client.show_unhandled()
+
+    assert mock_stream.call_count == 1
+    assert mock_stream.call_args.kwargs["stream"] is True
+    assert mock_get.call_count == 1
+    assert mock_get.call_args[0][0]["query"] == "hostlist"
+
+    captured = capsys.readouterr()
+    assert "[CRITICAL] web01 -> HTTP" in captured.out
+    assert "DNS" not in captured.out
+    assert "web02" not in captured.out
+    assert "db01" not in captured.out
+
+
+def test_show_unhandled_skips_host_query_when_all_handled(client, capsys):
+    services = {
+        "data": {
+            "servicelist": {
+                "db01": {"MySQL": {"status": 16, "scheduled_downtime_depth": 1}},
+            }
+        }
+    }
+    with patch.object(client.session, "get", return_value=_streamed(services)), \
+            patch.object(client, "_get_json") as mock_get:
+        client.show_unhandled()
+
+    assert mock_get.call_count == 0
+    assert "No unhandled service alerts found" in capsys.readouterr().out
@@ -0,0 +1,179 @@
+from unittest.mock import Mock, patch
+
+import pytest
+
+from mozzo.cli import run
+
+
+OK = {"ok": True, "status": "submitted", "error": None, "message": "✅ Command successfully submitted to Nagios."}
+FAILED = {"ok": False, "status": "http_error", "error": "boom", "message": "❌ HTTP Error: boom"}
+
+
+def _hostlist(**hosts):
+    return {"data": {"hostlist": hosts}}
+
+
+def _host_lookup(**hosts):
+    def get_json(params):
+        if params["query"] == "hostlist":
+            return _hostlist(**hosts)
+        return {"data": {"host": hosts.get(params["hostname"], {})}}
+    return get_json
+
+
+def test_verify_off_by_default(client):
+    with patch.object(client, "_send_cmd", return_value=OK), \
+            patch.object(client, "_get_json") as mock_get:
+        assert client.ack_host("web01") == 0
+    mock_get.assert_not_called()
+
+
+def test_verify_polls_batch_until_applied(client, capsys):
+    client.verify = True
+    services = [
+        [("web01", "HTTP", {"problem_has_been_acknowledged": False}), ("web01", "DNS", {"problem_has_been_acknowledged": True})],
+        [("web01", "HTTP", {"problem_has_been_acknowledged": True}), ("web01", "DNS", {"problem_has_been_acknowledged": True})],
+    ]
+    with patch.object(client, "_iter_services", side_effect=lambda params: iter(services.pop(0))) as mock_iter, \
+            patch("mozzo.commands.time.sleep") as mock_sleep:
+        unconfirmed = client.verify_applied([("web01", "HTTP"), ("web01", "DNS")], "ack")
+
+    assert unconfirmed == 0
+    assert mock_iter.call_count == 2
+    assert mock_iter.call_args.args[0] == {"query": "servicelist", "details": "true", "hostname": "web01"}
+    mock_sleep.assert_called_once_with(1)
+    out = capsys.readouterr().out
+    assert "2 confirmed, 0 not confirmed" in out
+    assert "✅ web01 -> HTTP: acknowledged" in out
+
+
+def test_verify_ack_skips_targets_without_problem(client, capsys):
+    client.verify = True
+    client.verify_timeout = 60
+    services = [
+        ("web01", "HTTP", {"status": 16, "problem_has_been_acknowledged": True}),
+        ("web01", "DNS", {"status": 2, "problem_has_been_acknowledged": False}),
+    ]
+    snapshot = _host_lookup(web01={"status": 2, "problem_has_been_acknowledged": False})
+    with patch.object(client, "_get_service_names", return_value={"HTTP": 16, "DNS": 2}), \
+            patch.object(client, "_send_cmds", return_value=[OK] * 3), \
+            patch.object(client, "_get_json", side_effect=snapshot), \
+            patch.object(client, "_iter_services", side_effect=lambda params: iter(services)), \
+            patch("mozzo.commands.time.sleep") as mock_sleep:
+        assert client.ack_all_services("web01") == 0
+
+    mock_sleep.assert_not_called()
+    out = capsys.readouterr().out
+    assert "1 confirmed, 0 not confirmed, 2 not applicable" in out
+    assert "➖ web01 -> DNS: not applicable" in out
+
+
+def test_verify_reports_targets_not_applied_by_deadline(client, capsys):
+    client.verify = True
+    client.verify_timeout = 0
+    snapshot = _host_lookup(web01={"scheduled_downtime_depth": 1}, web02={"scheduled_downtime_depth": 0})
+    with patch.object(client, "_get_json", side_effect=snapshot) as mock_get, \
+            patch("mozzo.commands.time.sleep"):
+        unconfirmed = client.verify_applied([("web01", None), ("web02", None), ("web03", None)], "downtime")
+
+    assert unconfirmed == 2
+    # One small host query per target instead of the whole hostlist
+    assert sorted(c.args[0]["hostname"] for c in mock_get.call_args_list) == ["web01", "web02", "web03"]
+    out = capsys.readouterr().out
+    assert "✅ web01: in downtime" in out
+    assert "❌ web02: not in downtime" in out
+    assert "❓ web03: not found" in out
+
+
+def test_bulk_verify_skips_failed_submissions(client):
+    client.verify = True
+    with patch.object(client, "_send_cmds", return_value=[OK, FAILED]), \
+            patch.object(client, "verify_applied", return_value=0) as mock_verify:
+        failed = client.bulk_submit([("web01", None), ("web02", None)], action="ack")
+
+    assert failed == 1
+    mock_verify.assert_called_once_with([("web01", None)], "ack")
+
+
+def test_group_downtime_verifies_group_members(client):
+    client.verify = True
+    with patch.object(client, "_send_cmd", return_value=OK), \
+            patch.object(client, "verify_applied", return_value=3) as mock_verify:
+        assert client.set_downtime_group(servicegroup="web") == 3
+
+    mock_verify.assert_called_once_with(None, "downtime", {"servicegroup": "web"}, all_services=False)
+
+
+def _downtime(depth):
+    return {"scheduled_downtime_depth": depth}
+
+
+def test_hostgroup_downtime_all_services_verifies_hosts_and_services(client, capsys):
+    client.verify = True
+    client.verify_timeout = 0
+    services = [("web01", "HTTP", _downtime(1)), ("web02", "HTTP", _downtime(0))]
+    with patch.object(client, "_send_cmd", return_value=OK), \
+            patch.object(client, "_get_json", return_value=_hostlist(web01=_downtime(1), web02=_downtime(1))) as mock_get, \
+            patch.object(client, "_iter_services", side_effect=lambda params: iter(services)) as mock_iter, \
+            patch("mozzo.commands.time.sleep"):
+        assert client.set_downtime_group(hostgroup="rack42", all_services=True) == 1
+
+    assert mock_get.call_args.args[0] == {"query": "hostlist", "details": "true", "hostgroup": "rack42"}
+    assert mock_iter.call_args.args[0] == {"query": "servicelist", "details": "true", "hostgroup": "rack42"}
+    out = capsys.readouterr().out
+    assert "3 confirmed, 1 not confirmed" in out
+    assert "❌ web02 -> HTTP: not in downtime" in out
+
+
+def test_servicegroup_downtime_all_services_verifies_hosts_and_services(client, capsys):
+    client.verify = True
+    client.verify_timeout = 0
+    services = [("web01", "HTTP", _downtime(1))]
+    hosts = _hostlist(web01=_downtime(0), db01=_downtime(0))
+    with patch.object(client, "_send_cmd", return_value=OK), \
+            patch.object(client, "_get_json", return_value=hosts), \
+            patch.object(client, "_iter_services", side_effect=lambda params: iter(services)) as mock_iter, \
+            patch("mozzo.commands.time.sleep"):
+        assert client.set_downtime_group(servicegroup="web", all_services=True) == 1
+
+    assert mock_iter.call_args.args[0]["servicegroup"] == "web"
+    out = capsys.readouterr().out
+    assert "❌ web01: not in downtime" in out
+    assert "db01" not in out
+
+
+@pytest.mark.parametrize(
+    "targets, action, expected",
+    [
+        ([("web01", "HTTP"), ("web02", "HTTP")], "downtime",
+         [{"query": "servicelist", "details": "true", "servicedescription": "HTTP"}]),
+        ([("web01", "HTTP"), ("web02", "DNS")], "ack",
+         [{"query": "servicelist", "details": "true", "servicestatus": "warning critical unknown"}]),
+        ([("web01", "HTTP"), ("web02", "DNS")], "downtime",
+         [{"query": "servicelist", "details": "true", "hostname": "web01"},
+          {"query": "servicelist", "details": "true", "hostname": "web02"}]),
+        ([("web01", None), ("web02", None)], "ack",
+         [{"query": "hostlist", "details": "true", "hoststatus": "down unreachable"}]),
+    ],
+)
+def test_verify_plan_narrows_multi_host_batches(client, targets, action, expected):
+    assert client._verify_plan(targets, action, {}) == expected
+
+
+def test_ack_missing_from_problem_query_is_not_applicable(client, capsys):
+    client.verify_timeout = 0
+    services = [("web01", "HTTP", {"status": 16, "problem_has_been_acknowledged": True})]
+    with patch.object(client, "_iter_services", side_effect=lambda params: iter(services)):
+        assert client.verify_applied([("web01", "HTTP"), ("web02", "DNS")], "ack") == 0
+
+    assert "➖ web02 -> DNS: not applicable" in capsys.readouterr().out
+
+
+def test_cli_verify_exits_when_not_applied():
+    client = Mock()
+    client.ack_service.return_value = 1
+    factory = Mock(return_value=client)
+    with pytest.raises(SystemExit) as exc:
+        run(["--ack", "--host", "web01", "--service", "HTTP", "--verify"], client_factory=factory)
+    assert exc.value.code == 1
+    assert factory.call_args.kwargs["verify"] is True
@@ -0,0 +1,70 @@
+import csv
+import io
+import json
+
+import pytest
+
+from mozzo.writers import BufferedOutput, write_csv, write_json, write_ndjson, write_rows
+
+
+ROWS = [
+    {"host": "web01", "service": "HTTP", "status_code": 16, "status": "❌ CRITICAL", "output": "a\nb"},
+    {"host": "web02", "service": "DNS", "status_code": 2, "status": "✅ OK", "output": None},
+]
+
+
+@pytest.mark.parametrize("rows", [[], ROWS[:1], ROWS])
+def test_json_matches_dumps(rows):
+    out = io.StringIO()
+    write_json(iter(rows), out)
+    assert out.getvalue() == json.dumps(rows, indent=2) + "\n"
+
+
+def test_ndjson_one_document_per_line():
+    out = io.StringIO()
+    write_ndjson(iter(ROWS), out)
+    assert [json.loads(line) for line in out.getvalue().splitlines()] == ROWS
+
+
+def test_csv_matches_dictwriter():
+    fields = ["host", "service", "status_code", "status"]
+    expected = io.StringIO()
+    writer = csv.DictWriter(expected, fieldnames=fields)
+    writer.writeheader()
+    writer.writerows([{k: row[k] for k in fields} for row in ROWS])
+
+    out = io.StringIO()
+    write_csv(iter(ROWS), fields, out)
+    assert out.getvalue() == expected.getvalue()
+
+
+@pytest.mark.parametrize("output_format", ["json", "ndjson", "csv"])
+def test_first_row_written_before_the_rest_is_produced(output_format):
+    out = io.StringIO()
+    seen = []
+
+    def rows():
+        yield ROWS[0]
+        seen.append(out.getvalue())
+        yield ROWS[1]
+
+    write_rows(rows(), output_format, ["host", "service"], out)
+    assert "web01" in seen[0]
+    assert "web02" not in seen[0]
+
+
+def test_buffered_output_batches_writes():
+    out = io.StringIO()
+    buffer = BufferedOutput(out, limit=10)
+    buffer.write("12345")
+    assert out.getvalue() == ""
+    buffer.write("67890")
+    assert out.getvalue() == "1234567890"
+    buffer.write("x")
+    buffer.flush()
+    assert out.getvalue() == "1234567890x"
+
+
+def test_write_rows_rejects_unknown_format():
+    with pytest.raises(ValueError):
+        write_rows([], "xml", [])